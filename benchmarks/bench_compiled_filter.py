@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+"""Benchmark CompiledFilter against per-song regex filtering on 100k song dicts.
+
+	$ python benchmarks/bench_compiled_filter.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+# Allow running from a checkout without installing the package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gmusicapi_wrapper.utils import CompiledFilter, filter_google_songs
+
+NUM_SONGS = 100000
+
+INCLUDE_FILTERS = [('artist', 'artist {}$'.format(i)) for i in range(0, 400, 3)] + [('genre', 'rock'), ('genre', 'jazz')]
+EXCLUDE_FILTERS = [('title', 'live'), ('title', 'remix'), ('title', 'demo'), ('album', 'deluxe')]
+
+
+def make_songs(num):
+	random.seed(0)
+	genres = ['Rock', 'Jazz', 'Pop', 'Classical', 'Electronic']
+
+	return [
+		{
+			'id': str(i), 'title': 'Song {} {}'.format(i, random.choice(['', 'Live', 'Remix'])),
+			'artist': 'Artist {}'.format(random.randrange(500)), 'album': 'Album {}'.format(random.randrange(5000)),
+			'genre': random.choice(genres), 'year': random.randrange(1960, 2017), 'track_number': random.randrange(1, 20)
+		}
+		for i in range(num)
+	]
+
+
+def legacy_check_filters(song, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False):
+	"""Per-song filter check as implemented before CompiledFilter."""
+
+	def check_field_value(field_value, pattern):
+		if isinstance(field_value, list):
+			return any(re.search(pattern, str(value), re.I) for value in field_value)
+		else:
+			return re.search(pattern, str(field_value), re.I)
+
+	include = True
+
+	if include_filters:
+		if all_includes:
+			if not all(field in song and check_field_value(song[field], pattern) for field, pattern in include_filters):
+				include = False
+		else:
+			if not any(field in song and check_field_value(song[field], pattern) for field, pattern in include_filters):
+				include = False
+
+	if exclude_filters:
+		if all_excludes:
+			if all(field in song and check_field_value(song[field], pattern) for field, pattern in exclude_filters):
+				include = False
+		else:
+			if any(field in song and check_field_value(song[field], pattern) for field, pattern in exclude_filters):
+				include = False
+
+	return include
+
+
+def bench(name, function):
+	start = time.perf_counter()
+	result = function()
+	elapsed = time.perf_counter() - start
+
+	print("{:<20} {:>8.3f} s {:>12,.0f} songs/s".format(name, elapsed, NUM_SONGS / elapsed))
+
+	return result
+
+
+def main():
+	songs = make_songs(NUM_SONGS)
+
+	legacy = bench('per-song re.search', lambda: [
+		legacy_check_filters(song, include_filters=INCLUDE_FILTERS, exclude_filters=EXCLUDE_FILTERS) for song in songs
+	])
+
+	compiled_filter = CompiledFilter(include_filters=INCLUDE_FILTERS, exclude_filters=EXCLUDE_FILTERS)
+	compiled = bench('CompiledFilter', lambda: [compiled_filter(song) for song in songs])
+
+	assert legacy == compiled
+
+	bench('filter_google_songs', lambda: filter_google_songs(songs, compiled_filter=compiled_filter))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+"""Benchmark fuzzy compare_song_collections scaling with library size.
+
+Each source song has a one character typo in its title, so every song needs a fuzzy match.
+Time per song should stay roughly flat as the libraries grow.
+
+	$ python benchmarks/bench_fuzzy_compare.py
+"""
+
+import os
+import random
+import sys
+import time
+
+# Allow running from a checkout without installing the package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gmusicapi_wrapper.index import SongKeyIndex
+from gmusicapi_wrapper.utils import compare_song_collections
+
+SIZES = [12500, 25000, 50000, 100000]
+
+WORDS = [
+	'love', 'night', 'dream', 'fire', 'heart', 'rain', 'light', 'shadow', 'river', 'summer', 'ghost', 'gold',
+	'electric', 'paper', 'glass', 'wild', 'silver', 'highway', 'ocean', 'storm', 'velvet', 'echo', 'stone', 'city'
+]
+
+
+def make_songs(num):
+	random.seed(num)
+
+	return [
+		{
+			'artist': 'Artist {}'.format(random.randrange(num // 50)), 'album': 'Album {}'.format(random.randrange(num // 10)),
+			'title': ' '.join(random.choice(WORDS) for __ in range(3)) + ' {}'.format(i),
+			'track_number': random.randrange(1, 15)
+		}
+		for i in range(num)
+	]
+
+
+def add_typo(song):
+	title = song['title']
+	pos = random.randrange(len(title))
+
+	return dict(song, title=title[:pos] + 'x' + title[pos + 1:])
+
+
+def main():
+	for size in SIZES:
+		dst_songs = make_songs(size)
+		src_songs = [add_typo(song) for song in dst_songs]
+		dst_index = SongKeyIndex(dst_songs)
+
+		start = time.perf_counter()
+		missing = compare_song_collections(src_songs, dst_index, fuzzy=True)
+		elapsed = time.perf_counter() - start
+
+		print("{:>7,} x {:>7,} songs {:>8.3f} s {:>8.1f} us/song {:>5} missing".format(
+			size, size, elapsed, elapsed / size * 10 ** 6, len(missing)
+		))
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+"""Benchmark merging purchased songs into uploaded songs for MusicManagerWrapper.get_google_songs.
+
+The old merge checked each purchased song against the whole list, so it's only run on a tenth of the songs.
+
+	$ python benchmarks/bench_library_merge.py
+"""
+
+import os
+import sys
+import time
+
+# Allow running from a checkout without installing the package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gmusicapi_wrapper.library import LibrarySnapshot
+
+NUM_UPLOADED = 50000
+NUM_PURCHASED = 20000
+
+# Fraction of purchased songs that are also uploaded.
+OVERLAP = 0.25
+
+
+def make_song(i):
+	"""Create a Musicmanager-like song dict."""
+
+	return {
+		'id': '{:08x}-0000-0000-0000-{:012x}'.format(i, i), 'title': 'Song {}'.format(i),
+		'artist': 'Artist {}'.format(i % 2000), 'album': 'Album {}'.format(i % 10000), 'album_artist': '',
+		'track_number': i % 20 + 1, 'track_size': 5000000 + i
+	}
+
+
+def make_library(num_uploaded, num_purchased):
+	uploaded = [make_song(i) for i in range(num_uploaded)]
+	overlap = int(num_purchased * OVERLAP)
+	purchased = [dict(song) for song in uploaded[-overlap:]] + [
+		make_song(num_uploaded + i) for i in range(num_purchased - overlap)
+	]
+
+	return uploaded, purchased
+
+
+def list_merge(uploaded, purchased):
+	google_songs = list(uploaded)
+
+	for song in purchased:
+		if song not in google_songs:
+			google_songs.append(song)
+
+	return google_songs
+
+
+def snapshot_merge(uploaded, purchased):
+	library = LibrarySnapshot()
+	library.add_uploaded(uploaded)
+	library.add_purchased(purchased)
+
+	return library.songs()
+
+
+def measure(name, function, uploaded, purchased):
+	start = time.perf_counter()
+	songs = function(uploaded, purchased)
+	elapsed = time.perf_counter() - start
+
+	print("{:<16} {:>7,} + {:>7,} songs {:>9.3f} s {:>8,} merged".format(
+		name, len(uploaded), len(purchased), elapsed, len(songs)
+	))
+
+
+def main():
+	uploaded, purchased = make_library(NUM_UPLOADED // 10, NUM_PURCHASED // 10)
+	measure('list merge', list_merge, uploaded, purchased)
+	measure('LibrarySnapshot', snapshot_merge, uploaded, purchased)
+
+	uploaded, purchased = make_library(NUM_UPLOADED, NUM_PURCHASED)
+	measure('LibrarySnapshot', snapshot_merge, uploaded, purchased)
+
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# coding=utf-8
+
+"""Benchmark SongTable memory use and filtering against lists of song dicts.
+
+Memory is measured with tracemalloc; end to end times are measured separately without it.
+
+	$ python benchmarks/bench_song_table.py
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+# Allow running from a checkout without installing the package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gmusicapi_wrapper.songtable import SongTable
+from gmusicapi_wrapper.utils import CompiledFilter, filter_google_songs
+
+NUM_SONGS = 50000
+
+INCLUDE_FILTERS = [('artist', 'artist 1'), ('genre', 'rock|jazz')]
+EXCLUDE_FILTERS = [('title', 'live'), ('year', '^19[67]')]
+
+
+def make_song(i):
+	"""Create a Mobileclient-like song dict with about 30 keys."""
+
+	artist = random.randrange(2000)
+	album = random.randrange(10000)
+
+	return {
+		'kind': 'sj#track', 'id': '{:08x}-0000-0000-0000-{:012x}'.format(i, i), 'clientId': 'client{}'.format(i),
+		'title': 'Song {} {}'.format(i, random.choice(['', 'Live', 'Remix'])), 'artist': 'Artist {}'.format(artist),
+		'composer': '', 'album': 'Album {}'.format(album), 'albumArtist': 'Artist {}'.format(artist),
+		'year': random.randrange(1960, 2017), 'comment': '', 'trackNumber': random.randrange(1, 20),
+		'genre': random.choice(['Rock', 'Jazz', 'Pop', 'Classical']), 'durationMillis': str(random.randrange(60000, 600000)),
+		'beatsPerMinute': 0, 'playCount': random.randrange(100), 'discNumber': 1, 'totalDiscCount': 1,
+		'totalTrackCount': 12, 'estimatedSize': str(random.randrange(10 ** 6, 10 ** 7)), 'storeId': 'T{}'.format(i),
+		'albumId': 'B{}'.format(album), 'artistId': ['A{}'.format(artist)], 'nid': 'T{}'.format(i),
+		'creationTimestamp': str(1400000000000000 + i), 'lastModifiedTimestamp': str(1400000000000000 + i),
+		'recentTimestamp': str(1400000000000000 + i), 'deleted': False, 'rating': '0', 'trackType': '8',
+		'albumArtRef': [{'url': 'http://lh3.googleusercontent.com/album{}'.format(album)}]
+	}
+
+
+def measure(name, function):
+	tracemalloc.start()
+	start = time.perf_counter()
+	result = function()
+	elapsed = time.perf_counter() - start
+	current, __ = tracemalloc.get_traced_memory()
+	tracemalloc.stop()
+
+	print("{:<28} {:>8.3f} s {:>10.1f} MiB".format(name, elapsed, current / 2 ** 20))
+
+	return result
+
+
+def time_best(name, function, repeat=3):
+	timings = []
+
+	for __ in range(repeat):
+		start = time.perf_counter()
+		function()
+		timings.append(time.perf_counter() - start)
+
+	print("{:<28} {:>8.3f} s".format(name, min(timings)))
+
+
+def main():
+	random.seed(0)
+
+	songs = measure('build song dicts', lambda: [make_song(i) for i in range(NUM_SONGS)])
+	table = measure('build SongTable', lambda: SongTable.from_songs(songs))
+
+	compiled_filter = CompiledFilter(include_filters=INCLUDE_FILTERS, exclude_filters=EXCLUDE_FILTERS)
+
+	matched, __ = measure('filter_google_songs', lambda: filter_google_songs(songs, compiled_filter=compiled_filter))
+	mask = measure('SongTable.mask', lambda: table.mask(compiled_filter=compiled_filter))
+
+	assert sum(mask) == len(matched)
+
+	print()
+	time_best('filter_google_songs', lambda: filter_google_songs(songs, compiled_filter=compiled_filter))
+	time_best(
+		'from_songs + filter', lambda: SongTable.from_songs(songs).filter(compiled_filter=compiled_filter)
+	)
+	time_best('filter (table reused)', lambda: table.filter(compiled_filter=compiled_filter))
+
+
+if __name__ == '__main__':
+	main()
@@ -9,15 +9,24 @@ import logging
 
 from . import constants
 from . import utils
+from .cache import MetadataCache
 from .constants import SUPPORTED_PLAYLIST_FORMATS, SUPPORTED_SONG_FORMATS
+from .index import FingerprintIndex, SongKeyIndex
+from .journal import TransferJournal
+from .ledger import UploadLedger
+from .library import LibraryCache, LibrarySnapshot
 from .mobileclient import MobileClientWrapper
 from .musicmanager import MusicManagerWrapper
+from .scheduler import TransferScheduler
+from .snapshot import ScanSnapshot, rescan
+from .transcode import TranscodeCache
 
 # Set default logging handler to avoid "No handlers found" warnings.
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
 # Keep linters from complaining.
 (
-	constants, utils, SUPPORTED_PLAYLIST_FORMATS, SUPPORTED_SONG_FORMATS,
-	MobileClientWrapper, MusicManagerWrapper
+	constants, utils, FingerprintIndex, LibraryCache, LibrarySnapshot, MetadataCache, SUPPORTED_PLAYLIST_FORMATS,
+	SUPPORTED_SONG_FORMATS, MobileClientWrapper, MusicManagerWrapper, ScanSnapshot, SongKeyIndex, TransferJournal,
+	TranscodeCache, TransferScheduler, UploadLedger, rescan
 )
@@ -0,0 +1,258 @@
+# coding=utf-8
+
+"""Asyncio front-ends for the wrapper classes. Requires Python 3.5+.
+
+	>>> from gmusicapi_wrapper.aio import AsyncMobileClientWrapper, AsyncMusicManagerWrapper
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .mobileclient import MobileClientWrapper
+from .musicmanager import MusicManagerWrapper
+
+logger = logging.getLogger(__name__)
+
+_DONE = object()
+
+
+class _ResultStream:
+	"""An async iterator over the results of a blocking generator run in an executor.
+
+	Results are passed to the event loop as soon as the generator yields them.
+	Call :meth:`aclose` to stop the generator early.
+	"""
+
+	def __init__(self, wrapper, function, *args, **kwargs):
+		self._wrapper = wrapper
+		self._function = functools.partial(function, *args, **kwargs)
+		self._queue = None
+		self._future = None
+		self._stopped = threading.Event()
+
+	def __aiter__(self):
+		return self
+
+	def _produce(self, loop):
+		try:
+			for result in self._function():
+				if self._stopped.is_set():
+					break
+
+				loop.call_soon_threadsafe(self._queue.put_nowait, result)
+		finally:
+			loop.call_soon_threadsafe(self._queue.put_nowait, _DONE)
+
+	async def _start(self):
+		loop = asyncio.get_event_loop()
+		self._queue = asyncio.Queue()
+
+		await self._wrapper._semaphore_for(loop).acquire()
+
+		try:
+			self._future = loop.run_in_executor(self._wrapper.executor, self._produce, loop)
+		except BaseException:
+			self._wrapper._semaphore_for(loop).release()
+			raise
+
+		self._future.add_done_callback(lambda future: self._wrapper._semaphore_for(loop).release())
+
+	async def __anext__(self):
+		if self._future is None:
+			await self._start()
+
+		result = await self._queue.get()
+
+		if result is _DONE:
+			# Raise any exception from the generator.
+			await self._future
+			raise StopAsyncIteration
+
+		return result
+
+	async def aclose(self):
+		"""Stop the blocking generator after its current item and wait for it to finish."""
+
+		self._stopped.set()
+
+		if self._future is not None:
+			await asyncio.wait([self._future])
+
+
+class _AsyncWrapper:
+	"""Run blocking wrapper calls on a thread pool executor.
+
+	Parameters:
+		wrapper: A :class:`~gmusicapi_wrapper.MusicManagerWrapper` or :class:`~gmusicapi_wrapper.MobileClientWrapper`.
+
+		max_workers (int): The number of blocking calls that can run at once. Default: ``4``
+	"""
+
+	def __init__(self, wrapper, max_workers=4):
+		self.wrapper = wrapper
+		self.max_workers = max_workers
+		self.executor = ThreadPoolExecutor(max_workers=max_workers)
+
+		self._semaphores = {}
+
+	async def __aenter__(self):
+		return self
+
+	async def __aexit__(self, *exc_info):
+		self.close()
+
+	@property
+	def api(self):
+		"""The wrapped gmusicapi client instance."""
+
+		return self.wrapper.api
+
+	def _semaphore_for(self, loop):
+		# Semaphores are bound to the event loop they're created in on older Python versions.
+		if loop not in self._semaphores:
+			self._semaphores[loop] = asyncio.Semaphore(self.max_workers)
+
+		return self._semaphores[loop]
+
+	async def _run(self, function, *args, **kwargs):
+		loop = asyncio.get_event_loop()
+
+		async with self._semaphore_for(loop):
+			return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+
+	def close(self):
+		"""Shut down the executor after running calls finish."""
+
+		self.executor.shutdown(wait=True)
+
+	async def is_authenticated(self):
+		"""See :attr:`MusicManagerWrapper.is_authenticated <gmusicapi_wrapper.base._BaseWrapper.is_authenticated>`."""
+
+		return await self._run(lambda: self.wrapper.is_authenticated)
+
+	async def logout(self, *args, **kwargs):
+		"""Log out the wrapped client."""
+
+		return await self._run(self.wrapper.logout, *args, **kwargs)
+
+	async def get_local_songs(self, *args, **kwargs):
+		"""See :meth:`~gmusicapi_wrapper.base._BaseWrapper.get_local_songs`."""
+
+		return await self._run(self.wrapper.get_local_songs, *args, **kwargs)
+
+	async def get_local_playlists(self, *args, **kwargs):
+		"""See :meth:`~gmusicapi_wrapper.base._BaseWrapper.get_local_playlists`."""
+
+		return await self._run(self.wrapper.get_local_playlists, *args, **kwargs)
+
+	async def get_local_playlist_songs(self, *args, **kwargs):
+		"""See :meth:`~gmusicapi_wrapper.base._BaseWrapper.get_local_playlist_songs`."""
+
+		return await self._run(self.wrapper.get_local_playlist_songs, *args, **kwargs)
+
+
+class AsyncMusicManagerWrapper(_AsyncWrapper):
+	"""An asyncio front-end for :class:`~gmusicapi_wrapper.MusicManagerWrapper`.
+
+	Blocking gmusicapi and mutagen calls run on a thread pool, so the event loop isn't blocked.
+
+		>>> async with AsyncMusicManagerWrapper(max_workers=4) as mmw:
+		...     await mmw.login()
+		...     async for result in mmw.iter_download(songs, template='%artist%/%title%'):
+		...         print(result)
+
+	Parameters:
+		wrapper (MusicManagerWrapper): The wrapper to run calls on. Default: A new :class:`MusicManagerWrapper`.
+
+		max_workers (int): The number of blocking calls that can run at once.
+			Each running transfer result stream counts as one call. Default: ``4``
+
+		enable_logging (bool): Enable gmusicapi's debug_logging option for a new wrapper.
+	"""
+
+	def __init__(self, wrapper=None, max_workers=4, enable_logging=False):
+		super().__init__(wrapper or MusicManagerWrapper(enable_logging=enable_logging), max_workers=max_workers)
+
+	async def login(self, *args, **kwargs):
+		"""See :meth:`MusicManagerWrapper.login <gmusicapi_wrapper.musicmanager.MusicManagerWrapper.login>`."""
+
+		return await self._run(self.wrapper.login, *args, **kwargs)
+
+	async def get_google_songs(self, *args, **kwargs):
+		"""See :meth:`MusicManagerWrapper.get_google_songs <gmusicapi_wrapper.musicmanager.MusicManagerWrapper.get_google_songs>`."""
+
+		return await self._run(self.wrapper.get_google_songs, *args, **kwargs)
+
+	async def download(self, *args, **kwargs):
+		"""See :meth:`MusicManagerWrapper.download <gmusicapi_wrapper.musicmanager.MusicManagerWrapper.download>`."""
+
+		return await self._run(self.wrapper.download, *args, **kwargs)
+
+	async def upload(self, *args, **kwargs):
+		"""See :meth:`MusicManagerWrapper.upload <gmusicapi_wrapper.musicmanager.MusicManagerWrapper.upload>`."""
+
+		return await self._run(self.wrapper.upload, *args, **kwargs)
+
+	def iter_download(self, *args, **kwargs):
+		"""Download songs, yielding result dicts as songs finish.
+
+		Takes the same parameters as
+		:meth:`MusicManagerWrapper.download <gmusicapi_wrapper.musicmanager.MusicManagerWrapper.download>`.
+
+		Returns:
+			An async iterator of result dicts.
+		"""
+
+		return _ResultStream(self, self.wrapper.iter_download, *args, **kwargs)
+
+	def iter_upload(self, *args, **kwargs):
+		"""Upload files, yielding result dicts as files finish.
+
+		Takes the same parameters as
+		:meth:`MusicManagerWrapper.upload <gmusicapi_wrapper.musicmanager.MusicManagerWrapper.upload>`.
+
+		Returns:
+			An async iterator of result dicts.
+		"""
+
+		return _ResultStream(self, self.wrapper.iter_upload, *args, **kwargs)
+
+
+class AsyncMobileClientWrapper(_AsyncWrapper):
+	"""An asyncio front-end for :class:`~gmusicapi_wrapper.MobileClientWrapper`.
+
+	Blocking gmusicapi and mutagen calls run on a thread pool, so the event loop isn't blocked.
+
+	Parameters:
+		wrapper (MobileClientWrapper): The wrapper to run calls on. Default: A new :class:`MobileClientWrapper`.
+
+		max_workers (int): The number of blocking calls that can run at once. Default: ``4``
+
+		enable_logging (bool): Enable gmusicapi's debug_logging option for a new wrapper.
+	"""
+
+	def __init__(self, wrapper=None, max_workers=4, enable_logging=False):
+		super().__init__(wrapper or MobileClientWrapper(enable_logging=enable_logging), max_workers=max_workers)
+
+	async def login(self, *args, **kwargs):
+		"""See :meth:`MobileClientWrapper.login <gmusicapi_wrapper.mobileclient.MobileClientWrapper.login>`."""
+
+		return await self._run(self.wrapper.login, *args, **kwargs)
+
+	async def get_google_songs(self, *args, **kwargs):
+		"""See :meth:`MobileClientWrapper.get_google_songs <gmusicapi_wrapper.mobileclient.MobileClientWrapper.get_google_songs>`."""
+
+		return await self._run(self.wrapper.get_google_songs, *args, **kwargs)
+
+	async def get_google_playlist(self, *args, **kwargs):
+		"""See :meth:`MobileClientWrapper.get_google_playlist <gmusicapi_wrapper.mobileclient.MobileClientWrapper.get_google_playlist>`."""
+
+		return await self._run(self.wrapper.get_google_playlist, *args, **kwargs)
+
+	async def get_google_playlist_songs(self, *args, **kwargs):
+		"""See :meth:`MobileClientWrapper.get_google_playlist_songs <gmusicapi_wrapper.mobileclient.MobileClientWrapper.get_google_playlist_songs>`."""
+
+		return await self._run(self.wrapper.get_google_playlist_songs, *args, **kwargs)
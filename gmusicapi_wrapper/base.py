@@ -7,10 +7,14 @@
 
 import logging
 import os
+import re
 
 from .constants import CYGPATH_RE, SUPPORTED_PLAYLIST_FORMATS, SUPPORTED_SONG_FORMATS
 from .decorators import cast_to_list
-from .utils import convert_cygwin_path, exclude_filepaths, filter_local_songs, get_supported_filepaths
+from .utils import (
+	convert_cygwin_path, exclude_filepaths, filter_local_songs, get_supported_filepaths,
+	iter_filter_local_songs, iter_supported_filepaths
+)
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +24,35 @@ class _BaseWrapper:
 
 	Parameters:
 		enable_logging (bool): Enable gmusicapi's debug_logging option.
+
+		library_cache (LibraryCache): A cache for Google Music song lists.
+
+	Attributes:
+		account (str): A key identifying the logged in Google account for the library cache.
+			Set on login.
 	"""
 
-	def __init__(self, cls, enable_logging=False):
+	def __init__(self, cls, enable_logging=False, library_cache=None):
 		self.api = cls(debug_logging=enable_logging)
 		self.api.logger.addHandler(logging.NullHandler())
 
+		self.library_cache = library_cache
+		self.account = None
+
+	def _load_google_songs(self, name, load):
+		"""Get a song list from the library cache or load and cache it."""
+
+		if self.library_cache is None or self.account is None:
+			return load()
+
+		songs = self.library_cache.get(self.account, name)
+
+		if songs is None:
+			songs = load()
+			self.library_cache.set(self.account, name, songs)
+
+		return songs
+
 	@property
 	def is_authenticated(self):
 		"""Check the authentication status of the gmusicapi client instance.
@@ -40,7 +67,7 @@ class _BaseWrapper:
 	@cast_to_list(0)
 	def get_local_songs(
 			filepaths, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False,
-			exclude_patterns=None, max_depth=float('inf')):
+			exclude_patterns=None, max_depth=float('inf'), metadata_cache=None, workers=None):
 		"""Load songs from local filepaths.
 
 		Parameters:
@@ -66,6 +93,11 @@ class _BaseWrapper:
 				A depth of '0' limits the walk to the top directory.
 				Default: No limit.
 
+			metadata_cache (MetadataCache): A cache used to avoid reloading metadata of unchanged local files.
+
+			workers (int): Number of processes used to load metadata in parallel.
+				Default: Load metadata in the calling process.
+
 		Returns:
 			A list of local song filepaths matching criteria,
 			a list of local song filepaths filtered out using filter criteria,
@@ -81,7 +113,7 @@ class _BaseWrapper:
 
 		matched_songs, filtered_songs = filter_local_songs(
 			included_songs, include_filters=include_filters, exclude_filters=exclude_filters,
-			all_includes=all_includes, all_excludes=all_excludes
+			all_includes=all_includes, all_excludes=all_excludes, metadata_cache=metadata_cache, workers=workers
 		)
 
 		logger.info("Excluded {0} local songs".format(len(excluded_songs)))
@@ -90,6 +122,65 @@ class _BaseWrapper:
 
 		return matched_songs, filtered_songs, excluded_songs
 
+	@staticmethod
+	@cast_to_list(0)
+	def iter_local_songs(
+			filepaths, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False,
+			exclude_patterns=None, max_depth=float('inf'), metadata_cache=None, workers=None):
+		"""Lazily load songs from local filepaths.
+
+		Streaming variant of :meth:`get_local_songs`.
+		Songs are yielded as they are found instead of after the whole tree has been walked.
+
+		Parameters:
+			filepaths (list or str): Filepath(s) to search for music files.
+
+			include_filters (list): A list of ``(field, pattern)`` tuples.
+				Fields are any valid mutagen metadata fields. Patterns are Python regex patterns.
+				Local songs are filtered out if the given metadata field values don't match any of the given patterns.
+
+			exclude_filters (list): A list of ``(field, pattern)`` tuples.
+				Fields are any valid mutagen metadata fields. Patterns are Python regex patterns.
+				Local songs are filtered out if the given metadata field values match any of the given patterns.
+
+			all_includes (bool): If ``True``, all include_filters criteria must match to include a song.
+
+			all_excludes (bool): If ``True``, all exclude_filters criteria must match to exclude a song.
+
+			exclude_patterns (list or str): Pattern(s) to exclude.
+				Patterns are Python regex patterns.
+				Filepaths are excluded if they match any of the exclude patterns.
+
+			max_depth (int): The depth in the directory tree to walk.
+				A depth of '0' limits the walk to the top directory.
+				Default: No limit.
+
+			metadata_cache (MetadataCache): A cache used to avoid reloading metadata of unchanged local files.
+
+			workers (int): Number of processes used to load metadata in parallel.
+				Default: Load metadata in the calling process.
+
+		Yields:
+			Local song filepaths matching criteria.
+		"""
+
+		exclude_re = re.compile("|".join(exclude_patterns)) if exclude_patterns else None
+
+		def iter_included_filepaths():
+			for filepath in iter_supported_filepaths(filepaths, SUPPORTED_SONG_FORMATS, max_depth=max_depth):
+				if exclude_re and exclude_re.search(filepath):
+					logger.debug("Excluded local song -- {}".format(filepath))
+				else:
+					yield filepath
+
+		for filepath, matched in iter_filter_local_songs(
+				iter_included_filepaths(), include_filters=include_filters, exclude_filters=exclude_filters,
+				all_includes=all_includes, all_excludes=all_excludes, metadata_cache=metadata_cache, workers=workers):
+			if matched:
+				yield filepath
+			else:
+				logger.debug("Filtered local song -- {}".format(filepath))
+
 	@staticmethod
 	@cast_to_list(0)
 	def get_local_playlists(filepaths, exclude_patterns=None, max_depth=float('inf')):
@@ -125,10 +216,41 @@ class _BaseWrapper:
 
 		return included_playlists, excluded_playlists
 
+	@staticmethod
+	@cast_to_list(0)
+	def iter_local_playlists(filepaths, exclude_patterns=None, max_depth=float('inf')):
+		"""Lazily load playlists from local filepaths.
+
+		Streaming variant of :meth:`get_local_playlists`.
+
+		Parameters:
+			filepaths (list or str): Filepath(s) to search for music files.
+
+			exclude_patterns (list or str): Pattern(s) to exclude.
+				Patterns are Python regex patterns.
+				Filepaths are excluded if they match any of the exclude patterns.
+
+			max_depth (int): The depth in the directory tree to walk.
+				A depth of '0' limits the walk to the top directory.
+				Default: No limit.
+
+		Yields:
+			Local playlist filepaths matching criteria.
+		"""
+
+		exclude_re = re.compile("|".join(exclude_patterns)) if exclude_patterns else None
+
+		for filepath in iter_supported_filepaths(filepaths, SUPPORTED_PLAYLIST_FORMATS, max_depth=max_depth):
+			if exclude_re and exclude_re.search(filepath):
+				logger.debug("Excluded local playlist -- {}".format(filepath))
+				continue
+
+			yield filepath
+
 	@staticmethod
 	def get_local_playlist_songs(
 		playlist, include_filters=None, exclude_filters=None,
-		all_includes=False, all_excludes=False, exclude_patterns=None):
+		all_includes=False, all_excludes=False, exclude_patterns=None, metadata_cache=None):
 		"""Load songs from local playlist.
 
 		Parameters:
@@ -150,6 +272,8 @@ class _BaseWrapper:
 				Patterns are Python regex patterns.
 				Filepaths are excluded if they match any of the exclude patterns.
 
+			metadata_cache (MetadataCache): A cache used to avoid reloading metadata of unchanged local files.
+
 		Returns:
 			A list of local playlist song filepaths matching criteria,
 			a list of local playlist song filepaths filtered out using filter criteria,
@@ -183,7 +307,7 @@ class _BaseWrapper:
 
 		matched_songs, filtered_songs = filter_local_songs(
 			included_songs, include_filters=include_filters, exclude_filters=exclude_filters,
-			all_includes=all_includes, all_excludes=all_excludes
+			all_includes=all_includes, all_excludes=all_excludes, metadata_cache=metadata_cache
 		)
 
 		logger.info("Excluded {0} local playlist songs".format(len(excluded_songs)))
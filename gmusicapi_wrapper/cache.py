@@ -0,0 +1,183 @@
+# coding=utf-8
+
+"""Persistent metadata cache for local files.
+
+	>>> from gmusicapi_wrapper.cache import MetadataCache
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataCache:
+	"""An SQLite-backed cache of mutagen metadata for local files.
+
+	Entries are keyed by filepath and are only used while the file's size, modification time, and inode are unchanged.
+	A hit only costs an ``os.stat`` call; the file itself is never opened.
+
+	Parameters:
+		filepath (str): The filepath of the cache database. Default: ``':memory:'``
+
+		commit_interval (int): Number of cache writes between database commits. Default: ``1000``
+
+	Can be used as a context manager to commit and close the database on exit.
+	The cache can be used from any thread, e.g. by the :mod:`~gmusicapi_wrapper.aio` wrappers.
+	"""
+
+	def __init__(self, filepath=':memory:', commit_interval=1000):
+		self.filepath = filepath
+		self.commit_interval = commit_interval
+
+		self.hits = 0
+		self.misses = 0
+
+		self._pending = 0
+		self._lock = threading.RLock()
+		self._conn = sqlite3.connect(filepath, check_same_thread=False)
+		self._conn.execute(
+			"CREATE TABLE IF NOT EXISTS metadata ("
+			"path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, error INTEGER, metadata TEXT)"
+		)
+		self._conn.commit()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def __len__(self):
+		with self._lock:
+			return self._conn.execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+
+	@staticmethod
+	def _stat_key(filepath):
+		stat = os.stat(filepath)
+
+		return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+	def get(self, filepath):
+		"""Get cached metadata for a file.
+
+		Parameters:
+			filepath (str): A local filepath.
+
+		Returns:
+			A ``(found, error, metadata)`` tuple.
+			``found`` is ``False`` on a cache miss or if the file changed since it was cached.
+			``error`` is ``True`` if the file previously failed to load as a music file.
+			``metadata`` is a dict of mutagen field list values or ``None``.
+		"""
+
+		try:
+			key = self._stat_key(filepath)
+		except OSError:
+			key = None
+
+		with self._lock:
+			if key is not None:
+				row = self._conn.execute(
+					"SELECT size, mtime_ns, inode, error, metadata FROM metadata WHERE path = ?", (filepath,)
+				).fetchone()
+
+			if key is None or row is None or tuple(row[:3]) != key:
+				self.misses += 1
+				return False, False, None
+
+			self.hits += 1
+
+		return True, bool(row[3]), json.loads(row[4])
+
+	def set(self, filepath, metadata, error=False):
+		"""Cache metadata for a file.
+
+		Parameters:
+			filepath (str): A local filepath.
+
+			metadata (dict or mutagen.FileType): Mutagen metadata for the file or ``None``.
+
+			error (bool): ``True`` if the file failed to load as a music file.
+		"""
+
+		try:
+			size, mtime_ns, inode = self._stat_key(filepath)
+		except OSError:
+			return
+
+		if metadata is not None:
+			metadata = dict(metadata.items())
+
+		with self._lock:
+			self._conn.execute(
+				"INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)",
+				(filepath, size, mtime_ns, inode, int(error), json.dumps(metadata, default=str))
+			)
+
+			self._pending += 1
+
+			if self._pending >= self.commit_interval:
+				self.commit()
+
+	def prune(self):
+		"""Remove cache entries for files that no longer exist.
+
+		Returns:
+			The number of removed entries.
+		"""
+
+		with self._lock:
+			removed = [
+				(path,) for (path,) in self._conn.execute("SELECT path FROM metadata").fetchall()
+				if not os.path.isfile(path)
+			]
+
+			self._conn.executemany("DELETE FROM metadata WHERE path = ?", removed)
+			self.commit()
+
+		logger.info("Pruned {0} metadata cache entries".format(len(removed)))
+
+		return len(removed)
+
+	def stats(self):
+		"""Get cache hit statistics for this session.
+
+		Returns:
+			A dict with ``hits``, ``misses``, ``lookups``, ``hit_rate``, and ``entries`` keys.
+		"""
+
+		lookups = self.hits + self.misses
+
+		return {
+			'hits': self.hits, 'misses': self.misses, 'lookups': lookups,
+			'hit_rate': self.hits / lookups if lookups else 0.0, 'entries': len(self)
+		}
+
+	def log_stats(self):
+		"""Log cache hit statistics for this session."""
+
+		stats = self.stats()
+
+		logger.info(
+			"Metadata cache: {hits} hits, {misses} misses ({rate:.1%} hit rate), {entries} entries".format(
+				hits=stats['hits'], misses=stats['misses'], rate=stats['hit_rate'], entries=stats['entries']
+			)
+		)
+
+	def commit(self):
+		"""Commit pending cache writes to disk."""
+
+		with self._lock:
+			self._conn.commit()
+			self._pending = 0
+
+	def close(self):
+		"""Commit pending cache writes and close the database."""
+
+		with self._lock:
+			self.commit()
+			self._conn.close()
@@ -0,0 +1,405 @@
+# coding=utf-8
+
+"""Persistent indexes of song comparison keys and audio fingerprints.
+
+	>>> from gmusicapi_wrapper.index import FingerprintIndex, SongKeyIndex
+"""
+
+import binascii
+import collections
+import hashlib
+import json
+import logging
+import os
+
+from .tags import audio_fingerprint
+from .utils import _song_comparison_key
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+
+class SongKeyIndex:
+	"""A multiset of the normalized metadata keys used by :func:`~gmusicapi_wrapper.utils.compare_song_collections`.
+
+	Build it once from a destination collection and pass it as ``dst_songs`` to compare many source collections
+	without reloading the destination songs. Membership checks are a single dict lookup.
+
+	Keys of local files are remembered by filepath, so a file can be removed from the index
+	or re-added after it changes without loading the old metadata.
+
+	Parameters:
+		songs (list): Google Music song dicts or filepaths of local songs to add.
+
+		compact (bool): If ``True``, only store an 8 byte hash of each key instead of the key itself.
+			Default: ``False``
+
+		metadata_cache (MetadataCache): A cache used to avoid reloading metadata of unchanged local files.
+	"""
+
+	def __init__(self, songs=None, compact=False, metadata_cache=None):
+		self.compact = compact
+		self.metadata_cache = metadata_cache
+
+		self._counts = collections.Counter()
+		self._ids = collections.Counter()
+		self._paths = {}
+
+		if songs is not None:
+			self.update(songs)
+
+	def __len__(self):
+		return sum(self._counts.values())
+
+	def __contains__(self, song):
+		return self.contains_key(_song_comparison_key(song, metadata_cache=self.metadata_cache))
+
+	def _hash_key(self, key):
+		if self.compact:
+			return hashlib.sha1(json.dumps(key).encode('utf-8')).digest()[:8]
+
+		return key
+
+	def contains_key(self, key):
+		"""Check if a comparison key is in the index.
+
+		Parameters:
+			key (tuple): A normalized metadata tuple.
+
+		Returns:
+			``True`` if a song with the key is in the index.
+		"""
+
+		return self._counts[self._hash_key(key)] > 0
+
+	def contains_id(self, song_id):
+		"""Check if a Google Music song id is in the index.
+
+		Parameters:
+			song_id (str): A Google Music song id.
+
+		Returns:
+			``True`` if a Google Music song dict with the id was added to the index.
+		"""
+
+		return self._ids[song_id] > 0
+
+	def keys(self):
+		"""Get the distinct comparison keys in the index.
+
+		Returns:
+			A list of normalized metadata tuples.
+
+		Raises:
+			ValueError: If the index is compact and only stores key hashes.
+		"""
+
+		if self.compact:
+			raise ValueError("Compact song key indexes don't store keys.")
+
+		return list(self._counts)
+
+	def add(self, song):
+		"""Add a song to the index.
+
+		Adding a filepath already in the index replaces its previous key.
+
+		Parameters:
+			song (dict or str): A Google Music song dict or a local song filepath.
+		"""
+
+		key = self._hash_key(_song_comparison_key(song, metadata_cache=self.metadata_cache))
+
+		if not isinstance(song, dict):
+			self._discard_path(song)
+			self._paths[song] = key
+		elif 'id' in song:
+			self._ids[song['id']] += 1
+
+		self._counts[key] += 1
+
+	def update(self, songs):
+		"""Add songs to the index.
+
+		Parameters:
+			songs (list): Google Music song dicts or filepaths of local songs.
+		"""
+
+		for song in songs:
+			self.add(song)
+
+	def _discard_path(self, filepath):
+		key = self._paths.pop(filepath, None)
+
+		if key is None:
+			return False
+
+		self._counts[key] -= 1
+
+		if self._counts[key] <= 0:
+			del self._counts[key]
+
+		return True
+
+	def remove(self, song):
+		"""Remove a song from the index.
+
+		Filepaths are removed using the key recorded when they were added, so the file doesn't need to exist.
+
+		Parameters:
+			song (dict or str): A Google Music song dict or a local song filepath.
+
+		Raises:
+			KeyError: If the song isn't in the index.
+		"""
+
+		if not isinstance(song, dict):
+			if not self._discard_path(song):
+				raise KeyError(song)
+
+			return
+
+		key = self._hash_key(_song_comparison_key(song))
+
+		if key not in self._counts:
+			raise KeyError(key)
+
+		self._counts[key] -= 1
+
+		if not self._counts[key]:
+			del self._counts[key]
+
+		if 'id' in song and self._ids[song['id']] > 0:
+			self._ids[song['id']] -= 1
+
+			if not self._ids[song['id']]:
+				del self._ids[song['id']]
+
+	def _encode_key(self, key):
+		# bytes.hex() requires Python 3.5.
+		return binascii.hexlify(key).decode('ascii') if self.compact else list(key)
+
+	def _decode_key(self, key):
+		return bytes.fromhex(key) if self.compact else tuple(key)
+
+	def save(self, filepath):
+		"""Save the index to a JSON file.
+
+		Parameters:
+			filepath (str): The filepath to save the index to.
+		"""
+
+		data = {
+			'version': INDEX_VERSION, 'compact': self.compact,
+			'keys': [[self._encode_key(key), count] for key, count in self._counts.items()],
+			'paths': {path: self._encode_key(key) for path, key in self._paths.items()},
+			'ids': self._ids
+		}
+
+		temp_filepath = filepath + '.tmp'
+
+		with open(temp_filepath, 'w') as f:
+			json.dump(data, f)
+
+		os.replace(temp_filepath, filepath)
+
+	@classmethod
+	def load(cls, filepath, metadata_cache=None):
+		"""Load an index from a JSON file.
+
+		Parameters:
+			filepath (str): The filepath of a saved index.
+
+			metadata_cache (MetadataCache): A cache used to avoid reloading metadata of unchanged local files.
+
+		Returns:
+			A :class:`SongKeyIndex`.
+		"""
+
+		with open(filepath) as f:
+			data = json.load(f)
+
+		if data.get('version') != INDEX_VERSION:
+			raise ValueError("Unsupported song key index version in {}.".format(filepath))
+
+		index = cls(compact=data['compact'], metadata_cache=metadata_cache)
+		index._counts.update({index._decode_key(key): count for key, count in data['keys']})
+		index._paths = {path: index._decode_key(key) for path, key in data['paths'].items()}
+		index._ids.update(data.get('ids', {}))
+
+		logger.info("Loaded {0} song keys from {1}".format(len(index), filepath))
+
+		return index
+
+
+class FingerprintIndex:
+	"""A persistent index of audio fingerprints of songs known to be in a collection, e.g. a Google Music library.
+
+	Fingerprints hash only the audio data of a file (see :func:`~gmusicapi_wrapper.tags.audio_fingerprint`),
+	so a local file still matches after its tags are edited.
+	Fingerprints of local files are remembered with their size and modification time and only recomputed on change.
+
+	Pass it to :meth:`MusicManagerWrapper.upload <gmusicapi_wrapper.musicmanager.MusicManagerWrapper.upload>`
+	to record uploaded songs and to :func:`~gmusicapi_wrapper.utils.compare_song_collections`
+	to match local files by audio.
+	"""
+
+	def __init__(self):
+		self._songs = {}
+		self._paths = {}
+
+	def __len__(self):
+		return len(self._songs)
+
+	def __contains__(self, filepath):
+		try:
+			return self.fingerprint(filepath) in self._songs
+		except OSError:
+			return False
+
+	def fingerprint(self, filepath):
+		"""Get the audio fingerprint of a local file.
+
+		Parameters:
+			filepath (str): A local music filepath.
+
+		Returns:
+			A hex digest string.
+
+		Raises:
+			OSError: If the file can't be read.
+		"""
+
+		stat = os.stat(filepath)
+		entry = self._paths.get(filepath)
+
+		if entry is not None and entry[:2] == [stat.st_size, stat.st_mtime_ns]:
+			return entry[2]
+
+		fingerprint = audio_fingerprint(filepath)
+		self._paths[filepath] = [stat.st_size, stat.st_mtime_ns, fingerprint]
+
+		return fingerprint
+
+	def add(self, filepath, song_id=None):
+		"""Add a local file to the index.
+
+		Parameters:
+			filepath (str): A local music filepath.
+
+			song_id (str): The Google Music song id of the file, if known.
+
+		Returns:
+			The fingerprint of the file.
+
+		Raises:
+			OSError: If the file can't be read.
+		"""
+
+		fingerprint = self.fingerprint(filepath)
+
+		if song_id is not None or fingerprint not in self._songs:
+			self._songs[fingerprint] = song_id
+
+		return fingerprint
+
+	def remove(self, fingerprint):
+		"""Remove a fingerprint from the index.
+
+		Remembered local files with the fingerprint are forgotten as well.
+
+		Parameters:
+			fingerprint (str): An audio fingerprint.
+
+		Raises:
+			KeyError: If the fingerprint isn't in the index.
+		"""
+
+		del self._songs[fingerprint]
+
+		for filepath in [filepath for filepath, entry in self._paths.items() if entry[2] == fingerprint]:
+			del self._paths[filepath]
+
+	def reconcile(self, google_songs):
+		"""Remove fingerprints whose songs are no longer in the Google Music library.
+
+		Fingerprints added without a song id are kept.
+
+		Parameters:
+			google_songs (list): Google Music song dicts of the whole library,
+				e.g. from :meth:`~gmusicapi_wrapper.musicmanager.MusicManagerWrapper.get_google_songs`.
+
+		Returns:
+			A list of removed fingerprints.
+		"""
+
+		song_ids = {song['id'] for song in google_songs}
+
+		removed = [
+			fingerprint for fingerprint, song_id in self._songs.items()
+			if song_id is not None and song_id not in song_ids
+		]
+
+		for fingerprint in removed:
+			self.remove(fingerprint)
+
+		logger.info("Reconciled fingerprint index: removed {0} songs no longer in the library".format(len(removed)))
+
+		return removed
+
+	def get_song_id(self, filepath):
+		"""Get the Google Music song id recorded for the audio of a local file.
+
+		Parameters:
+			filepath (str): A local music filepath.
+
+		Returns:
+			A song id or ``None`` if the audio isn't in the index or was added without a song id.
+		"""
+
+		try:
+			return self._songs.get(self.fingerprint(filepath))
+		except OSError:
+			return None
+
+	def save(self, filepath):
+		"""Save the index to a JSON file.
+
+		Parameters:
+			filepath (str): The filepath to save the index to.
+		"""
+
+		data = {'version': INDEX_VERSION, 'songs': self._songs, 'paths': self._paths}
+
+		temp_filepath = filepath + '.tmp'
+
+		with open(temp_filepath, 'w') as f:
+			json.dump(data, f)
+
+		os.replace(temp_filepath, filepath)
+
+	@classmethod
+	def load(cls, filepath):
+		"""Load an index from a JSON file.
+
+		Parameters:
+			filepath (str): The filepath of a saved index.
+
+		Returns:
+			A :class:`FingerprintIndex`.
+		"""
+
+		with open(filepath) as f:
+			data = json.load(f)
+
+		if data.get('version') != INDEX_VERSION:
+			raise ValueError("Unsupported fingerprint index version in {}.".format(filepath))
+
+		index = cls()
+		index._songs = data['songs']
+		index._paths = data['paths']
+
+		logger.info("Loaded {0} fingerprints from {1}".format(len(index), filepath))
+
+		return index
@@ -0,0 +1,150 @@
+# coding=utf-8
+
+"""Resumable transfer journal for uploads and downloads.
+
+	>>> from gmusicapi_wrapper.journal import TransferJournal
+"""
+
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class TransferJournal:
+	"""An append-only JSON lines log of upload and download results.
+
+	Pass the same journal to :meth:`~gmusicapi_wrapper.musicmanager.MusicManagerWrapper.upload` or
+	:meth:`~gmusicapi_wrapper.musicmanager.MusicManagerWrapper.download` when restarting an interrupted job
+	to skip items that already finished without making any API calls.
+	Items with an ``'error'`` result are tried again.
+
+	Each result is written as one line as soon as it's known.
+	A partially written last line, e.g. after a crash, is ignored and overwritten.
+
+	Parameters:
+		filepath (str): The filepath of the journal file.
+
+		sync_every (int): Number of records between ``os.fsync`` calls.
+			``1`` makes every record durable before the next transfer starts.
+			``0`` leaves syncing to the operating system. Default: ``1``
+
+	Can be used as a context manager to sync and close the journal on exit.
+	"""
+
+	def __init__(self, filepath, sync_every=1):
+		self.filepath = filepath
+		self.sync_every = sync_every
+
+		self._results = {}
+		self._pending = 0
+
+		valid_size = self._load()
+
+		self._file = open(filepath, 'ab')
+
+		if self._file.tell() != valid_size:
+			logger.warning("Discarding incomplete record at end of transfer journal {}".format(filepath))
+			self._file.truncate(valid_size)
+			self._file.seek(valid_size)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def __len__(self):
+		return len(self._results)
+
+	def _load(self):
+		"""Read existing records and return the size of the file up to the last complete line."""
+
+		valid_size = 0
+
+		try:
+			f = open(self.filepath, 'rb')
+		except FileNotFoundError:
+			return valid_size
+
+		with f:
+			for line in f:
+				if not line.endswith(b'\n'):
+					break
+
+				try:
+					record = json.loads(line.decode('utf-8'))
+					self._results[(record['kind'], record['key'])] = record['result']
+				except (ValueError, KeyError, TypeError):
+					logger.warning("Skipping invalid record in transfer journal {}".format(self.filepath))
+
+				valid_size += len(line)
+
+		return valid_size
+
+	def get(self, kind, key):
+		"""Get the last recorded result of an item.
+
+		Parameters:
+			kind (str): ``'upload'`` or ``'download'``.
+
+			key (str): The filepath of an upload or the song id of a download.
+
+		Returns:
+			A result dict or ``None``.
+		"""
+
+		return self._results.get((kind, key))
+
+	def is_finished(self, kind, key):
+		"""Check if an item has a recorded result other than ``'error'``.
+
+		Parameters:
+			kind (str): ``'upload'`` or ``'download'``.
+
+			key (str): The filepath of an upload or the song id of a download.
+
+		Returns:
+			``True`` if the item doesn't need to be transferred again.
+		"""
+
+		result = self.get(kind, key)
+
+		return result is not None and result.get('result') != 'error'
+
+	def record(self, kind, key, result):
+		"""Append the result of an item to the journal.
+
+		Parameters:
+			kind (str): ``'upload'`` or ``'download'``.
+
+			key (str): The filepath of an upload or the song id of a download.
+
+			result (dict): The result dict of the item. Values that aren't JSON types are stored as strings.
+		"""
+
+		line = json.dumps({'kind': kind, 'key': key, 'result': result}, default=str) + '\n'
+
+		self._file.write(line.encode('utf-8'))
+		self._file.flush()
+
+		self._results[(kind, key)] = json.loads(line)['result']
+		self._pending += 1
+
+		if self.sync_every and self._pending >= self.sync_every:
+			self.sync()
+
+	def sync(self):
+		"""Flush and fsync recorded results to disk."""
+
+		self._file.flush()
+		os.fsync(self._file.fileno())
+		self._pending = 0
+
+	def close(self):
+		"""Sync recorded results and close the journal."""
+
+		if not self._file.closed:
+			self.sync()
+			self._file.close()
@@ -0,0 +1,149 @@
+# coding=utf-8
+
+"""Persistent record of uploaded local files.
+
+	>>> from gmusicapi_wrapper.ledger import UploadLedger
+"""
+
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+class UploadLedger:
+	"""An SQLite-backed record of the Google Music song id each local file was uploaded as.
+
+	Entries are keyed by filepath and are only used while the file's size and modification time are unchanged,
+	so a changed file is uploaded again. Uploaded, matched, and already existing files are all recorded.
+
+	Pass it to :meth:`~gmusicapi_wrapper.musicmanager.MusicManagerWrapper.upload`
+	to skip recorded files without contacting Google Music.
+	Use :meth:`reconcile` to forget files whose songs were deleted from Google Music.
+
+	Parameters:
+		filepath (str): The filepath of the ledger database. Default: ``':memory:'``
+
+		commit_interval (int): Number of ledger writes between database commits. Default: ``100``
+
+	Can be used as a context manager to commit and close the database on exit.
+	"""
+
+	def __init__(self, filepath=':memory:', commit_interval=100):
+		self.filepath = filepath
+		self.commit_interval = commit_interval
+
+		self._pending = 0
+		# Uploads may be consumed from a worker thread, e.g. by the aio wrappers, but never from two threads at once.
+		self._conn = sqlite3.connect(filepath, check_same_thread=False)
+		self._conn.execute(
+			"CREATE TABLE IF NOT EXISTS uploads (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, song_id TEXT)"
+		)
+		self._conn.execute("CREATE INDEX IF NOT EXISTS uploads_song_id ON uploads (song_id)")
+		self._conn.commit()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc_info):
+		self.close()
+
+	def __len__(self):
+		return self._conn.execute("SELECT COUNT(*) FROM uploads").fetchone()[0]
+
+	@staticmethod
+	def _stat_key(filepath):
+		stat = os.stat(filepath)
+
+		return stat.st_size, stat.st_mtime_ns
+
+	def get(self, filepath):
+		"""Get the song id a local file was uploaded as.
+
+		Parameters:
+			filepath (str): A local filepath.
+
+		Returns:
+			The Google Music song id or ``None`` if the file isn't recorded or changed since it was recorded.
+		"""
+
+		try:
+			key = self._stat_key(filepath)
+		except OSError:
+			return None
+
+		row = self._conn.execute("SELECT size, mtime_ns, song_id FROM uploads WHERE path = ?", (filepath,)).fetchone()
+
+		if row is None or tuple(row[:2]) != key:
+			return None
+
+		return row[2]
+
+	def record(self, filepath, song_id):
+		"""Record the song id a local file was uploaded as.
+
+		Parameters:
+			filepath (str): A local filepath.
+
+			song_id (str): The Google Music song id.
+		"""
+
+		try:
+			size, mtime_ns = self._stat_key(filepath)
+		except OSError:
+			return
+
+		self._conn.execute("INSERT OR REPLACE INTO uploads VALUES (?, ?, ?, ?)", (filepath, size, mtime_ns, song_id))
+
+		self._pending += 1
+
+		if self._pending >= self.commit_interval:
+			self.commit()
+
+	def remove(self, filepath):
+		"""Forget a local file.
+
+		Parameters:
+			filepath (str): A local filepath.
+		"""
+
+		self._conn.execute("DELETE FROM uploads WHERE path = ?", (filepath,))
+		self.commit()
+
+	def reconcile(self, google_songs):
+		"""Forget local files whose songs are no longer in the Google Music library.
+
+		Parameters:
+			google_songs (list): Google Music song dicts of the whole library,
+				e.g. from :meth:`~gmusicapi_wrapper.musicmanager.MusicManagerWrapper.get_google_songs`.
+
+		Returns:
+			A list of forgotten filepaths. They are uploaded again on the next upload.
+		"""
+
+		song_ids = {song['id'] for song in google_songs}
+
+		removed = [
+			path for path, song_id in self._conn.execute("SELECT path, song_id FROM uploads").fetchall()
+			if song_id not in song_ids
+		]
+
+		self._conn.executemany("DELETE FROM uploads WHERE path = ?", ((path,) for path in removed))
+		self.commit()
+
+		logger.info("Reconciled upload ledger: forgot {0} files no longer in the library".format(len(removed)))
+
+		return removed
+
+	def commit(self):
+		"""Commit pending ledger writes to disk."""
+
+		self._conn.commit()
+		self._pending = 0
+
+	def close(self):
+		"""Commit pending ledger writes and close the database."""
+
+		self.commit()
+		self._conn.close()
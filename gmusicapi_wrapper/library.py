@@ -0,0 +1,223 @@
+# coding=utf-8
+
+"""Id-indexed snapshots and an on-disk cache of Google Music libraries.
+
+	>>> from gmusicapi_wrapper.library import LibraryCache, LibrarySnapshot
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+LIBRARY_CACHE_VERSION = 1
+
+
+class LibrarySnapshot:
+	"""Google Music song dicts keyed by song id in the order they were added.
+
+	A song that is both uploaded and purchased is stored once, as first added,
+	and its id is in both :attr:`uploaded_ids` and :attr:`purchased_ids`.
+
+		>>> library = LibrarySnapshot(uploaded=musicmanager.get_uploaded_songs())
+		>>> library.add_purchased(musicmanager.get_purchased_songs())
+		>>> library.get(song_id)
+
+	Parameters:
+		uploaded (iterable): Song dicts of uploaded songs.
+
+		purchased (iterable): Song dicts of purchased songs.
+
+	Attributes:
+		uploaded_ids (set): Ids of uploaded songs.
+
+		purchased_ids (set): Ids of purchased songs.
+	"""
+
+	def __init__(self, uploaded=(), purchased=()):
+		self._songs = OrderedDict()
+
+		self.uploaded_ids = set()
+		self.purchased_ids = set()
+
+		self.add_uploaded(uploaded)
+		self.add_purchased(purchased)
+
+	def __len__(self):
+		return len(self._songs)
+
+	def __iter__(self):
+		return iter(self._songs.values())
+
+	def __contains__(self, song_id):
+		return song_id in self._songs
+
+	def __getitem__(self, song_id):
+		return self._songs[song_id]
+
+	def _add(self, songs, ids):
+		for song in songs:
+			song_id = song['id']
+
+			if song_id not in self._songs:
+				self._songs[song_id] = song
+
+			ids.add(song_id)
+
+	def add_uploaded(self, songs):
+		"""Add uploaded song dicts.
+
+		Parameters:
+			songs (iterable): Google Music song dicts.
+		"""
+
+		self._add(songs, self.uploaded_ids)
+
+	def add_purchased(self, songs):
+		"""Add purchased song dicts.
+
+		Parameters:
+			songs (iterable): Google Music song dicts.
+		"""
+
+		self._add(songs, self.purchased_ids)
+
+	def get(self, song_id, default=None):
+		"""Get a song dict by id.
+
+		Parameters:
+			song_id (str): A Google Music song id.
+
+			default: The value returned if the song isn't in the library.
+
+		Returns:
+			A Google Music song dict or ``default``.
+		"""
+
+		return self._songs.get(song_id, default)
+
+	def songs(self):
+		"""Get all song dicts in the order they were added.
+
+		Returns:
+			A list of Google Music song dicts.
+		"""
+
+		return list(self._songs.values())
+
+
+class LibraryCache:
+	"""An on-disk cache of Google Music song lists per account.
+
+	Song lists are stored as gzipped JSON files named by a hash of the account and the list name,
+	and expire ``ttl`` seconds after they were fetched.
+
+	Pass it to :class:`~gmusicapi_wrapper.MusicManagerWrapper` or :class:`~gmusicapi_wrapper.MobileClientWrapper`
+	to reuse the song lists of ``get_google_songs`` across runs.
+	Uploads through :meth:`~gmusicapi_wrapper.musicmanager.MusicManagerWrapper.upload` invalidate the cache;
+	call :meth:`invalidate` after changing the library in other ways.
+
+	Parameters:
+		directory (str): The directory to store cached song lists in. Created if it doesn't exist.
+
+		ttl (float): Seconds a cached song list is used for. ``None`` never expires song lists.
+			Default: ``3600``
+	"""
+
+	def __init__(self, directory, ttl=3600):
+		self.directory = directory
+		self.ttl = ttl
+
+		os.makedirs(directory, exist_ok=True)
+
+	def _cache_filepath(self, account, name):
+		account_hash = hashlib.sha1(account.encode('utf-8')).hexdigest()[:16]
+
+		return os.path.join(self.directory, '{0}-{1}.json.gz'.format(account_hash, name))
+
+	def get(self, account, name):
+		"""Get a cached song list.
+
+		Parameters:
+			account (str): A key identifying the Google account, e.g. the wrapper's ``account`` attribute.
+
+			name (str): The name of the song list, e.g. ``'uploaded'``.
+
+		Returns:
+			A list of Google Music song dicts or ``None`` if the list isn't cached or expired.
+		"""
+
+		filepath = self._cache_filepath(account, name)
+
+		try:
+			with gzip.open(filepath, 'rt', encoding='utf-8') as f:
+				data = json.load(f)
+		except (OSError, ValueError):
+			return None
+
+		if data.get('version') != LIBRARY_CACHE_VERSION or data.get('account') != account:
+			return None
+
+		if self.ttl is not None and time.time() - data['timestamp'] > self.ttl:
+			logger.debug("Cached {} song list expired".format(name))
+			return None
+
+		logger.info("Loaded {0} Google Music songs from the library cache".format(len(data['songs'])))
+
+		return data['songs']
+
+	def set(self, account, name, songs):
+		"""Cache a song list.
+
+		Parameters:
+			account (str): A key identifying the Google account.
+
+			name (str): The name of the song list.
+
+			songs (list): Google Music song dicts.
+		"""
+
+		filepath = self._cache_filepath(account, name)
+		temp_filepath = filepath + '.tmp'
+
+		data = {'version': LIBRARY_CACHE_VERSION, 'account': account, 'timestamp': time.time(), 'songs': songs}
+
+		with gzip.open(temp_filepath, 'wt', encoding='utf-8', compresslevel=6) as f:
+			json.dump(data, f, separators=(',', ':'))
+
+		os.replace(temp_filepath, filepath)
+
+	def invalidate(self, account=None):
+		"""Remove cached song lists.
+
+		Parameters:
+			account (str): Only remove the song lists of this account. Default: Remove all song lists.
+
+		Returns:
+			The number of removed song lists.
+		"""
+
+		if account is None:
+			prefix = ''
+		else:
+			prefix = os.path.basename(self._cache_filepath(account, ''))[:16]
+
+		removed = 0
+
+		for filename in os.listdir(self.directory):
+			if filename.startswith(prefix) and filename.endswith('.json.gz'):
+				try:
+					os.remove(os.path.join(self.directory, filename))
+				except OSError:
+					continue
+
+				removed += 1
+
+		logger.debug("Invalidated {} cached song lists".format(removed))
+
+		return removed
@@ -6,11 +6,13 @@
 """
 
 import getpass
+import itertools
 import logging
 
 from gmusicapi.clients import Mobileclient
 
 from .base import _BaseWrapper
+from .songtable import SongTable
 from .utils import filter_google_songs
 
 logger = logging.getLogger(__name__)
@@ -21,10 +23,12 @@ class MobileClientWrapper(_BaseWrapper):
 
 	Parameters:
 		enable_logging (bool): Enable gmusicapi's debug_logging option.
+
+		library_cache (LibraryCache): A cache to reuse the song list of :meth:`get_google_songs` from.
 	"""
 
-	def __init__(self, enable_logging=False):
-		super().__init__(Mobileclient, enable_logging=enable_logging)
+	def __init__(self, enable_logging=False, library_cache=None):
+		super().__init__(Mobileclient, enable_logging=enable_logging, library_cache=library_cache)
 
 	def login(self, username=None, password=None, android_id=None):
 		"""Authenticate the gmusicapi Mobileclient instance.
@@ -42,6 +46,7 @@ class MobileClientWrapper(_BaseWrapper):
 		"""
 
 		cls_name = type(self).__name__
+		self.account = None
 
 		if username is None:
 			username = input("Enter your Google username or email address: ")
@@ -62,6 +67,8 @@ class MobileClientWrapper(_BaseWrapper):
 
 			return False
 
+		self.account = 'mobileclient:' + username
+
 		logger.info("{} authentication succeeded.\n".format(cls_name))
 
 		return True
@@ -73,6 +80,8 @@ class MobileClientWrapper(_BaseWrapper):
 			``True`` on success.
 		"""
 
+		self.account = None
+
 		return self.api.logout()
 
 	@property
@@ -85,7 +94,7 @@ class MobileClientWrapper(_BaseWrapper):
 
 		return self.api.is_subscribed
 
-	def get_google_songs(self, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False):
+	def get_google_songs(self, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False, as_table=False):
 		"""Create song list from user's Google Music library.
 
 		Parameters:
@@ -103,6 +112,11 @@ class MobileClientWrapper(_BaseWrapper):
 
 			all_excludes (bool): If ``True``, all exclude_filters criteria must match to exclude a song.
 
+			as_table (bool): If ``True``, load songs page by page into a :class:`~gmusicapi_wrapper.songtable.SongTable`
+				and return :class:`~gmusicapi_wrapper.songtable.SongTableView` instances instead of lists.
+				This uses a fraction of the memory of song dicts, but building the table is slower than filtering lists.
+				Default: ``False``.
+
 		Returns:
 			A list of Google Music song dicts matching criteria and
 			a list of Google Music song dicts filtered out using filter criteria.
@@ -110,12 +124,26 @@ class MobileClientWrapper(_BaseWrapper):
 
 		logger.info("Loading Google Music songs...")
 
-		google_songs = self.api.get_all_songs()
+		if as_table:
+			if self.library_cache is None or self.account is None:
+				# Build the table page by page so the full list of song dicts is never held in memory.
+				songs = itertools.chain.from_iterable(self.api.get_all_songs(incremental=True))
+			else:
+				songs = self._load_google_songs('all', self.api.get_all_songs)
 
-		matched_songs, filtered_songs = filter_google_songs(
-			google_songs, include_filters=include_filters, exclude_filters=exclude_filters,
-			all_includes=all_includes, all_excludes=all_excludes
-		)
+			google_songs = SongTable.from_songs(songs)
+
+			matched_songs, filtered_songs = google_songs.filter(
+				include_filters=include_filters, exclude_filters=exclude_filters,
+				all_includes=all_includes, all_excludes=all_excludes
+			)
+		else:
+			google_songs = self._load_google_songs('all', self.api.get_all_songs)
+
+			matched_songs, filtered_songs = filter_google_songs(
+				google_songs, include_filters=include_filters, exclude_filters=exclude_filters,
+				all_includes=all_includes, all_excludes=all_excludes
+			)
 
 		logger.info("Filtered {0} Google Music songs".format(len(filtered_songs)))
 		logger.info("Loaded {0} Google Music songs".format(len(matched_songs)))
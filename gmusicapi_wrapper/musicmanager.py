@@ -5,10 +5,12 @@
 	>>> from gmusicapi_wrapper import MusicManagerWrapper
 """
 
+import functools
+import io
 import logging
 import os
-import shutil
 import tempfile
+import threading
 
 import mutagen
 from gmusicapi import CallFailure
@@ -17,20 +19,92 @@ from gmusicapi.clients import Musicmanager, OAUTH_FILEPATH
 from .base import _BaseWrapper
 from .constants import CYGPATH_RE, GM_ID_RE
 from .decorators import cast_to_list
-from .utils import convert_cygwin_path, filter_google_songs, template_to_filepath
+from .library import LibrarySnapshot
+from .songtable import SongTable
+from .utils import _google_song_to_metadata, _iter_concurrent, convert_cygwin_path, filter_google_songs, template_to_filepath
 
 logger = logging.getLogger(__name__)
 
 
+class _DownloadTargets:
+	"""Write downloaded songs to their target filepaths.
+
+	Each song is written to a temporary file in its target directory and renamed into place,
+	so a partial file is never left at the target filepath.
+	Created directories are remembered to avoid repeated ``os.makedirs`` calls.
+
+	Concurrent downloads can render to the same filepath.
+	Renames to a filepath are done one at a time, and a rename is skipped if a song later in the input
+	was already written there, leaving the file a sequential download would.
+	"""
+
+	def __init__(self):
+		self._lock = threading.Lock()
+		self._path_locks = {}
+		self._positions = {}
+		self._dirs = set()
+
+	def _make_dirs(self, dirname):
+		if dirname and dirname not in self._dirs:
+			os.makedirs(dirname, exist_ok=True)
+
+			with self._lock:
+				self._dirs.add(dirname)
+
+	def write(self, audio, filepath, position):
+		dirname = os.path.dirname(filepath)
+		self._make_dirs(dirname)
+
+		temp = tempfile.NamedTemporaryFile(dir=dirname or os.curdir, prefix='.', suffix='.part', delete=False)
+
+		try:
+			with temp:
+				temp.write(audio)
+		except BaseException:
+			os.remove(temp.name)
+			raise
+
+		with self._lock:
+			path_lock = self._path_locks.setdefault(filepath, threading.Lock())
+
+		with path_lock:
+			if self._positions.get(filepath, -1) > position:
+				os.remove(temp.name)
+				return
+
+			os.replace(temp.name, filepath)
+			self._positions[filepath] = position
+
+
+def _is_existing_download(filepath, song, check_size=False):
+	"""Check if a song was already downloaded to filepath."""
+
+	try:
+		size = os.path.getsize(filepath)
+	except OSError:
+		return False
+
+	if not check_size:
+		return True
+
+	# Musicmanager and Mobileclient song dicts name the size differently.
+	song_size = song.get('track_size', song.get('estimatedSize'))
+
+	return song_size is not None and int(song_size) == size
+
+
 class MusicManagerWrapper(_BaseWrapper):
 	"""Wrap gmusicapi's Musicmanager client interface to provide extra functionality and conveniences.
 
 	Parameters:
 		enable_logging (bool): Enable gmusicapi's debug_logging option.
+
+		library_cache (LibraryCache): A cache to reuse the song lists of :meth:`get_google_songs` from.
+			Invalidated when files are uploaded or matched.
 	"""
 
-	def __init__(self, enable_logging=False):
-		super().__init__(Musicmanager, enable_logging=enable_logging)
+	def __init__(self, enable_logging=False, library_cache=None):
+		super().__init__(Musicmanager, enable_logging=enable_logging, library_cache=library_cache)
 
 	def login(self, oauth_filename="oauth", uploader_id=None):
 		"""Authenticate the gmusicapi Musicmanager instance.
@@ -47,6 +121,7 @@ class MusicManagerWrapper(_BaseWrapper):
 		"""
 
 		cls_name = type(self).__name__
+		self.account = None
 
 		oauth_cred = os.path.join(os.path.dirname(OAUTH_FILEPATH), oauth_filename + '.cred')
 
@@ -68,6 +143,8 @@ class MusicManagerWrapper(_BaseWrapper):
 
 			return False
 
+		self.account = 'musicmanager:' + oauth_cred
+
 		logger.info("{} authentication succeeded.\n".format(cls_name))
 
 		return True
@@ -82,11 +159,13 @@ class MusicManagerWrapper(_BaseWrapper):
 			``True`` on success.
 		"""
 
+		self.account = None
+
 		return self.api.logout(revoke_oauth=revoke_oauth)
 
 	def get_google_songs(
 		self, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False,
-		uploaded=True, purchased=True):
+		uploaded=True, purchased=True, as_table=False):
 		"""Create song list from user's Google Music library.
 
 		Parameters:
@@ -108,6 +187,11 @@ class MusicManagerWrapper(_BaseWrapper):
 
 			purchased (bool): Include purchased songs. Default: ``True``.
 
+			as_table (bool): If ``True``, load songs page by page into a :class:`~gmusicapi_wrapper.songtable.SongTable`
+				and return :class:`~gmusicapi_wrapper.songtable.SongTableView` instances instead of lists.
+				This uses a fraction of the memory of song dicts, but building the table is slower than filtering lists.
+				Default: ``False``.
+
 		Returns:
 			A list of Google Music song dicts matching criteria and
 			a list of Google Music song dicts filtered out using filter criteria.
@@ -118,102 +202,205 @@ class MusicManagerWrapper(_BaseWrapper):
 
 		logger.info("Loading Google Music songs...")
 
-		google_songs = []
+		if as_table:
+			google_songs = SongTable.from_songs(self._iter_google_songs(uploaded, purchased))
 
-		if uploaded:
-			google_songs += self.api.get_uploaded_songs()
+			matched_songs, filtered_songs = google_songs.filter(
+				include_filters=include_filters, exclude_filters=exclude_filters,
+				all_includes=all_includes, all_excludes=all_excludes
+			)
+		else:
+			library = LibrarySnapshot()
 
-		if purchased:
-			for song in self.api.get_purchased_songs():
-				if song not in google_songs:
-					google_songs.append(song)
+			if uploaded:
+				library.add_uploaded(self._load_google_songs('uploaded', self.api.get_uploaded_songs))
 
-		matched_songs, filtered_songs = filter_google_songs(
-			google_songs, include_filters=include_filters, exclude_filters=exclude_filters,
-			all_includes=all_includes, all_excludes=all_excludes
-		)
+			if purchased:
+				library.add_purchased(self._load_google_songs('purchased', self.api.get_purchased_songs))
+
+			google_songs = library.songs()
+
+			matched_songs, filtered_songs = filter_google_songs(
+				google_songs, include_filters=include_filters, exclude_filters=exclude_filters,
+				all_includes=all_includes, all_excludes=all_excludes
+			)
 
 		logger.info("Filtered {0} Google Music songs".format(len(filtered_songs)))
 		logger.info("Loaded {0} Google Music songs".format(len(matched_songs)))
 
 		return matched_songs, filtered_songs
 
+	def _iter_google_songs(self, uploaded, purchased):
+		"""Yield uploaded and then purchased song dicts, skipping song ids already yielded.
+
+		Without a library cache, songs are requested page by page so the full list of song dicts is never held in memory.
+		"""
+
+		loads = []
+
+		if uploaded:
+			loads.append(('uploaded', self.api.get_uploaded_songs))
+
+		if purchased:
+			loads.append(('purchased', self.api.get_purchased_songs))
+
+		song_ids = set()
+
+		for name, load in loads:
+			if self.library_cache is None or self.account is None:
+				pages = load(incremental=True)
+			else:
+				pages = [self._load_google_songs(name, load)]
+
+			for page in pages:
+				for song in page:
+					if song['id'] not in song_ids:
+						song_ids.add(song['id'])
+						yield song
+
+	@staticmethod
+	def _song_filepath(song, template):
+		"""Render the download filepath of a song from its Google Music song dict."""
+
+		return template_to_filepath(template, _google_song_to_metadata(song)) + '.mp3'
+
+	def _download_song(self, song, template, position, targets, song_metadata=False, scheduler=None):
+		"""Download a song to a filepath rendered from template.
+
+		If ``song_metadata`` is ``True``, the filepath is rendered from the song dict instead of the downloaded tags.
+
+		Raises:
+			CallFailure: If the song couldn't be downloaded.
+		"""
+
+		song_id = song['id']
+
+		title = song.get('title', "<empty>")
+		artist = song.get('artist', "<empty>")
+		album = song.get('album', "<empty>")
+
+		logger.debug(
+			"Downloading {title} -- {artist} -- {album} ({song_id})".format(
+				title=title, artist=artist, album=album, song_id=song_id
+			)
+		)
+
+		if scheduler is not None:
+			_, audio = scheduler.call(self.api.download_song, song_id)
+		else:
+			_, audio = self.api.download_song(song_id)
+
+		if song_metadata:
+			metadata = None
+		else:
+			try:
+				metadata = mutagen.File(io.BytesIO(audio), easy=True)
+			except mutagen.MutagenError:
+				metadata = None
+
+		if metadata is None:
+			filepath = self._song_filepath(song, template)
+		else:
+			filepath = template_to_filepath(template, metadata) + '.mp3'
+
+		targets.write(audio, filepath, position)
+
+		return filepath
+
 	@cast_to_list(0)
-	def _download(self, songs, template=None):
+	def _download(self, songs, template=None, max_workers=None, ordered=True, song_metadata=False, scheduler=None):
 		if not template:
 			template = os.getcwd()
 
 		if os.name == 'nt' and CYGPATH_RE.match(template):
 			template = convert_cygwin_path(template)
 
-		for song in songs:
-			song_id = song['id']
+		targets = _DownloadTargets()
 
-			title = song.get('title', "<empty>")
-			artist = song.get('artist', "<empty>")
-			album = song.get('album', "<empty>")
+		def download_song(item):
+			position, song = item
 
-			logger.debug(
-				"Downloading {title} -- {artist} -- {album} ({song_id})".format(
-					title=title, artist=artist, album=album, song_id=song_id
-				)
-			)
+			return self._download_song(song, template, position, targets, song_metadata=song_metadata, scheduler=scheduler)
+
+		for (position, song), future in _iter_concurrent(
+				download_song, enumerate(songs), max_workers=max_workers, ordered=ordered):
+			song_id = song['id']
 
 			try:
-				_, audio = self.api.download_song(song_id)
+				result = ({song_id: future.result()}, {})
 			except CallFailure as e:
 				result = ({}, {song_id: e})
-			else:
-				with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp:
-					temp.write(audio)
 
-				metadata = mutagen.File(temp.name, easy=True)
-				filepath = template_to_filepath(template, metadata) + '.mp3'
-				dirname = os.path.dirname(filepath)
+			yield song, result
 
-				if dirname:
-					try:
-						os.makedirs(dirname)
-					except OSError:
-						if not os.path.isdir(dirname):
-							raise
+	@cast_to_list(0)
+	def iter_download(
+		self, songs, template=None, max_workers=None, ordered=True, journal=None, skip_existing=False, scheduler=None):
+		"""Lazily download Google Music songs.
 
-				shutil.move(temp.name, filepath)
+		Takes the same parameters as :meth:`download`.
 
-				result = ({song_id: filepath}, {})
+		Yields:
+			Result dictionaries as songs finish, in the format returned by :meth:`download`.
+		"""
 
-			yield result
+		if not template:
+			template = os.getcwd()
 
-	@cast_to_list(0)
-	def download(self, songs, template=None):
-		"""Download Google Music songs.
+		if os.name == 'nt' and CYGPATH_RE.match(template):
+			template = convert_cygwin_path(template)
 
-		Parameters:
-			songs (list or dict): Google Music song dict(s).
+		if journal is not None:
+			pending = []
+			finished = []
 
-			template (str): A filepath which can include template patterns.
+			for song in songs:
+				result = journal.get('download', song['id'])
 
-		Returns:
-			A list of result dictionaries.
-			::
+				if journal.is_finished('download', song['id']) and os.path.isfile(result['filepath']):
+					finished.append(result)
+				else:
+					pending.append(song)
 
-				[
-					{'result': 'downloaded', 'id': song_id, 'filepath': downloaded[song_id]},  # downloaded
-					{'result': 'error', 'id': song_id, 'message': error[song_id]}   # error
-				]
-		"""
+			if finished:
+				logger.info("Skipping {} songs already downloaded according to the journal".format(len(finished)))
 
-		if not template:
-			template = os.getcwd()
+			for result in finished:
+				yield result
+
+			songs = pending
+
+		if skip_existing:
+			pending = []
+			skipped = 0
+
+			for song in songs:
+				filepath = self._song_filepath(song, template)
+
+				if _is_existing_download(filepath, song, check_size=skip_existing == 'size'):
+					logger.debug("Skipping existing file -- {} ({})".format(filepath, song['id']))
+					yield {'result': 'skipped', 'id': song['id'], 'filepath': filepath}
+					skipped += 1
+				else:
+					pending.append(song)
+
+			if skipped:
+				logger.info("Skipping {} songs with existing files".format(skipped))
+
+			songs = pending
 
 		songnum = 0
 		total = len(songs)
-		results = []
 		errors = {}
 		pad = len(str(total))
 
-		for result in self._download(songs, template):
-			song_id = songs[songnum]['id']
+		if scheduler is not None and max_workers is None:
+			max_workers = scheduler.max_workers
+
+		for song, result in self._download(
+				songs, template, max_workers=max_workers, ordered=ordered, song_metadata=bool(skip_existing),
+				scheduler=scheduler):
+			song_id = song['id']
 			songnum += 1
 
 			downloaded, error = result
@@ -225,11 +412,11 @@ class MusicManagerWrapper(_BaseWrapper):
 					)
 				)
 
-				results.append({'result': 'downloaded', 'id': song_id, 'filepath': downloaded[song_id]})
+				song_result = {'result': 'downloaded', 'id': song_id, 'filepath': downloaded[song_id]}
 			elif error:
-				title = songs[songnum].get('title', "<empty>")
-				artist = songs[songnum].get('artist', "<empty>")
-				album = songs[songnum].get('album', "<empty>")
+				title = song.get('title', "<empty>")
+				artist = song.get('artist', "<empty>")
+				album = song.get('album', "<empty>")
 
 				logger.info(
 					"({num:>{pad}}/{total}) Error on download -- {title} -- {artist} -- {album} ({song_id})".format(
@@ -237,7 +424,12 @@ class MusicManagerWrapper(_BaseWrapper):
 					)
 				)
 
-				results.append({'result': 'error', 'id': song_id, 'message': error[song_id]})
+				song_result = {'result': 'error', 'id': song_id, 'message': error[song_id]}
+
+			if journal is not None:
+				journal.record('download', song_id, song_result)
+
+			yield song_result
 
 		if errors:
 			logger.info("\n\nThe following errors occurred:\n")
@@ -245,63 +437,184 @@ class MusicManagerWrapper(_BaseWrapper):
 				logger.info("{file} | {error}".format(file=filepath, error=e))
 			logger.info("\nThese files may need to be synced again.\n")
 
-		return results
-
 	@cast_to_list(0)
-	def _upload(self, filepaths, enable_matching=False, transcode_quality='320k'):
-		for filepath in filepaths:
-			try:
-				logger.debug("Uploading -- {}".format(filepath))
-				uploaded, matched, not_uploaded = self.api.upload(
-					filepath, enable_matching=enable_matching, transcode_quality=transcode_quality
-				)
-				result = (uploaded, matched, not_uploaded, {})
-			except CallFailure as e:
-				result = ({}, {}, {}, {filepath: e})
-
-			yield result
+	def download(
+		self, songs, template=None, max_workers=None, ordered=True, journal=None, skip_existing=False, scheduler=None):
+		"""Download Google Music songs.
 
-	@cast_to_list(0)
-	def upload(self, filepaths, enable_matching=False, transcode_quality='320k', delete_on_success=False):
-		"""Upload local songs to Google Music.
+		If several songs render to the same filepath, the file is left as if the songs were downloaded in order.
 
 		Parameters:
-			filepaths (list or str): Filepath(s) to upload.
+			songs (list or dict): Google Music song dict(s).
 
-			enable_matching (bool): If ``True`` attempt to use `scan and match
-				<http://support.google.com/googleplay/bin/answer.py?hl=en&answer=2920799&topic=2450455>`__.
-				This requieres ffmpeg or avconv.
+			template (str): A filepath which can include template patterns.
 
-			transcode_quality (str or int): If int, pass to ffmpeg/avconv ``-q:a`` for libmp3lame `VBR quality
-				<http://trac.ffmpeg.org/wiki/Encode/MP3#VBREncoding>'__.
-				If string, pass to ffmpeg/avconv ``-b:a`` for libmp3lame `CBR quality
-				<http://trac.ffmpeg.org/wiki/Encode/MP3#CBREncoding>'__.
-				Default: ``320k``
+			max_workers (int): Number of songs to download concurrently.
+				Default: Download one song at a time.
 
-			delete_on_success (bool): Delete successfully uploaded local files. Default: ``False``
+			ordered (bool): If ``True``, results are in the same order as ``songs``.
+				Otherwise, results are in the order downloads finish. Default: ``True``
+
+			journal (TransferJournal): A journal to record results in.
+				Songs with a finished result in the journal whose file still exists aren't downloaded again;
+				their journaled results come first.
+
+			skip_existing (bool or str): If ``True``, render filepaths from the Google Music song dicts
+				before downloading and skip songs whose file already exists.
+				If ``'size'``, only skip songs whose file also has the size given in the song dict.
+				Downloaded songs are saved to the filepaths rendered from the song dicts
+				so later runs find them. Default: ``False``
+
+			scheduler (TransferScheduler): A scheduler to retry failed downloads and adapt the number of
+				concurrent downloads. Uses up to ``scheduler.max_workers`` threads unless max_workers is given.
 
 		Returns:
 			A list of result dictionaries.
 			::
 
 				[
-					{'result': 'uploaded', 'filepath': <filepath>, 'id': <song_id>},  # uploaded
-					{'result': 'matched', 'filepath': <filepath>, 'id': <song_id>},  # matched
-					{'result': 'error', 'filepath': <filepath>, 'message': <error_message>},  # error
-					{'result': 'not_uploaded', 'filepath': <filepath>, 'id': <song_id>, 'message': <reason_message>},  # not_uploaded ALREADY_EXISTS
-					{'result': 'not_uploaded', 'filepath': <filepath>, 'message': <reason_message>}  # not_uploaded
+					{'result': 'downloaded', 'id': song_id, 'filepath': downloaded[song_id]},  # downloaded
+					{'result': 'skipped', 'id': song_id, 'filepath': filepath},  # skipped existing file
+					{'result': 'error', 'id': song_id, 'message': error[song_id]}   # error
 				]
 		"""
 
+		return list(
+			self.iter_download(
+				songs, template=template, max_workers=max_workers, ordered=ordered, journal=journal,
+				skip_existing=skip_existing, scheduler=scheduler
+			)
+		)
+
+	@cast_to_list(0)
+	def _upload(
+		self, filepaths, enable_matching=False, transcode_quality='320k', max_workers=None, ordered=True, batch_size=None,
+		scheduler=None, transcode_cache=None, transcode_workers=None):
+		upload = self.api.upload if scheduler is None else functools.partial(scheduler.call, self.api.upload)
+		batch_size = batch_size or 1
+
+		if transcode_cache is not None and transcode_workers is None:
+			transcode_workers = os.cpu_count()
+
+		def prepare_file(filepath):
+			if transcode_cache is None or filepath.lower().endswith('.mp3'):
+				return filepath
+
+			return transcode_cache.transcode(filepath, quality=transcode_quality)
+
+		def iter_batches():
+			# Transcodes run ahead of the uploads in their own pool.
+			batch = []
+
+			for filepath, future in _iter_concurrent(prepare_file, filepaths, max_workers=transcode_workers):
+				try:
+					batch.append((filepath, future.result(), None))
+				except (IOError, ValueError) as e:
+					logger.warning("Error transcoding {}: {}".format(filepath, e))
+					batch.append((filepath, None, "transcoding error: {}".format(e)))
+
+				if len(batch) >= batch_size:
+					yield batch
+					batch = []
+
+			if batch:
+				yield batch
+
+		def upload_batch(batch):
+			upload_filepaths = [upload_filepath for _, upload_filepath, _ in batch if upload_filepath is not None]
+
+			if not upload_filepaths:
+				return {}, {}, {}
+
+			for filepath, upload_filepath, _ in batch:
+				if upload_filepath is not None:
+					logger.debug("Uploading -- {}".format(filepath))
+
+			return upload(upload_filepaths, enable_matching=enable_matching, transcode_quality=transcode_quality)
+
+		for batch, future in _iter_concurrent(upload_batch, iter_batches(), max_workers=max_workers, ordered=ordered):
+			try:
+				uploaded, matched, not_uploaded = future.result()
+			except CallFailure as e:
+				# The whole call failed, so none of the batch's files can be trusted to be uploaded.
+				for filepath, _, transcode_error in batch:
+					if transcode_error is not None:
+						yield filepath, ({}, {}, {filepath: transcode_error}, {})
+					else:
+						yield filepath, ({}, {}, {}, {filepath: e})
+
+				continue
+
+			for filepath, upload_filepath, transcode_error in batch:
+				if transcode_error is not None:
+					result = ({}, {}, {filepath: transcode_error}, {})
+				elif upload_filepath in uploaded:
+					result = ({filepath: uploaded[upload_filepath]}, {}, {}, {})
+				elif upload_filepath in matched:
+					result = ({}, {filepath: matched[upload_filepath]}, {}, {})
+				else:
+					reason = not_uploaded.get(upload_filepath, "No upload result returned")
+					result = ({}, {}, {filepath: reason}, {})
+
+				yield filepath, result
+
+	@cast_to_list(0)
+	def iter_upload(
+		self, filepaths, enable_matching=False, transcode_quality='320k', delete_on_success=False, fingerprint_index=None,
+		journal=None, scheduler=None, max_workers=None, ordered=True, batch_size=None, ledger=None, transcode_cache=None,
+		transcode_workers=None):
+		"""Lazily upload local songs to Google Music.
+
+		Takes the same parameters as :meth:`upload`.
+
+		Yields:
+			Result dictionaries as files finish, in the format returned by :meth:`upload`.
+		"""
+
+		if journal is not None:
+			finished = [journal.get('upload', filepath) for filepath in filepaths if journal.is_finished('upload', filepath)]
+			filepaths = [filepath for filepath in filepaths if not journal.is_finished('upload', filepath)]
+
+			if finished:
+				logger.info("Skipping {} songs already uploaded according to the journal".format(len(finished)))
+
+			for result in finished:
+				yield result
+
+		if ledger is not None:
+			pending = []
+			skipped = 0
+
+			for filepath in filepaths:
+				song_id = ledger.get(filepath)
+
+				if song_id is not None:
+					logger.debug("Skipping file in upload ledger -- {} ({})".format(filepath, song_id))
+					# The ledger isn't confirmed by Google Music, so skipped files are never deleted.
+					yield {'result': 'skipped', 'filepath': filepath, 'id': song_id}
+					skipped += 1
+				else:
+					pending.append(filepath)
+
+			if skipped:
+				logger.info("Skipping {} songs already uploaded according to the upload ledger".format(skipped))
+
+			filepaths = pending
+
 		filenum = 0
 		total = len(filepaths)
-		results = []
 		errors = {}
 		pad = len(str(total))
 		exist_strings = ["ALREADY_EXISTS", "this song is already uploaded"]
+		library_changed = False
+
+		if scheduler is not None and max_workers is None:
+			max_workers = scheduler.max_workers
 
-		for result in self._upload(filepaths, enable_matching=enable_matching, transcode_quality=transcode_quality):
-			filepath = filepaths[filenum]
+		for filepath, result in self._upload(
+				filepaths, enable_matching=enable_matching, transcode_quality=transcode_quality, max_workers=max_workers,
+				ordered=ordered, batch_size=batch_size, scheduler=scheduler, transcode_cache=transcode_cache,
+				transcode_workers=transcode_workers):
 			filenum += 1
 
 			uploaded, matched, not_uploaded, error = result
@@ -313,7 +626,7 @@ class MusicManagerWrapper(_BaseWrapper):
 					)
 				)
 
-				results.append({'result': 'uploaded', 'filepath': filepath, 'id': uploaded[filepath]})
+				file_result = {'result': 'uploaded', 'filepath': filepath, 'id': uploaded[filepath]}
 			elif matched:
 				logger.info(
 					"({num:>{pad}}/{total}) Successfully scanned and matched -- {file} ({song_id})".format(
@@ -321,11 +634,11 @@ class MusicManagerWrapper(_BaseWrapper):
 					)
 				)
 
-				results.append({'result': 'matched', 'filepath': filepath, 'id': matched[filepath]})
+				file_result = {'result': 'matched', 'filepath': filepath, 'id': matched[filepath]}
 			elif error:
 				logger.warning("({num:>{pad}}/{total}) Error on upload -- {file}".format(num=filenum, pad=pad, total=total, file=filepath))
 
-				results.append({'result': 'error', 'filepath': filepath, 'message': error[filepath]})
+				file_result = {'result': 'error', 'filepath': filepath, 'message': error[filepath]}
 				errors.update(error)
 			else:
 				if any(exist_string in not_uploaded[filepath] for exist_string in exist_strings):
@@ -339,7 +652,7 @@ class MusicManagerWrapper(_BaseWrapper):
 						)
 					)
 
-					results.append({'result': 'not_uploaded', 'filepath': filepath, 'id': song_id, 'message': not_uploaded[filepath]})
+					file_result = {'result': 'not_uploaded', 'filepath': filepath, 'id': song_id, 'message': not_uploaded[filepath]}
 				else:
 					response = not_uploaded[filepath]
 
@@ -349,16 +662,35 @@ class MusicManagerWrapper(_BaseWrapper):
 						)
 					)
 
-					results.append({'result': 'not_uploaded', 'filepath': filepath, 'message': not_uploaded[filepath]})
+					file_result = {'result': 'not_uploaded', 'filepath': filepath, 'message': not_uploaded[filepath]}
+
+			if journal is not None:
+				journal.record('upload', filepath, file_result)
 
 			success = (uploaded or matched) or (not_uploaded and 'ALREADY_EXISTS' in not_uploaded[filepath])
 
+			if fingerprint_index is not None and file_result.get('id'):
+				try:
+					fingerprint_index.add(filepath, song_id=file_result['id'])
+				except OSError:
+					logger.warning("Failed to fingerprint {}".format(filepath))
+
+			if ledger is not None and file_result.get('id'):
+				ledger.record(filepath, file_result['id'])
+
+			if (uploaded or matched) and self.library_cache is not None and not library_changed:
+				# Song lists of other clients for the same Google account may be in the cache, too.
+				self.library_cache.invalidate()
+				library_changed = True
+
 			if success and delete_on_success:
 				try:
 					os.remove(filepath)
 				except (OSError, PermissionError):
 					logger.warning("Failed to remove {} after successful upload".format(filepath))
 
+			yield file_result
+
 		if errors:
 			logger.info("\n\nThe following errors occurred:\n")
 
@@ -366,4 +698,85 @@ class MusicManagerWrapper(_BaseWrapper):
 				logger.info("{file} | {error}".format(file=filepath, error=e))
 			logger.info("\nThese filepaths may need to be synced again.\n")
 
-		return results
+	@cast_to_list(0)
+	def upload(
+		self, filepaths, enable_matching=False, transcode_quality='320k', delete_on_success=False, fingerprint_index=None,
+		journal=None, scheduler=None, max_workers=None, ordered=True, batch_size=None, ledger=None, transcode_cache=None,
+		transcode_workers=None):
+		"""Upload local songs to Google Music.
+
+		Parameters:
+			filepaths (list or str): Filepath(s) to upload.
+
+			enable_matching (bool): If ``True`` attempt to use `scan and match
+				<http://support.google.com/googleplay/bin/answer.py?hl=en&answer=2920799&topic=2450455>`__.
+				This requieres ffmpeg or avconv.
+
+			transcode_quality (str or int): If int, pass to ffmpeg/avconv ``-q:a`` for libmp3lame `VBR quality
+				<http://trac.ffmpeg.org/wiki/Encode/MP3#VBREncoding>'__.
+				If string, pass to ffmpeg/avconv ``-b:a`` for libmp3lame `CBR quality
+				<http://trac.ffmpeg.org/wiki/Encode/MP3#CBREncoding>'__.
+				Default: ``320k``
+
+			delete_on_success (bool): Delete successfully uploaded local files. Default: ``False``
+
+			fingerprint_index (FingerprintIndex): An index to record the audio fingerprint and song id of
+				uploaded, matched, and already existing local files in.
+
+			journal (TransferJournal): A journal to record results in.
+				Filepaths with a finished result in the journal aren't uploaded again;
+				their journaled results come first.
+
+			scheduler (TransferScheduler): A scheduler to retry failed uploads and adapt the number of
+				concurrent uploads. Uses up to ``scheduler.max_workers`` threads unless max_workers is given.
+
+			max_workers (int): Number of files to upload concurrently.
+				Local files are only deleted and recorded after their upload finishes.
+				Default: Upload one file at a time.
+
+			ordered (bool): If ``True``, results are in the same order as ``filepaths``.
+				Otherwise, results are in the order uploads finish. Default: ``True``
+
+			batch_size (int): Number of files to pass to each gmusicapi upload call.
+				Batching saves a round of metadata negotiation per file.
+				If a call fails, all files in its batch are reported as errors.
+				With max_workers, each worker uploads one batch at a time.
+				Default: Upload files one per call.
+
+			ledger (UploadLedger): A ledger of previously uploaded files.
+				Unchanged files in the ledger are skipped without transcoding or contacting Google Music.
+				Skipped files aren't deleted by delete_on_success.
+				The song ids of uploaded, matched, and already existing files are recorded in it.
+
+			transcode_cache (TranscodeCache): A cache to transcode non-MP3 files into before uploading them.
+				Files are transcoded in parallel ahead of the uploads, and retries and later uploads reuse
+				the cached MP3 files instead of transcoding again. Requires ffmpeg or avconv.
+				Only full-file transcodes are cached: with enable_matching, gmusicapi still transcodes
+				the scan and match sample of each file, MP3 or not, inside the upload call.
+				Default: gmusicapi transcodes non-MP3 files during each upload.
+
+			transcode_workers (int): Number of files to transcode concurrently with a transcode_cache.
+				Default: The number of CPUs.
+
+		Returns:
+			A list of result dictionaries.
+			::
+
+				[
+					{'result': 'uploaded', 'filepath': <filepath>, 'id': <song_id>},  # uploaded
+					{'result': 'matched', 'filepath': <filepath>, 'id': <song_id>},  # matched
+					{'result': 'error', 'filepath': <filepath>, 'message': <error_message>},  # error
+					{'result': 'not_uploaded', 'filepath': <filepath>, 'id': <song_id>, 'message': <reason_message>},  # not_uploaded ALREADY_EXISTS
+					{'result': 'not_uploaded', 'filepath': <filepath>, 'message': <reason_message>},  # not_uploaded
+					{'result': 'skipped', 'filepath': <filepath>, 'id': <song_id>}  # skipped file in ledger
+				]
+		"""
+
+		return list(
+			self.iter_upload(
+				filepaths, enable_matching=enable_matching, transcode_quality=transcode_quality,
+				delete_on_success=delete_on_success, fingerprint_index=fingerprint_index, journal=journal, scheduler=scheduler,
+				max_workers=max_workers, ordered=ordered, batch_size=batch_size, ledger=ledger,
+				transcode_cache=transcode_cache, transcode_workers=transcode_workers
+			)
+		)
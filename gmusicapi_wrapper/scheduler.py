@@ -0,0 +1,180 @@
+# coding=utf-8
+
+"""Retry and adaptive concurrency scheduling for transfers.
+
+	>>> from gmusicapi_wrapper.scheduler import TransferScheduler
+"""
+
+import logging
+import random
+import threading
+import time
+
+from gmusicapi import CallFailure
+
+logger = logging.getLogger(__name__)
+
+
+class TransferScheduler:
+	"""Run transfer calls with retries and an adaptive concurrency limit.
+
+	Failed calls are retried after an exponential backoff with full jitter.
+	The number of concurrent calls follows additive increase, multiplicative decrease (AIMD):
+	each success raises the limit by ``1 / limit``, i.e. about one more call per round of calls,
+	and a failure halves it. Only one decrease happens per round, as failures of calls
+	started before the last decrease don't reflect the current limit.
+
+	Pass it to :meth:`~gmusicapi_wrapper.musicmanager.MusicManagerWrapper.upload` or
+	:meth:`~gmusicapi_wrapper.musicmanager.MusicManagerWrapper.download`.
+	A scheduler can be shared between transfers; its counters accumulate.
+
+	Parameters:
+		max_workers (int): The maximum number of concurrent calls. Default: ``8``
+
+		min_workers (int): The minimum concurrency limit. Default: ``1``
+
+		initial_workers (int): The starting concurrency limit. Default: ``min_workers``
+
+		retry_policies (dict): ``{exception_class: max_retries}`` pairs.
+			The policy of the closest base class of a raised exception is used.
+			Exceptions without a policy are raised immediately.
+			Default: ``{CallFailure: 3}``
+
+		base_delay (float): The backoff of the first retry in seconds. Doubles with each retry. Default: ``1.0``
+
+		max_delay (float): The maximum backoff in seconds. Default: ``60.0``
+
+		sleep (callable): The function used to wait between retries. Default: :func:`time.sleep`
+	"""
+
+	def __init__(
+		self, max_workers=8, min_workers=1, initial_workers=None, retry_policies=None, base_delay=1.0, max_delay=60.0,
+		sleep=time.sleep):
+		self.max_workers = max_workers
+		self.min_workers = min_workers
+		self.retry_policies = retry_policies if retry_policies is not None else {CallFailure: 3}
+		self.base_delay = base_delay
+		self.max_delay = max_delay
+		self.sleep = sleep
+
+		self.limit = float(initial_workers or min_workers)
+
+		self.calls = 0
+		self.successes = 0
+		self.failures = 0
+		self.retries = 0
+		self.decreases = 0
+		self.active = 0
+		self.max_active = 0
+
+		self._round = 0
+		self._condition = threading.Condition()
+
+	def _max_retries(self, exception):
+		for cls in type(exception).__mro__:
+			if cls in self.retry_policies:
+				return self.retry_policies[cls]
+
+		return 0
+
+	def backoff(self, attempt):
+		"""Get a jittered backoff delay.
+
+		Parameters:
+			attempt (int): The number of the retry, starting from 0.
+
+		Returns:
+			A delay in seconds between 0 and ``min(max_delay, base_delay * 2 ** attempt)``.
+		"""
+
+		return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+	def _acquire(self):
+		with self._condition:
+			while self.active >= max(self.min_workers, int(self.limit)):
+				self._condition.wait()
+
+			self.active += 1
+			self.calls += 1
+			self.max_active = max(self.max_active, self.active)
+
+			return self._round
+
+	def _release(self, call_round, success):
+		with self._condition:
+			self.active -= 1
+
+			if success:
+				self.limit = min(self.max_workers, self.limit + 1 / self.limit)
+			elif call_round == self._round:
+				self.limit = max(self.min_workers, self.limit / 2)
+				self._round += 1
+				self.decreases += 1
+
+			self._condition.notify_all()
+
+	def call(self, function, *args, **kwargs):
+		"""Call a function, retrying it according to the retry policies.
+
+		Parameters:
+			function (callable): The transfer function.
+
+			*args, **kwargs: Arguments for the function.
+
+		Returns:
+			The result of the function.
+
+		Raises:
+			The last exception raised by the function if it isn't retried.
+		"""
+
+		attempt = 0
+
+		while True:
+			call_round = self._acquire()
+
+			try:
+				result = function(*args, **kwargs)
+			except Exception as e:
+				self._release(call_round, False)
+
+				if attempt >= self._max_retries(e):
+					with self._condition:
+						self.failures += 1
+
+					raise
+
+				delay = self.backoff(attempt)
+				attempt += 1
+
+				with self._condition:
+					self.retries += 1
+
+				logger.debug("Retrying in {0:.1f}s after error ({1}/{2}): {3}".format(
+					delay, attempt, self._max_retries(e), e)
+				)
+
+				self.sleep(delay)
+			else:
+				self._release(call_round, True)
+
+				with self._condition:
+					self.successes += 1
+
+				return result
+
+	def stats(self):
+		"""Get scheduler counters.
+
+		Returns:
+			A dict with ``calls``, ``successes``, ``failures``, ``retries``, ``decreases``,
+			``active``, ``max_active``, and ``limit`` keys.
+			``limit`` is the current effective concurrency.
+		"""
+
+		with self._condition:
+			return {
+				'calls': self.calls, 'successes': self.successes, 'failures': self.failures, 'retries': self.retries,
+				'decreases': self.decreases, 'active': self.active, 'max_active': self.max_active,
+				'limit': int(self.limit)
+			}
@@ -0,0 +1,302 @@
+# coding=utf-8
+
+"""Incremental local file scanning using directory modification times.
+
+	>>> from gmusicapi_wrapper.snapshot import ScanSnapshot, rescan
+"""
+
+import json
+import logging
+import os
+import time
+
+try:
+	from os import scandir
+except ImportError:  # Python 3.4
+	from scandir import scandir
+
+from .constants import CYGPATH_RE, SUPPORTED_SONG_FORMATS
+from .decorators import cast_to_list
+from .utils import convert_cygwin_path
+
+logger = logging.getLogger(__name__)
+
+# Directories modified this close to the scan are relisted on the next rescan,
+# as a later change in the same timestamp granularity wouldn't change their mtime.
+_RACY_MTIME_NS = 2 * 10 ** 9
+
+SNAPSHOT_VERSION = 1
+
+
+class ScanSnapshot:
+	"""A record of the directories and supported files found by a local file scan.
+
+	Use :meth:`scan` to create a snapshot and :func:`rescan` to bring it up to date.
+
+	Parameters:
+		paths (list or str): Filepath(s) to search for music files.
+
+		supported_extensions (tuple): Supported file extensions.
+			Default: :const:`~gmusicapi_wrapper.constants.SUPPORTED_SONG_FORMATS`
+
+		max_depth (int): The depth in the directory tree to walk.
+			A depth of '0' limits the walk to the top directory.
+			Default: No limit.
+
+	Attributes:
+		dirs (dict): ``{dirpath: {'mtime_ns': int, 'files': {filename: [size, mtime_ns]}, 'dirs': [dirname]}}``
+
+		files (dict): ``{filepath: [size, mtime_ns]}`` for file paths given directly in ``paths``.
+	"""
+
+	@cast_to_list(0)
+	def __init__(self, paths, supported_extensions=SUPPORTED_SONG_FORMATS, max_depth=float('inf')):
+		self.paths = []
+
+		for path in paths:
+			if os.name == 'nt' and CYGPATH_RE.match(path):
+				path = convert_cygwin_path(path)
+
+			self.paths.append(path)
+
+		self.supported_extensions = tuple(supported_extensions)
+		self.max_depth = max_depth
+
+		self.dirs = {}
+		self.files = {}
+
+	@classmethod
+	def scan(cls, paths, supported_extensions=SUPPORTED_SONG_FORMATS, max_depth=float('inf')):
+		"""Create a snapshot by scanning local filepaths.
+
+		Parameters:
+			paths (list or str): Filepath(s) to search for music files.
+
+			supported_extensions (tuple): Supported file extensions.
+
+			max_depth (int): The depth in the directory tree to walk.
+
+		Returns:
+			A :class:`ScanSnapshot`.
+		"""
+
+		snapshot = cls(paths, supported_extensions=supported_extensions, max_depth=max_depth)
+		rescan(snapshot)
+
+		return snapshot
+
+	def get_filepaths(self):
+		"""Get all supported filepaths recorded in the snapshot.
+
+		Returns:
+			A list of filepaths.
+		"""
+
+		filepaths = list(self.files)
+
+		for dirpath, entry in self.dirs.items():
+			filepaths.extend(os.path.join(dirpath, filename) for filename in entry['files'])
+
+		return filepaths
+
+	def save(self, filepath):
+		"""Save the snapshot to a JSON file.
+
+		Parameters:
+			filepath (str): The filepath to save the snapshot to.
+		"""
+
+		data = {
+			'version': SNAPSHOT_VERSION, 'paths': self.paths, 'supported_extensions': self.supported_extensions,
+			'max_depth': self.max_depth, 'dirs': self.dirs, 'files': self.files
+		}
+
+		temp_filepath = filepath + '.tmp'
+
+		with open(temp_filepath, 'w') as f:
+			json.dump(data, f)
+
+		os.replace(temp_filepath, filepath)
+
+	@classmethod
+	def load(cls, filepath):
+		"""Load a snapshot from a JSON file.
+
+		Parameters:
+			filepath (str): The filepath of a saved snapshot.
+
+		Returns:
+			A :class:`ScanSnapshot`.
+		"""
+
+		with open(filepath) as f:
+			data = json.load(f)
+
+		if data.get('version') != SNAPSHOT_VERSION:
+			raise ValueError("Unsupported snapshot version in {}.".format(filepath))
+
+		snapshot = cls(data['paths'], supported_extensions=data['supported_extensions'], max_depth=data['max_depth'])
+		snapshot.dirs = data['dirs']
+		snapshot.files = data['files']
+
+		return snapshot
+
+
+def _stat_file(path):
+	stat = os.stat(path)
+
+	return [stat.st_size, stat.st_mtime_ns]
+
+
+def rescan(snapshot, check_files=True):
+	"""Update a snapshot with changes to local files since it was taken.
+
+	Only directories whose modification time changed are listed again.
+	Unchanged directories are trusted to contain the same entries.
+
+	Parameters:
+		snapshot (ScanSnapshot): The snapshot to update in place.
+
+		check_files (bool): If ``True``, stat files in unchanged directories to find modified files.
+			A directory's modification time only changes when entries are added, removed, or renamed,
+			so in-place file changes are missed if ``False``.
+			Default: ``True``
+
+	Returns:
+		A list of added filepaths, a list of removed filepaths, and a list of modified filepaths.
+		::
+
+			(added, removed, modified)
+	"""
+
+	added = []
+	removed = []
+	modified = []
+
+	scan_time_ns = int(time.time() * 10 ** 9)
+	seen_dirs = set()
+
+	def remove_dir(dirpath):
+		entry = snapshot.dirs.pop(dirpath, None)
+
+		if entry is not None:
+			removed.extend(os.path.join(dirpath, filename) for filename in entry['files'])
+
+			for dirname in entry['dirs']:
+				remove_dir(os.path.join(dirpath, dirname))
+
+	def update_dir(dirpath, depth):
+		seen_dirs.add(dirpath)
+
+		try:
+			mtime_ns = os.stat(dirpath).st_mtime_ns
+		except OSError:
+			remove_dir(dirpath)
+			return
+
+		entry = snapshot.dirs.get(dirpath)
+
+		if entry is not None and entry['mtime_ns'] == mtime_ns:
+			if check_files:
+				for filename, stat in list(entry['files'].items()):
+					filepath = os.path.join(dirpath, filename)
+
+					try:
+						new_stat = _stat_file(filepath)
+					except OSError:
+						del entry['files'][filename]
+						removed.append(filepath)
+					else:
+						if new_stat != stat:
+							entry['files'][filename] = new_stat
+							modified.append(filepath)
+
+			for dirname in entry['dirs']:
+				update_dir(os.path.join(dirpath, dirname), depth + 1)
+
+			return
+
+		old_files = entry['files'] if entry is not None else {}
+		old_dirs = set(entry['dirs']) if entry is not None else set()
+
+		files = {}
+		dirs = []
+
+		try:
+			entries = list(scandir(dirpath))
+		except OSError:
+			remove_dir(dirpath)
+			return
+
+		for dir_entry in entries:
+			try:
+				is_dir = dir_entry.is_dir()
+			except OSError:
+				is_dir = False
+
+			if is_dir:
+				if depth < snapshot.max_depth and not dir_entry.is_symlink():
+					dirs.append(dir_entry.name)
+			elif dir_entry.name.lower().endswith(snapshot.supported_extensions):
+				try:
+					stat = dir_entry.stat()
+				except OSError:
+					continue
+
+				files[dir_entry.name] = [stat.st_size, stat.st_mtime_ns]
+
+		for filename, stat in files.items():
+			filepath = os.path.join(dirpath, filename)
+
+			if filename not in old_files:
+				added.append(filepath)
+			elif old_files[filename] != stat:
+				modified.append(filepath)
+
+		removed.extend(os.path.join(dirpath, filename) for filename in old_files if filename not in files)
+
+		for dirname in old_dirs.difference(dirs):
+			remove_dir(os.path.join(dirpath, dirname))
+
+		# Force a relist next time if the directory could still change within the same mtime.
+		if scan_time_ns - mtime_ns < _RACY_MTIME_NS:
+			mtime_ns = None
+
+		snapshot.dirs[dirpath] = {'mtime_ns': mtime_ns, 'files': files, 'dirs': dirs}
+
+		for dirname in dirs:
+			update_dir(os.path.join(dirpath, dirname), depth + 1)
+
+	for path in snapshot.paths:
+		if os.path.isdir(path):
+			update_dir(path, 0)
+		elif path.lower().endswith(snapshot.supported_extensions):
+			stat = None
+
+			try:
+				if os.path.isfile(path):
+					stat = _stat_file(path)
+			except OSError:
+				pass
+
+			if stat is None:
+				if snapshot.files.pop(path, None) is not None:
+					removed.append(path)
+			elif path not in snapshot.files:
+				added.append(path)
+			elif snapshot.files[path] != stat:
+				modified.append(path)
+
+			if stat is not None:
+				snapshot.files[path] = stat
+
+	# Drop directory trees whose root is no longer a directory.
+	for dirpath in list(snapshot.dirs):
+		if dirpath not in seen_dirs:
+			remove_dir(dirpath)
+
+	logger.info(
+		"Rescanned local files: {0} added, {1} removed, {2} modified".format(len(added), len(removed), len(modified))
+	)
+
+	return added, removed, modified
@@ -0,0 +1,517 @@
+# coding=utf-8
+
+"""Columnar storage and filtering for Google Music song dicts.
+
+	>>> from gmusicapi_wrapper.songtable import SongTable
+"""
+
+import itertools
+import logging
+import operator
+import sys
+from array import array
+
+from .utils import CompiledFilter
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+# Number of songs added to the columns at a time by SongTable.from_songs.
+SONGS_PER_CHUNK = 1000
+
+
+def _is_int_value(value):
+	"""Check if a value can be stored in an integer column.
+
+	Mobileclient returns some integer fields, e.g. durationMillis, as decimal strings.
+	"""
+
+	if isinstance(value, str):
+		try:
+			number = int(value)
+		except ValueError:
+			return False
+
+		# Only canonical decimal strings can be restored from the integer.
+		return str(number) == value and -2 ** 63 <= number < 2 ** 63
+
+	return type(value) is int and -2 ** 63 <= value < 2 ** 63
+
+
+def _match_value(regex, value):
+	if isinstance(value, list):
+		return any(regex.search(str(item)) for item in value)
+
+	return regex.search(str(value)) is not None
+
+
+class _ObjectColumn:
+	"""A dictionary-encoded column: each distinct value is stored once and rows hold codes."""
+
+	def __init__(self, length=0):
+		# Code 0 is reserved for missing values.
+		self.values = [_MISSING]
+		self.index = None
+		self.codes = array('I', [0]) * length
+
+	def _build_index(self):
+		self.index = {_MISSING: 0}
+
+		for code, value in enumerate(self.values[1:], 1):
+			try:
+				self.index.setdefault(self._key(value), code)
+			except TypeError:
+				pass
+
+	@staticmethod
+	def _key(value):
+		# Key non-strings on type as well so e.g. ``False`` and ``0`` aren't merged.
+		return value if value.__class__ is str else (value.__class__, value)
+
+	def append(self, value):
+		if value is _MISSING:
+			self.codes.append(0)
+			return
+
+		if isinstance(value, str):
+			value = sys.intern(value)
+
+		if self.index is None:
+			self._build_index()
+
+		key = self._key(value)
+
+		try:
+			code = self.index.get(key)
+		except TypeError:  # Unhashable values, e.g. lists, are stored per row.
+			code = None
+			key = None
+
+		if code is None:
+			code = len(self.values)
+			self.values.append(value)
+
+			if key is not None:
+				self.index[key] = code
+
+		self.codes.append(code)
+
+	def extend(self, values):
+		if self.index is None:
+			self._build_index()
+
+		index = self.index
+
+		# Strings are their own keys; _MISSING is already indexed with code 0.
+		if set(map(type, values)) <= {str, object}:
+			keys = values
+		else:
+			keys = [value if value is _MISSING else self._key(value) for value in values]
+
+		try:
+			new_keys = [key for key in dict.fromkeys(keys) if key not in index]
+		except TypeError:  # Unhashable values, e.g. lists, are stored per row.
+			for value in values:
+				self.append(value)
+
+			return
+
+		if keys is values:
+			new_values = list(map(sys.intern, new_keys))
+		else:
+			new_values = [sys.intern(key) if key.__class__ is str else key[1] for key in new_keys]
+
+		index.update(zip(new_keys, range(len(self.values), len(self.values) + len(new_keys))))
+		self.values.extend(new_values)
+		self.codes.extend(map(index.__getitem__, keys))
+
+	def get(self, row):
+		return self.values[self.codes[row]]
+
+	def match(self, regex):
+		matches = bytes([0] + [_match_value(regex, value) for value in self.values[1:]])
+
+		return bytes(map(matches.__getitem__, self.codes))
+
+	def select(self, mask):
+		column = _ObjectColumn()
+		column.values = self.values
+		column.codes = array('I', itertools.compress(self.codes, mask))
+
+		return column
+
+
+class _IntColumn:
+	"""A typed integer column with a presence mask."""
+
+	def __init__(self, length=0, as_str=False):
+		self.values = array('q', [0]) * length
+		self.present = bytearray(length)
+		self.as_str = as_str
+
+	def accepts(self, values):
+		values = [value for value in values if value is not _MISSING]
+
+		if not values:
+			return True
+
+		if set(map(type, values)) != {str if self.as_str else int}:
+			return False
+
+		if self.as_str:
+			try:
+				numbers = list(map(int, values))
+			except ValueError:
+				return False
+
+			# Only canonical decimal strings can be restored from the integer.
+			if list(map(str, numbers)) != values:
+				return False
+		else:
+			numbers = values
+
+		return -2 ** 63 <= min(numbers) and max(numbers) < 2 ** 63
+
+	def extend(self, values):
+		self.present.extend([value is not _MISSING for value in values])
+		self.values.extend([0 if value is _MISSING else int(value) for value in values])
+
+	def get(self, row):
+		if not self.present[row]:
+			return _MISSING
+
+		return str(self.values[row]) if self.as_str else self.values[row]
+
+	def match(self, regex):
+		matches = {value: regex.search(str(value)) is not None for value in set(self.values)}
+		mask = bytes(map(matches.__getitem__, self.values))
+
+		return _mask_and(mask, self.present)
+
+	def select(self, mask):
+		column = _IntColumn(as_str=self.as_str)
+		column.values = array('q', itertools.compress(self.values, mask))
+		column.present = bytearray(itertools.compress(self.present, mask))
+
+		return column
+
+	def to_object_column(self):
+		column = _ObjectColumn()
+		column.extend([self.get(row) for row in range(len(self.values))])
+
+		return column
+
+
+def _mask_or(a, b):
+	return (int.from_bytes(a, 'little') | int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+
+def _mask_and(a, b):
+	return (int.from_bytes(a, 'little') & int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+
+def _mask_not(a):
+	return (int.from_bytes(a, 'little') ^ int.from_bytes(b'\x01' * len(a), 'little')).to_bytes(len(a), 'little')
+
+
+class SongTable:
+	"""A column-oriented table of Google Music song dicts.
+
+	Each field is stored as one column.
+	Fields whose values are all integers or decimal integer strings, e.g. year, track_number, and durationMillis,
+	are stored in typed arrays. Other fields are dictionary-encoded with interned strings.
+	Filters are evaluated once per distinct column value and combined as row masks,
+	and :meth:`filter` returns :class:`SongTableView` instances over the masks without copying any columns.
+
+	Song dicts are only materialized when iterating or indexing the table.
+
+	Building a table costs several times more than one filter pass over a list of song dicts;
+	it pays off in memory, and in time only when the same table is filtered repeatedly.
+
+		>>> table = SongTable.from_songs(mobileclient.get_all_songs())
+		>>> matched, filtered = table.filter(include_filters=[('artist', 'Muse')])
+		>>> for song in matched: ...
+	"""
+
+	def __init__(self):
+		self._columns = {}
+		self._length = 0
+
+	@classmethod
+	def from_songs(cls, songs):
+		"""Create a table from song dicts.
+
+		Parameters:
+			songs (iterable): Google Music song dicts.
+
+		Returns:
+			A :class:`SongTable`.
+		"""
+
+		table = cls()
+		songs = iter(songs)
+
+		for chunk in iter(lambda: list(itertools.islice(songs, SONGS_PER_CHUNK)), []):
+			table.extend(chunk)
+
+		table.compact()
+
+		return table
+
+	def compact(self):
+		"""Free the lookup indexes used while appending songs.
+
+		Indexes are rebuilt if more songs are appended.
+		"""
+
+		for column in self._columns.values():
+			if isinstance(column, _ObjectColumn):
+				column.index = None
+
+	def append(self, song):
+		"""Add a song dict as a new row.
+
+		Parameters:
+			song (dict): A Google Music song dict.
+		"""
+
+		self.extend([song])
+
+	def extend(self, songs):
+		"""Add song dicts as new rows.
+
+		Each column is extended once for all the songs.
+
+		Parameters:
+			songs (list): Google Music song dicts.
+		"""
+
+		columns = self._columns
+
+		for field in dict.fromkeys(itertools.chain.from_iterable(songs)):
+			if field not in columns:
+				value = next(song[field] for song in songs if field in song)
+
+				if _is_int_value(value):
+					columns[field] = _IntColumn(self._length, as_str=isinstance(value, str))
+				else:
+					columns[field] = _ObjectColumn(self._length)
+
+		for field, column in columns.items():
+			values = list(map(operator.methodcaller('get', field, _MISSING), songs))
+
+			if isinstance(column, _IntColumn) and not column.accepts(values):
+				column = columns[field] = column.to_object_column()
+
+			column.extend(values)
+
+		self._length += len(songs)
+
+	def __len__(self):
+		return self._length
+
+	def __getitem__(self, row):
+		if row < 0:
+			row += self._length
+
+		if not 0 <= row < self._length:
+			raise IndexError("SongTable index out of range")
+
+		song = {}
+
+		for field, column in self._columns.items():
+			value = column.get(row)
+
+			if value is not _MISSING:
+				song[field] = value
+
+		return song
+
+	def __iter__(self):
+		for row in range(self._length):
+			yield self[row]
+
+	@property
+	def fields(self):
+		"""list: The fields present in at least one song."""
+
+		return list(self._columns)
+
+	def column(self, field):
+		"""Get the values of a field for every row.
+
+		Parameters:
+			field (str): A Google Music metadata field.
+
+		Returns:
+			A list of values with ``None`` for rows missing the field.
+		"""
+
+		if field not in self._columns:
+			return [None] * self._length
+
+		column = self._columns[field]
+
+		return [None if value is _MISSING else value for value in map(column.get, range(self._length))]
+
+	def _rule_mask(self, field, regex):
+		if field not in self._columns:
+			return bytes(self._length)
+
+		return self._columns[field].match(regex)
+
+	def mask(
+		self, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False, compiled_filter=None):
+		"""Evaluate metadata filters over whole columns.
+
+		Parameters:
+			include_filters (list): A list of ``(field, pattern)`` tuples.
+				Songs are filtered out if the given metadata field values don't match any of the given patterns.
+
+			exclude_filters (list): A list of ``(field, pattern)`` tuples.
+				Songs are filtered out if the given metadata field values match any of the given patterns.
+
+			all_includes (bool): If ``True``, all include_filters criteria must match to include a song.
+
+			all_excludes (bool): If ``True``, all exclude_filters criteria must match to exclude a song.
+
+			compiled_filter (CompiledFilter): A prebuilt filter used instead of the other filter parameters.
+
+		Returns:
+			bytes: A row mask with ``1`` for songs matching criteria and ``0`` for songs filtered out.
+		"""
+
+		if compiled_filter is None:
+			compiled_filter = CompiledFilter(
+				include_filters=include_filters, exclude_filters=exclude_filters,
+				all_includes=all_includes, all_excludes=all_excludes
+			)
+
+		mask = b'\x01' * self._length
+
+		if compiled_filter.include_rules:
+			combine = _mask_and if compiled_filter.all_includes else _mask_or
+			include_masks = [self._rule_mask(field, regex) for field, regex in compiled_filter.include_rules]
+			include_mask = include_masks[0]
+
+			for rule_mask in include_masks[1:]:
+				include_mask = combine(include_mask, rule_mask)
+
+			mask = _mask_and(mask, include_mask)
+
+		if compiled_filter.exclude_rules:
+			combine = _mask_and if compiled_filter.all_excludes else _mask_or
+			exclude_masks = [self._rule_mask(field, regex) for field, regex in compiled_filter.exclude_rules]
+			exclude_mask = exclude_masks[0]
+
+			for rule_mask in exclude_masks[1:]:
+				exclude_mask = combine(exclude_mask, rule_mask)
+
+			mask = _mask_and(mask, _mask_not(exclude_mask))
+
+		return mask
+
+	def select(self, mask):
+		"""Create a table from the rows selected by a row mask.
+
+		Parameters:
+			mask (bytes): A row mask as returned by :meth:`mask`.
+
+		Returns:
+			A :class:`SongTable`.
+		"""
+
+		table = SongTable()
+		table._columns = {field: column.select(mask) for field, column in self._columns.items()}
+		table._length = sum(1 for selected in mask if selected)
+
+		return table
+
+	def filter(
+		self, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False, compiled_filter=None):
+		"""Split the table using metadata filters.
+
+		Parameters:
+			include_filters (list): A list of ``(field, pattern)`` tuples.
+
+			exclude_filters (list): A list of ``(field, pattern)`` tuples.
+
+			all_includes (bool): If ``True``, all include_filters criteria must match to include a song.
+
+			all_excludes (bool): If ``True``, all exclude_filters criteria must match to exclude a song.
+
+			compiled_filter (CompiledFilter): A prebuilt filter used instead of the other filter parameters.
+
+		Returns:
+			A :class:`SongTableView` of songs matching criteria and
+			a :class:`SongTableView` of songs filtered out using filter criteria.
+			No columns are copied; use :meth:`select` to copy the rows of a mask into a new table.
+			::
+
+				(matched, filtered)
+		"""
+
+		mask = self.mask(
+			include_filters=include_filters, exclude_filters=exclude_filters,
+			all_includes=all_includes, all_excludes=all_excludes, compiled_filter=compiled_filter
+		)
+
+		return SongTableView(self, mask), SongTableView(self, _mask_not(mask))
+
+
+class SongTableView:
+	"""The rows of a :class:`SongTable` selected by a row mask.
+
+	Song dicts are materialized from the underlying table when iterating or indexing the view.
+
+	Parameters:
+		table (SongTable): The table to select rows from.
+
+		mask (bytes): A row mask as returned by :meth:`SongTable.mask`.
+
+	Attributes:
+		table (SongTable): The table rows are selected from.
+
+		mask (bytes): The row mask.
+	"""
+
+	def __init__(self, table, mask):
+		self.table = table
+		self.mask = mask
+		self._length = mask.count(1)
+		self._rows = None
+
+	@property
+	def rows(self):
+		"""array: The table row numbers selected by the mask."""
+
+		if self._rows is None:
+			self._rows = array('I', itertools.compress(range(len(self.table)), self.mask))
+
+		return self._rows
+
+	def __len__(self):
+		return self._length
+
+	def __getitem__(self, row):
+		try:
+			return self.table[self.rows[row]]
+		except IndexError:
+			raise IndexError("SongTableView index out of range")
+
+	def __iter__(self):
+		for row in itertools.compress(range(len(self.table)), self.mask):
+			yield self.table[row]
+
+	def column(self, field):
+		"""Get the values of a field for every selected row.
+
+		Parameters:
+			field (str): A Google Music metadata field.
+
+		Returns:
+			A list of values with ``None`` for rows missing the field.
+		"""
+
+		return list(itertools.compress(self.table.column(field), self.mask))
@@ -0,0 +1,630 @@
+# coding=utf-8
+
+"""Lightweight tag reading and audio fingerprinting for local music files.
+
+	>>> from gmusicapi_wrapper.tags import audio_fingerprint, read_tag_fields
+"""
+
+import hashlib
+import logging
+import os
+import struct
+
+import mutagen
+
+logger = logging.getLogger(__name__)
+
+# Mutagen easy field names to ID3v2.3/v2.4 text frame ids.
+ID3_TEXT_FRAMES = {
+	'album': 'TALB', 'albumartist': 'TPE2', 'artist': 'TPE1', 'bpm': 'TBPM', 'composer': 'TCOM',
+	'copyright': 'TCOP', 'discnumber': 'TPOS', 'encodedby': 'TENC', 'grouping': 'TIT1', 'lyricist': 'TEXT',
+	'title': 'TIT2', 'tracknumber': 'TRCK', 'version': 'TIT3'
+}
+
+# Mutagen easy field names to MP4 text atom names.
+MP4_TEXT_ATOMS = {
+	'album': b'\xa9alb', 'albumartist': b'aART', 'artist': b'\xa9ART', 'date': b'\xa9day', 'title': b'\xa9nam'
+}
+
+# Mutagen easy field names to MP4 integer pair atom names.
+MP4_PAIR_ATOMS = {'discnumber': b'disk', 'tracknumber': b'trkn'}
+
+# MPEG audio bitrates in kbps by (MPEG-1, layer II/III) for bitrate indexes 1-14.
+MPEG_BITRATES = {
+	(True, 2): [32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+	(True, 3): [32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+	(False, 2): [8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+}
+MPEG_BITRATES[(False, 3)] = MPEG_BITRATES[(False, 2)]
+
+# MPEG audio sample rates by version bits (MPEG-2.5, reserved, MPEG-2, MPEG-1).
+MPEG_SAMPLE_RATES = {0: [11025, 12000, 8000], 2: [22050, 24000, 16000], 3: [44100, 48000, 32000]}
+
+# Upper bound on bytes read from a single tag block before falling back to mutagen.
+MAX_TAG_SIZE = 16 * 1024 * 1024
+
+
+class _Unsupported(Exception):
+	"""Raised when a file needs a full mutagen parse."""
+
+
+def read_tag_fields(filepath, fields):
+	"""Read a projection of metadata fields from a music file.
+
+	Only the tag region of ID3v2 (MP3), FLAC, Ogg Vorbis/Opus, and MP4 files is read using bounded reads.
+	Anything else, including unusual tag layouts, falls back to a full mutagen parse.
+
+	Parameters:
+		filepath (str): A local music filepath.
+
+		fields (list or set): Mutagen easy field names to read.
+
+	Returns:
+		A dict of mutagen field list values for the requested fields present in the file,
+		or ``None`` if the file isn't a known music file.
+
+	Raises:
+		mutagen.MutagenError: If the file can't be loaded as a music file.
+	"""
+
+	fields = set(fields)
+
+	try:
+		with open(filepath, 'rb') as f:
+			tags = _read_tags(f, filepath, fields)
+	except (_Unsupported, struct.error, UnicodeDecodeError):
+		tags = None
+	except OSError as e:
+		raise mutagen.MutagenError(e)
+
+	if tags is None:
+		return _read_mutagen_fields(filepath, fields)
+
+	return {field: tags[field] for field in fields if tags.get(field)}
+
+
+def _read_mutagen_fields(filepath, fields):
+	metadata = mutagen.File(filepath, easy=True)
+
+	if metadata is None:
+		return None
+
+	return {field: list(metadata[field]) for field in fields if field in metadata and metadata[field]}
+
+
+def _read_tags(f, filepath, fields):
+	header = f.read(12)
+
+	if header.startswith(b'ID3') and filepath.lower().endswith('.mp3'):
+		if not fields.issubset(ID3_TEXT_FRAMES):
+			raise _Unsupported
+
+		return _read_id3(f, header)
+	elif header.startswith(b'fLaC'):
+		return _read_flac(f)
+	elif header.startswith(b'OggS'):
+		return _read_ogg(f)
+	elif header[4:8] == b'ftyp':
+		if not fields.issubset(set(MP4_TEXT_ATOMS) | set(MP4_PAIR_ATOMS)):
+			raise _Unsupported
+
+		return _read_mp4(f)
+
+	raise _Unsupported
+
+
+def _read_exactly(f, size):
+	if size > MAX_TAG_SIZE:
+		raise _Unsupported
+
+	data = f.read(size)
+
+	if len(data) != size:
+		raise _Unsupported
+
+	return data
+
+
+def _syncsafe_int(data):
+	if any(byte & 0x80 for byte in data):
+		raise _Unsupported
+
+	return (data[0] << 21) | (data[1] << 14) | (data[2] << 7) | data[3]
+
+
+def _decode_id3_text(data):
+	encoding = data[0]
+	data = data[1:]
+
+	if encoding in (0, 3):
+		values = data.split(b'\x00')
+		codec = 'latin-1' if encoding == 0 else 'utf-8'
+	elif encoding in (1, 2):
+		# UTF-16 terminators are aligned null pairs.
+		values = []
+		start = 0
+
+		for pos in range(0, len(data) - 1, 2):
+			if data[pos:pos + 2] == b'\x00\x00':
+				values.append(data[start:pos])
+				start = pos + 2
+
+		values.append(data[start:])
+		codec = 'utf-16' if encoding == 1 else 'utf-16-be'
+	else:
+		raise _Unsupported
+
+	if values and values[-1] == b'':
+		values.pop()
+
+	return [value.decode(codec) for value in values]
+
+
+def _read_id3(f, header):
+	version, flags = header[3], header[5]
+
+	# Unsynchronisation and extended headers are left to mutagen.
+	if version not in (3, 4) or flags & 0xc0:
+		raise _Unsupported
+
+	size = _syncsafe_int(header[6:10])
+	f.seek(10)
+	data = _read_exactly(f, size)
+
+	# Mutagen only loads the file if it can sync to MPEG audio; require two valid frames right after the tag.
+	offset = f.tell()
+
+	for __ in range(2):
+		f.seek(offset)
+		offset += _mpeg_frame_length(f.read(4))
+
+	wanted = set(ID3_TEXT_FRAMES.values())
+	frames = {}
+	pos = 0
+
+	while pos + 10 <= len(data):
+		frame_id = data[pos:pos + 4]
+
+		if frame_id == b'\x00\x00\x00\x00':
+			break
+
+		if not frame_id.isalnum():
+			raise _Unsupported
+
+		if version == 4:
+			frame_size = _syncsafe_int(data[pos + 4:pos + 8])
+		else:
+			frame_size = struct.unpack('>I', data[pos + 4:pos + 8])[0]
+
+		frame_flags = struct.unpack('>H', data[pos + 8:pos + 10])[0]
+		frame_data = data[pos + 10:pos + 10 + frame_size]
+		pos += 10 + frame_size
+
+		if pos > len(data):
+			raise _Unsupported
+
+		frame_id = frame_id.decode('ascii')
+
+		if frame_id in wanted and frame_data:
+			# Grouped, compressed, encrypted, or unsynchronised frames.
+			if frame_flags & (0x004f if version == 4 else 0x00e0):
+				raise _Unsupported
+
+			# Mutagen merges repeated text frames.
+			frames.setdefault(frame_id, []).extend(_decode_id3_text(frame_data))
+
+	return {field: frames[frame_id] for field, frame_id in ID3_TEXT_FRAMES.items() if frame_id in frames}
+
+
+def _mpeg_frame_length(header):
+	"""Get the length of an MPEG audio frame from its header, rejecting anything mutagen wouldn't sync to."""
+
+	if len(header) < 4 or header[0] != 0xff or header[1] & 0xe0 != 0xe0:
+		raise _Unsupported
+
+	version = (header[1] >> 3) & 0x03
+	layer = 4 - ((header[1] >> 1) & 0x03)
+	bitrate = header[2] >> 4
+	sample_rate = (header[2] >> 2) & 0x03
+	padding = (header[2] >> 1) & 0x01
+
+	# Layer I frame lengths are left to mutagen, which sizes them differently.
+	if version == 1 or layer in (1, 4) or bitrate in (0, 15) or sample_rate == 3:
+		raise _Unsupported
+
+	bitrate = MPEG_BITRATES[(version == 3, layer)][bitrate - 1] * 1000
+	sample_rate = MPEG_SAMPLE_RATES[version][sample_rate]
+
+	if version != 3 and layer == 3:
+		return 72 * bitrate // sample_rate + padding
+
+	return 144 * bitrate // sample_rate + padding
+
+
+def _parse_vorbis_comment(data):
+	vendor_length = struct.unpack('<I', data[:4])[0]
+	pos = 4 + vendor_length
+	count = struct.unpack('<I', data[pos:pos + 4])[0]
+	pos += 4
+
+	tags = {}
+
+	for __ in range(count):
+		length = struct.unpack('<I', data[pos:pos + 4])[0]
+		comment = data[pos + 4:pos + 4 + length]
+		pos += 4 + length
+
+		if len(comment) != length:
+			raise _Unsupported
+
+		if b'=' not in comment:
+			continue
+
+		key, value = comment.split(b'=', 1)
+		tags.setdefault(key.decode('ascii').lower(), []).append(value.decode('utf-8', 'replace'))
+
+	return tags
+
+
+def _read_flac(f):
+	f.seek(4)
+	first = True
+
+	while True:
+		header = _read_exactly(f, 4)
+		block_type = header[0] & 0x7f
+		size = struct.unpack('>I', b'\x00' + header[1:])[0]
+
+		# STREAMINFO must come first for mutagen to accept the file.
+		if first and block_type != 0:
+			raise _Unsupported
+
+		first = False
+
+		if block_type == 4:
+			return _parse_vorbis_comment(_read_exactly(f, size))
+		elif block_type == 127:
+			raise _Unsupported
+
+		if header[0] & 0x80:
+			return {}
+
+		f.seek(size, os.SEEK_CUR)
+
+
+def _iter_ogg_packets(f):
+	"""Yield complete packets from the first logical Ogg bitstream."""
+
+	f.seek(0)
+	serial = None
+	packet = b''
+	read = 0
+
+	while True:
+		header = f.read(27)
+
+		if len(header) < 27 or not header.startswith(b'OggS'):
+			raise _Unsupported
+
+		page_serial = header[14:18]
+
+		if serial is None:
+			serial = page_serial
+		elif page_serial != serial:
+			raise _Unsupported
+
+		lacing = _read_exactly(f, header[26])
+		body = _read_exactly(f, sum(lacing))
+		read += 27 + len(lacing) + len(body)
+
+		if read > MAX_TAG_SIZE:
+			raise _Unsupported
+
+		pos = 0
+
+		for length in lacing:
+			packet += body[pos:pos + length]
+			pos += length
+
+			if length < 255:
+				yield packet
+				packet = b''
+
+
+def _read_ogg(f):
+	packets = _iter_ogg_packets(f)
+	first = next(packets)
+	second = next(packets)
+
+	if first.startswith(b'\x01vorbis') and second.startswith(b'\x03vorbis'):
+		return _parse_vorbis_comment(second[7:])
+	elif first.startswith(b'OpusHead') and second.startswith(b'OpusTags'):
+		return _parse_vorbis_comment(second[8:])
+
+	raise _Unsupported
+
+
+def _iter_mp4_atoms(f, start, end):
+	"""Yield ``(name, data_offset, data_size)`` for atoms between start and end offsets."""
+
+	pos = start
+
+	while pos + 8 <= end:
+		f.seek(pos)
+		size, name = struct.unpack('>I4s', _read_exactly(f, 8))
+		offset = pos + 8
+
+		if size == 1:
+			size = struct.unpack('>Q', _read_exactly(f, 8))[0]
+			offset += 8
+		elif size == 0:
+			size = end - pos
+
+		if size < offset - pos or pos + size > end:
+			raise _Unsupported
+
+		yield name, offset, pos + size - offset
+		pos += size
+
+
+def _find_mp4_atom(f, start, end, name):
+	for atom_name, offset, size in _iter_mp4_atoms(f, start, end):
+		if atom_name == name:
+			return offset, size
+
+	return None
+
+
+def _read_mp4(f):
+	end = f.seek(0, os.SEEK_END)
+
+	moov = _find_mp4_atom(f, 0, end, b'moov')
+
+	if moov is None:
+		raise _Unsupported
+
+	moov_start, moov_end = moov[0], moov[0] + moov[1]
+	children = {name: (offset, size) for name, offset, size in _iter_mp4_atoms(f, moov_start, moov_end)}
+
+	# Mutagen needs an audio track to load the file.
+	if b'trak' not in children:
+		raise _Unsupported
+
+	if b'udta' not in children:
+		return {}
+
+	udta_start = children[b'udta'][0]
+	meta = _find_mp4_atom(f, udta_start, udta_start + children[b'udta'][1], b'meta')
+
+	if meta is None:
+		return {}
+
+	# The meta atom has a 4 byte version/flags header before its children.
+	ilst = _find_mp4_atom(f, meta[0] + 4, meta[0] + meta[1], b'ilst')
+
+	if ilst is None:
+		return {}
+
+	f.seek(ilst[0])
+	data = _read_exactly(f, ilst[1])
+
+	items = {}
+	pos = 0
+
+	while pos + 8 <= len(data):
+		size, name = struct.unpack('>I4s', data[pos:pos + 8])
+
+		if size < 8 or pos + size > len(data):
+			raise _Unsupported
+
+		item = data[pos + 8:pos + size]
+		pos += size
+		values = []
+		item_pos = 0
+
+		while item_pos + 16 <= len(item):
+			data_size, data_name, flags = struct.unpack('>I4sI', item[item_pos:item_pos + 12])
+
+			if data_size < 16 or item_pos + data_size > len(item):
+				raise _Unsupported
+
+			if data_name == b'data':
+				values.append((flags & 0xffffff, item[item_pos + 16:item_pos + data_size]))
+
+			item_pos += data_size
+
+		items[name] = values
+
+	tags = {}
+
+	for field, name in MP4_TEXT_ATOMS.items():
+		if name in items:
+			if any(flags != 1 for flags, __ in items[name]):
+				raise _Unsupported
+
+			tags[field] = [value.decode('utf-8', 'replace') for __, value in items[name]]
+
+	for field, name in MP4_PAIR_ATOMS.items():
+		if name in items:
+			tags[field] = []
+
+			for __, value in items[name]:
+				if len(value) < 6:
+					raise _Unsupported
+
+				number, total = struct.unpack('>2H', value[2:6])
+				tags[field].append('{}/{}'.format(number, total) if total else str(number))
+
+	return tags
+
+
+# Size of the reads used when hashing audio data.
+FINGERPRINT_CHUNK_SIZE = 64 * 1024
+
+
+def audio_fingerprint(filepath):
+	"""Hash the audio data of a music file, ignoring its tags.
+
+	Tag edits don't change the fingerprint, so it identifies the same audio across differently tagged copies.
+	The file is read in chunks; only the tag headers needed to locate the audio are parsed.
+
+	* MP3 and other files: everything but leading ID3v2 tags and trailing APEv2 and ID3v1 tags.
+	* FLAC: the audio frames after the metadata blocks.
+	* MP4: the contents of the mdat atoms.
+	* Ogg Vorbis/Opus: the bodies of the pages after the header packets.
+
+	Parameters:
+		filepath (str): A local music filepath.
+
+	Returns:
+		A hex SHA-1 digest string.
+
+	Raises:
+		OSError: If the file can't be read.
+	"""
+
+	digest = hashlib.sha1()
+
+	with open(filepath, 'rb') as f:
+		end = f.seek(0, os.SEEK_END)
+		start = _skip_id3v2(f)
+		f.seek(start)
+		header = f.read(12)
+
+		try:
+			if header.startswith(b'fLaC'):
+				ranges = [(_flac_audio_offset(f, start), _strip_trailing_tags(f, start, end))]
+			elif header.startswith(b'OggS') and start == 0:
+				ranges = None
+				_hash_ogg_audio(f, digest)
+			elif header[4:8] == b'ftyp' and start == 0:
+				ranges = [(offset, offset + size) for name, offset, size in _iter_mp4_atoms(f, 0, end) if name == b'mdat']
+
+				if not ranges:
+					raise _Unsupported
+			else:
+				raise _Unsupported
+		except (_Unsupported, struct.error):
+			digest = hashlib.sha1()
+			ranges = [(start, _strip_trailing_tags(f, start, end))]
+
+		for range_start, range_end in ranges or []:
+			_hash_range(f, digest, range_start, range_end)
+
+	return digest.hexdigest()
+
+
+def _hash_range(f, digest, start, end):
+	f.seek(start)
+	remaining = end - start
+
+	while remaining > 0:
+		chunk = f.read(min(FINGERPRINT_CHUNK_SIZE, remaining))
+
+		if not chunk:
+			break
+
+		digest.update(chunk)
+		remaining -= len(chunk)
+
+
+def _skip_id3v2(f):
+	"""Get the offset after any ID3v2 tags at the start of a file."""
+
+	offset = 0
+
+	while True:
+		f.seek(offset)
+		header = f.read(10)
+
+		if len(header) < 10 or not header.startswith(b'ID3'):
+			return offset
+
+		try:
+			size = _syncsafe_int(header[6:10])
+		except _Unsupported:
+			return offset
+
+		# A footer follows the tag if flagged.
+		offset += 10 + size + (10 if header[5] & 0x10 else 0)
+
+
+def _strip_trailing_tags(f, start, end):
+	"""Get the end offset of the audio before any trailing ID3v1 and APEv2 tags."""
+
+	while True:
+		if end - start >= 128:
+			f.seek(end - 128)
+
+			if f.read(3) == b'TAG':
+				end -= 128
+
+				# Enhanced ID3v1 tags precede the ID3v1 tag.
+				if end - start >= 227:
+					f.seek(end - 227)
+
+					if f.read(4) == b'TAG+':
+						end -= 227
+
+				continue
+
+		if end - start >= 32:
+			f.seek(end - 32)
+			footer = f.read(32)
+
+			if footer.startswith(b'APETAGEX'):
+				size, __, flags = struct.unpack('<III', footer[12:24])
+				# The size includes the footer but not the optional header.
+				size += 32 if flags & 0x80000000 else 0
+
+				if 32 <= size <= end - start:
+					end -= size
+					continue
+
+		return end
+
+
+def _flac_audio_offset(f, start):
+	f.seek(start + 4)
+
+	while True:
+		header = _read_exactly(f, 4)
+		size = struct.unpack('>I', b'\x00' + header[1:])[0]
+		f.seek(size, os.SEEK_CUR)
+
+		if header[0] & 0x80:
+			return f.tell()
+
+
+def _hash_ogg_audio(f, digest):
+	f.seek(0)
+	header_packets = None
+	packets = 0
+
+	while True:
+		header = f.read(27)
+
+		if not header:
+			return
+
+		if len(header) < 27 or not header.startswith(b'OggS'):
+			raise _Unsupported
+
+		lacing = _read_exactly(f, header[26])
+		body_size = sum(lacing)
+
+		if header_packets is not None and packets >= header_packets:
+			_hash_range(f, digest, f.tell(), f.tell() + body_size)
+			continue
+
+		body = _read_exactly(f, body_size)
+
+		if header_packets is None:
+			if body.startswith(b'\x01vorbis'):
+				header_packets = 3
+			elif body.startswith(b'OpusHead'):
+				header_packets = 2
+			else:
+				raise _Unsupported
+
+		packets += sum(1 for length in lacing if length < 255)
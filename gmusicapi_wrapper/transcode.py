@@ -0,0 +1,210 @@
+# coding=utf-8
+
+"""On-disk cache of local files transcoded to MP3 for upload.
+
+	>>> from gmusicapi_wrapper.transcode import TranscodeCache
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+
+import mutagen
+from gmusicapi.utils.utils import transcode_to_mp3
+from mutagen.easyid3 import EasyID3
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_sha1(filepath):
+	sha1 = hashlib.sha1()
+
+	with open(filepath, 'rb') as f:
+		for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+			sha1.update(chunk)
+
+	return sha1.hexdigest()
+
+
+def _copy_tags(src, dst):
+	"""Copy the tags of a local file to an MP3 file as ID3 tags, as the transcoded audio has none."""
+
+	try:
+		metadata = mutagen.File(src, easy=True)
+	except mutagen.MutagenError:
+		metadata = None
+
+	tags = EasyID3()
+
+	if metadata is not None and metadata.tags is not None:
+		for field, value in metadata.tags.items():
+			if field in EasyID3.valid_keys:
+				try:
+					tags[field] = value
+				except (ValueError, mutagen.MutagenError):
+					logger.debug("Failed to copy {} tag of {}".format(field, src))
+
+	tags.save(dst)
+
+
+class TranscodeCache:
+	"""A directory of local files transcoded to MP3, keyed by the source file contents and the transcode quality.
+
+	Google Music only accepts MP3 uploads, so gmusicapi transcodes other formats with ffmpeg or avconv during the upload,
+	every time a file is uploaded. Files transcoded through the cache are transcoded once and reused by retries
+	and later uploads until they're evicted. Tags of the source file are copied to the cached file.
+	Scan and match samples requested by Google Music are still transcoded by gmusicapi during the upload.
+
+	Cached files are evicted least recently used first when the cache grows past ``max_size``.
+
+	Pass it to :meth:`~gmusicapi_wrapper.musicmanager.MusicManagerWrapper.upload` to transcode files
+	in parallel ahead of the uploads.
+
+	Parameters:
+		directory (str): The directory to store transcoded files in. Created if it doesn't exist.
+
+		max_size (int): The maximum total size of cached files in bytes. Default: 10 GiB
+	"""
+
+	def __init__(self, directory, max_size=10 * 1024 ** 3):
+		self.directory = directory
+		self.max_size = max_size
+
+		os.makedirs(directory, exist_ok=True)
+
+	def __len__(self):
+		return len(self._entries())
+
+	def _entries(self):
+		entries = []
+
+		for filename in os.listdir(self.directory):
+			if not filename.endswith('.mp3') or filename.startswith('.'):
+				continue
+
+			filepath = os.path.join(self.directory, filename)
+
+			try:
+				stat = os.stat(filepath)
+			except OSError:
+				continue
+
+			entries.append((stat.st_mtime_ns, stat.st_size, filepath))
+
+		return entries
+
+	def _cache_filepath(self, filepath, quality):
+		return os.path.join(self.directory, '{0}-{1}.mp3'.format(_file_sha1(filepath), quality))
+
+	def size(self):
+		"""Get the total size of cached files in bytes."""
+
+		return sum(size for _, size, _ in self._entries())
+
+	def get(self, filepath, quality='320k'):
+		"""Get the cached transcode of a local file.
+
+		Parameters:
+			filepath (str): A local filepath.
+
+			quality (str or int): The transcode quality.
+
+		Returns:
+			The filepath of the cached MP3 file or ``None`` if it isn't cached.
+		"""
+
+		cache_filepath = self._cache_filepath(filepath, quality)
+
+		try:
+			# The modification time marks the last use for eviction.
+			os.utime(cache_filepath)
+		except OSError:
+			return None
+
+		return cache_filepath
+
+	def transcode(self, filepath, quality='320k'):
+		"""Transcode a local file to MP3 unless it's already cached.
+
+		Safe to call from several threads at once.
+
+		Parameters:
+			filepath (str): A local filepath.
+
+			quality (str or int): If int, pass to ffmpeg/avconv ``-q:a`` for libmp3lame VBR quality.
+				If string, pass to ffmpeg/avconv ``-b:a`` for libmp3lame CBR quality.
+				Default: ``320k``
+
+		Returns:
+			The filepath of the cached MP3 file.
+
+		Raises:
+			IOError: If transcoding failed.
+
+			ValueError: If no transcoder with MP3 support is installed.
+		"""
+
+		cache_filepath = self._cache_filepath(filepath, quality)
+
+		try:
+			os.utime(cache_filepath)
+		except OSError:
+			pass
+		else:
+			logger.debug("Using cached transcode of {}".format(filepath))
+			return cache_filepath
+
+		logger.debug("Transcoding -- {}".format(filepath))
+
+		contents = transcode_to_mp3(filepath, quality=quality)
+
+		with tempfile.NamedTemporaryFile(dir=self.directory, prefix='.', suffix='.part', delete=False) as f:
+			f.write(contents)
+
+		try:
+			_copy_tags(filepath, f.name)
+			os.replace(f.name, cache_filepath)
+		except BaseException:
+			os.remove(f.name)
+			raise
+
+		self.evict(keep=[cache_filepath])
+
+		return cache_filepath
+
+	def evict(self, keep=()):
+		"""Remove least recently used files until the cache fits in ``max_size``.
+
+		Parameters:
+			keep (list): Cached filepaths not to remove.
+
+		Returns:
+			The number of removed files.
+		"""
+
+		entries = sorted(self._entries())
+		total = sum(size for _, size, _ in entries)
+		removed = 0
+
+		for _, size, filepath in entries:
+			if total <= self.max_size:
+				break
+
+			if filepath in keep:
+				continue
+
+			try:
+				os.remove(filepath)
+			except OSError:
+				continue
+
+			total -= size
+			removed += 1
+
+		if removed:
+			logger.debug("Evicted {} files from the transcode cache".format(removed))
+
+		return removed
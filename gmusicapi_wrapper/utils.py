@@ -6,15 +6,26 @@
 	>>> from gmusicapi_wrapper.utils import ...
 """
 
+import collections
+import difflib
+import functools
+import itertools
 import logging
 import os
 import re
 import subprocess
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 
 import mutagen
 
+try:
+	from os import scandir
+except ImportError:  # Python 3.4
+	from scandir import scandir
+
 from .constants import CHARACTER_REPLACEMENTS, CYGPATH_RE, TEMPLATE_PATTERNS
 from .decorators import cast_to_list
+from .tags import read_tag_fields
 
 logger = logging.getLogger(__name__)
 
@@ -31,15 +42,39 @@ def convert_cygwin_path(path):
 	return win_path
 
 
-def _get_mutagen_metadata(filepath):
-	"""Get mutagen metadata dict from a file."""
+def _get_mutagen_metadata(filepath, metadata_cache=None, fields=None):
+	"""Get mutagen metadata dict from a file.
+
+	If a :class:`~gmusicapi_wrapper.cache.MetadataCache` is given, unchanged files are loaded from it without being opened.
+	Otherwise, if ``fields`` is given, only those fields are read using :func:`~gmusicapi_wrapper.tags.read_tag_fields`.
+	"""
+
+	if metadata_cache is not None:
+		found, error, metadata = metadata_cache.get(filepath)
+
+		if found:
+			if error:
+				logger.warning("Can't load {} as music file.".format(filepath))
+				raise mutagen.MutagenError("Cached load failure for {}".format(filepath))
+
+			return metadata
 
 	try:
-		metadata = mutagen.File(filepath, easy=True)
+		if fields is not None and metadata_cache is None:
+			metadata = read_tag_fields(filepath, fields)
+		else:
+			metadata = mutagen.File(filepath, easy=True)
 	except mutagen.MutagenError:
 		logger.warning("Can't load {} as music file.".format(filepath))
+
+		if metadata_cache is not None:
+			metadata_cache.set(filepath, None, error=True)
+
 		raise
 
+	if metadata_cache is not None:
+		metadata_cache.set(filepath, metadata)
+
 	return metadata
 
 
@@ -54,7 +89,7 @@ def _split_field_to_single_value(field):
 
 	split_field = re.match(r'(\d+)/\d+', field)
 
-	return split_field.group(1) or field
+	return split_field.group(1) if split_field else field
 
 
 def _filter_comparison_fields(song):
@@ -64,53 +99,236 @@ def _filter_comparison_fields(song):
 	return [field for field in ['artist', 'album', 'title', 'tracknumber', 'track_number'] if field in song and song[field]]
 
 
+# Mutagen fields read from local files for comparison.
+_COMPARISON_FIELDS = ('artist', 'album', 'title', 'tracknumber')
+
+
+_TRACK_TOTAL_RE = re.compile(r'\/\s*\d+')  # "/<totaltracks>" in track number.
+_TRACK_PREFIX_RE = re.compile(r'^(?:\d+\.+|0+(?=[0-9]))')  # Leading zero(s) or dots from track number.
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+
+
 def _normalize_metadata(metadata):
 	"""Normalize metadata to improve match accuracy."""
 
-	metadata = str(metadata)
-	metadata = metadata.lower()
+	return _normalize_text(str(metadata))
 
-	metadata = re.sub(r'\/\s*\d+', '', metadata)  # Remove "/<totaltracks>" from track number.
-	metadata = re.sub(r'^0+([0-9]+)', r'\1', metadata)  # Remove leading zero(s) from track number.
-	metadata = re.sub(r'^\d+\.+', '', metadata)  # Remove dots from track number.
-	metadata = re.sub(r'[^\w\s]', '', metadata)  # Remove any non-words.
-	metadata = re.sub(r'\s+', ' ', metadata)  # Reduce multiple spaces to a single space.
-	metadata = re.sub(r'^\s+', '', metadata)  # Remove leading space.
-	metadata = re.sub(r'\s+$', '', metadata)  # Remove trailing space.
-	metadata = re.sub(r'^the\s+', '', metadata, re.I)  # Remove leading "the".
 
-	return metadata
+@functools.lru_cache(maxsize=65536)
+def _normalize_text(text):
+	"""Normalize a metadata string; memoized as the same artist and album values repeat across a library."""
+
+	text = text.lower()
+
+	text = _TRACK_TOTAL_RE.sub('', text)
+	text = _TRACK_PREFIX_RE.sub('', text, count=1)
+	text = _NON_WORD_RE.sub('', text)  # Remove any non-words.
+	text = ' '.join(text.split())  # Reduce whitespace to single spaces and strip the ends.
 
+	if text.startswith('the '):  # Remove leading "the".
+		text = text[4:]
 
-def _normalize_song(song):
+	return text
+
+
+def _normalize_song(song, metadata_cache=None):
 	"""Convert filepath to song dict while leaving song dicts untouched."""
 
-	return song if isinstance(song, dict) else _mutagen_fields_to_single_value(_get_mutagen_metadata(song))
+	if isinstance(song, dict):
+		return song
+
+	return _mutagen_fields_to_single_value(_get_mutagen_metadata(song, metadata_cache=metadata_cache, fields=_COMPARISON_FIELDS))
+
+
+def _song_comparison_key(song, metadata_cache=None):
+	"""Get the normalized metadata tuple used to compare a song dict or filepath."""
+
+	song = _normalize_song(song, metadata_cache=metadata_cache)
+
+	return tuple(_normalize_metadata(song[field]) for field in _filter_comparison_fields(song))
+
+
+class _FuzzyKeyIndex:
+	"""Find approximate matches for comparison keys using blocking.
+
+	Keys are bucketed by each pair of their text fields, e.g. (artist, album), (artist, title), and (album, title).
+	A key differing from its match in only one field still shares a bucket with it,
+	so similarity is only computed against a few candidates instead of every key.
+	"""
+
+	def __init__(self, keys, threshold):
+		self.threshold = threshold
+		self.blocks = collections.defaultdict(list)
+
+		for key in keys:
+			text = ' '.join(key)
+
+			for block in self._block_keys(key):
+				self.blocks[block].append(text)
+
+	@staticmethod
+	def _block_keys(key):
+		# Track numbers are skipped as they would create huge buckets.
+		values = [value for value in key if value and not value.isdigit()][:3]
+
+		if len(values) < 2:
+			return [tuple(values)]
+
+		return list(itertools.combinations(values, 2))
 
+	def match(self, key):
+		text = ' '.join(key)
+		matcher = difflib.SequenceMatcher(autojunk=False)
+		matcher.set_seq2(text)
+		seen = set()
 
-def compare_song_collections(src_songs, dst_songs):
+		for block in self._block_keys(key):
+			for candidate in self.blocks.get(block, ()):
+				if candidate in seen:
+					continue
+
+				seen.add(candidate)
+				matcher.set_seq1(candidate)
+
+				if (
+					matcher.real_quick_ratio() >= self.threshold
+					and matcher.quick_ratio() >= self.threshold
+					and matcher.ratio() >= self.threshold
+				):
+					return True
+
+		return False
+
+
+def compare_song_collections(
+	src_songs, dst_songs, metadata_cache=None, fuzzy=False, threshold=0.9, fingerprint_index=None):
 	"""Compare two song collections to find missing songs.
 
 	Parameters:
 		src_songs (list): Google Music song dicts or filepaths of local songs.
 
-		dest_songs (list): Google Music song dicts or filepaths of local songs.
+		dest_songs (list or SongKeyIndex): Google Music song dicts or filepaths of local songs.
+			A prebuilt :class:`~gmusicapi_wrapper.index.SongKeyIndex` avoids reloading the destination songs.
+
+		metadata_cache (MetadataCache): A cache used to avoid reloading metadata of unchanged local files.
+
+		fuzzy (bool): If ``True``, songs without an exact match are also matched by metadata similarity.
+			Only destination songs with two of artist, album, and title in common are compared.
+			Requires a non-compact :class:`~gmusicapi_wrapper.index.SongKeyIndex` if one is given.
+			Default: ``False``
+
+		threshold (float): The similarity ratio, between 0 and 1, at which songs match in fuzzy mode.
+			Default: ``0.9``
+
+		fingerprint_index (FingerprintIndex): Audio fingerprints of Google Music songs.
+			Local source songs whose audio is recorded with the id of a destination Google Music song
+			are matched regardless of metadata.
 
 	Returns:
 		A list of Google Music song dicts or local song filepaths from source missing in destination.
 	"""
 
-	def gather_field_values(song):
-		return tuple((_normalize_metadata(song[field]) for field in _filter_comparison_fields(song)))
+	from .index import SongKeyIndex  # Imported here as the index module depends on this one.
+
+	if not isinstance(dst_songs, SongKeyIndex):
+		dst_songs = SongKeyIndex(dst_songs, metadata_cache=metadata_cache)
+
+	fuzzy_index = _FuzzyKeyIndex(dst_songs.keys(), threshold) if fuzzy else None
+	missing_songs = []
+
+	for src_song in src_songs:
+		if fingerprint_index is not None and not isinstance(src_song, dict):
+			song_id = fingerprint_index.get_song_id(src_song)
+
+			if song_id is not None and dst_songs.contains_id(song_id):
+				continue
+
+		key = _song_comparison_key(src_song, metadata_cache=metadata_cache)
+
+		if dst_songs.contains_key(key):
+			continue
+
+		if fuzzy_index is not None and fuzzy_index.match(key):
+			logger.debug("Fuzzy matched song -- {}".format(src_song))
+			continue
+
+		missing_songs.append(src_song)
+
+	return missing_songs
+
+
+SyncPlan = collections.namedtuple('SyncPlan', ['src_only', 'dst_only', 'matched', 'src_duplicates', 'dst_duplicates'])
+SyncPlan.__doc__ = """The result of :func:`plan_sync`."""
+
+
+def plan_sync(src_songs, dst_songs, metadata_cache=None):
+	"""Compare two song collections in both directions in a single pass.
+
+	Each song is loaded and normalized once, unlike calling :func:`compare_song_collections` both ways.
+
+	Parameters:
+		src_songs (list): Google Music song dicts or filepaths of local songs.
+
+		dst_songs (list): Google Music song dicts or filepaths of local songs.
+
+		metadata_cache (MetadataCache): A cache used to avoid reloading metadata of unchanged local files.
+
+	Returns:
+		A :class:`SyncPlan` namedtuple of lists.
+		::
+
+			(src_only, dst_only, matched, src_duplicates, dst_duplicates)
+
+		``src_only`` and ``dst_only`` are the songs missing from the other collection,
+		the same as :func:`compare_song_collections` in each direction.
+		``matched`` is a list of ``(src_song, dst_song)`` tuples pairing each remaining source song
+		with the first destination song with the same metadata.
+		``src_duplicates`` and ``dst_duplicates`` are the songs with the same metadata as an earlier song
+		in the same collection.
+	"""
+
+	dst_keyed = []
+	dst_by_key = {}
+	dst_duplicates = []
+
+	for dst_song in dst_songs:
+		key = _song_comparison_key(dst_song, metadata_cache=metadata_cache)
+		dst_keyed.append((key, dst_song))
+
+		if key in dst_by_key:
+			dst_duplicates.append(dst_song)
+		else:
+			dst_by_key[key] = dst_song
+
+	src_only = []
+	matched = []
+	src_duplicates = []
+	src_keys = set()
+
+	for src_song in src_songs:
+		key = _song_comparison_key(src_song, metadata_cache=metadata_cache)
+
+		if key in src_keys:
+			src_duplicates.append(src_song)
+		else:
+			src_keys.add(key)
+
+		if key in dst_by_key:
+			matched.append((src_song, dst_by_key[key]))
+		else:
+			src_only.append(src_song)
 
-	dst_songs_criteria = {gather_field_values(_normalize_song(dst_song)) for dst_song in dst_songs}
+	dst_only = [dst_song for key, dst_song in dst_keyed if key not in src_keys]
 
-	return [src_song for src_song in src_songs if gather_field_values(_normalize_song(src_song)) not in dst_songs_criteria]
+	return SyncPlan(src_only, dst_only, matched, src_duplicates, dst_duplicates)
 
 
 @cast_to_list(0)
-def get_supported_filepaths(filepaths, supported_extensions, max_depth=float('inf')):
-	"""Get filepaths with supported extensions from given filepaths.
+def iter_supported_filepaths(filepaths, supported_extensions, max_depth=float('inf')):
+	"""Lazily get filepaths with supported extensions from given filepaths.
+
+	Directories are walked top-down in the same order as :func:`walk_depth`,
+	but filepaths are yielded as soon as they are found.
 
 	Parameters:
 		filepaths (list or str): Filepath(s) to check.
@@ -121,25 +339,76 @@ def get_supported_filepaths(filepaths, supported_extensions, max_depth=float('in
 			A depth of '0' limits the walk to the top directory.
 			Default: No limit.
 
-	Returns:
-		A list of supported filepaths.
+	Yields:
+		Supported filepaths.
 	"""
 
-	supported_filepaths = []
-
 	for path in filepaths:
 		if os.name == 'nt' and CYGPATH_RE.match(path):
 			path = convert_cygwin_path(path)
 
 		if os.path.isdir(path):
-			for root, __, files in walk_depth(path, max_depth):
-				for f in files:
-					if f.lower().endswith(supported_extensions):
-						supported_filepaths.append(os.path.join(root, f))
+			for filepath in _scan_supported_filepaths(path, supported_extensions, max_depth):
+				yield filepath
 		elif os.path.isfile(path) and path.lower().endswith(supported_extensions):
-			supported_filepaths.append(path)
+			yield path
+
+
+def _scan_supported_filepaths(path, supported_extensions, max_depth):
+	"""Walk a directory tree with os.scandir yielding supported filepaths."""
 
-	return supported_filepaths
+	# Stack of (directory, depth) pairs still to be scanned.
+	dirs = [(path, 0)]
+
+	while dirs:
+		root, depth = dirs.pop()
+		subdirs = []
+
+		try:
+			entries = scandir(root)
+		except OSError:
+			continue
+
+		try:
+			for entry in entries:
+				try:
+					is_dir = entry.is_dir()
+				except OSError:
+					is_dir = False
+
+				if is_dir:
+					# Match os.walk: symlinked directories are not followed.
+					if depth < max_depth and not entry.is_symlink():
+						subdirs.append((entry.path, depth + 1))
+				elif entry.name.lower().endswith(supported_extensions):
+					yield entry.path
+		finally:
+			# Iterator only has close() on Python 3.6+.
+			if hasattr(entries, 'close'):
+				entries.close()
+
+		# Push in reverse so directories are walked in listing order.
+		dirs.extend(reversed(subdirs))
+
+
+@cast_to_list(0)
+def get_supported_filepaths(filepaths, supported_extensions, max_depth=float('inf')):
+	"""Get filepaths with supported extensions from given filepaths.
+
+	Parameters:
+		filepaths (list or str): Filepath(s) to check.
+
+		supported_extensions (tuple or str): Supported file extensions or a single file extension.
+
+		max_depth (int): The depth in the directory tree to walk.
+			A depth of '0' limits the walk to the top directory.
+			Default: No limit.
+
+	Returns:
+		A list of supported filepaths.
+	"""
+
+	return list(iter_supported_filepaths(filepaths, supported_extensions, max_depth=max_depth))
 
 
 @cast_to_list(0)
@@ -172,40 +441,122 @@ def exclude_filepaths(filepaths, exclude_patterns=None):
 	return included_songs, excluded_songs
 
 
-def _check_field_value(field_value, pattern):
-	"""Check a song metadata field value for a pattern."""
+# Inline global flags can't be used inside an alternation.
+_GLOBAL_FLAGS_RE = re.compile(r'\(\?[aiLmsux]+\)')
 
-	if isinstance(field_value, list):
-		return any(re.search(pattern, str(value), re.I) for value in field_value)
-	else:
-		return re.search(pattern, str(field_value), re.I)
 
+class CompiledFilter:
+	"""A song metadata filter compiled once from a set of metadata filters.
 
-def _check_filters(song, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False):
-	"""Check a song metadata dict against a set of metadata filters."""
+	Calling the filter with a song metadata dict gives the same result as the filter criteria
+	used by :func:`filter_google_songs` and :func:`filter_local_songs`,
+	but patterns are compiled up front and the patterns of a field are combined into a single regex where possible.
 
-	include = True
+	Parameters:
+		include_filters (list): A list of ``(field, pattern)`` tuples.
+			Songs are filtered out if the given metadata field values don't match any of the given patterns.
 
-	if include_filters:
-		if all_includes:
-			if not all(field in song and _check_field_value(song[field], pattern) for field, pattern in include_filters):
-				include = False
-		else:
-			if not any(field in song and _check_field_value(song[field], pattern) for field, pattern in include_filters):
-				include = False
+		exclude_filters (list): A list of ``(field, pattern)`` tuples.
+			Songs are filtered out if the given metadata field values match any of the given patterns.
 
-	if exclude_filters:
-		if all_excludes:
-			if all(field in song and _check_field_value(song[field], pattern) for field, pattern in exclude_filters):
-				include = False
-		else:
-			if any(field in song and _check_field_value(song[field], pattern) for field, pattern in exclude_filters):
-				include = False
+		all_includes (bool): If ``True``, all include_filters criteria must match to include a song.
+
+		all_excludes (bool): If ``True``, all exclude_filters criteria must match to exclude a song.
+
+	Attributes:
+		fields (set): The metadata fields checked by the filter.
+	"""
+
+	def __init__(self, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False):
+		self.all_includes = all_includes
+		self.all_excludes = all_excludes
+
+		self.include_rules = self._compile(include_filters, all_includes)
+		self.exclude_rules = self._compile(exclude_filters, all_excludes)
+
+		self.fields = {field for field, _ in self.include_rules + self.exclude_rules}
+
+	def __bool__(self):
+		return bool(self.include_rules or self.exclude_rules)
+
+	def __call__(self, song):
+		if self.include_rules:
+			if self.all_includes:
+				if not all(self._match(song, field, regex) for field, regex in self.include_rules):
+					return False
+			else:
+				if not any(self._match(song, field, regex) for field, regex in self.include_rules):
+					return False
+
+		if self.exclude_rules:
+			if self.all_excludes:
+				if all(self._match(song, field, regex) for field, regex in self.exclude_rules):
+					return False
+			else:
+				if any(self._match(song, field, regex) for field, regex in self.exclude_rules):
+					return False
+
+		return True
+
+	@staticmethod
+	def _compile(filters, match_all):
+		"""Compile filters into a list of ``(field, regex)`` rules."""
+
+		if not filters:
+			return []
+
+		if match_all:
+			return [(field, re.compile(pattern, re.I)) for field, pattern in filters]
+
+		field_patterns = collections.OrderedDict()
+
+		for field, pattern in filters:
+			field_patterns.setdefault(field, []).append(pattern)
+
+		rules = []
+
+		for field, patterns in field_patterns.items():
+			regexes = [re.compile(pattern, re.I) for pattern in patterns]
 
-	return include
+			# Joining patterns renumbers their groups, which changes backreferences and conditionals,
+			# so only patterns without groups are combined.
+			combinable = [
+				regex.pattern for regex in regexes if not regex.groups and not _GLOBAL_FLAGS_RE.search(regex.pattern)
+			]
 
+			if len(combinable) > 1:
+				rules.append((field, re.compile('|'.join('(?:{})'.format(pattern) for pattern in combinable), re.I)))
+				regexes = [regex for regex in regexes if regex.pattern not in combinable]
 
-def filter_google_songs(songs, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False):
+			rules.extend((field, regex) for regex in regexes)
+
+		return rules
+
+	@staticmethod
+	def _match(song, field, regex):
+		if field not in song:
+			return False
+
+		value = song[field]
+
+		if isinstance(value, list):
+			return any(regex.search(str(item)) for item in value)
+
+		return regex.search(str(value)) is not None
+
+
+def _get_compiled_filter(compiled_filter, include_filters, exclude_filters, all_includes, all_excludes):
+	if compiled_filter is None:
+		compiled_filter = CompiledFilter(
+			include_filters=include_filters, exclude_filters=exclude_filters,
+			all_includes=all_includes, all_excludes=all_excludes
+		)
+
+	return compiled_filter
+
+
+def filter_google_songs(
+	songs, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False, compiled_filter=None):
 	"""Match a Google Music song dict against a set of metadata filters.
 
 	Parameters:
@@ -225,6 +576,8 @@ def filter_google_songs(songs, include_filters=None, exclude_filters=None, all_i
 
 		all_excludes (bool): If ``True``, all exclude_filters criteria must match to exclude a song.
 
+		compiled_filter (CompiledFilter): A prebuilt filter used instead of the other filter parameters.
+
 	Returns:
 		A list of Google Music song dicts matching criteria and
 		a list of Google Music song dicts filtered out using filter criteria.
@@ -236,21 +589,208 @@ def filter_google_songs(songs, include_filters=None, exclude_filters=None, all_i
 	matched_songs = []
 	filtered_songs = []
 
-	if include_filters or exclude_filters:
-		for song in songs:
-			if _check_filters(
-					song, include_filters=include_filters, exclude_filters=exclude_filters,
-					all_includes=all_includes, all_excludes=all_excludes):
-				matched_songs.append(song)
-			else:
-				filtered_songs.append(song)
-	else:
-		matched_songs += songs
+	for song, matched in iter_filter_google_songs(
+			songs, include_filters=include_filters, exclude_filters=exclude_filters,
+			all_includes=all_includes, all_excludes=all_excludes, compiled_filter=compiled_filter):
+		if matched:
+			matched_songs.append(song)
+		else:
+			filtered_songs.append(song)
 
 	return matched_songs, filtered_songs
 
 
-def filter_local_songs(filepaths, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False):
+def iter_filter_google_songs(
+	songs, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False, compiled_filter=None):
+	"""Lazily match Google Music song dicts against a set of metadata filters.
+
+	Streaming variant of :func:`filter_google_songs`.
+	Songs are checked as they are consumed from ``songs``, so memory use doesn't grow with the input.
+
+	Parameters:
+		songs (iterable): Google Music song dicts to filter.
+
+		include_filters (list): A list of ``(field, pattern)`` tuples.
+			Fields are any valid Google Music metadata field available to the Musicmanager client.
+			Patterns are Python regex patterns.
+			Google Music songs are filtered out if the given metadata field values don't match any of the given patterns.
+
+		exclude_filters (list): A list of ``(field, pattern)`` tuples.
+			Fields are any valid Google Music metadata field available to the Musicmanager client.
+			Patterns are Python regex patterns.
+			Google Music songs are filtered out if the given metadata field values match any of the given patterns.
+
+		all_includes (bool): If ``True``, all include_filters criteria must match to include a song.
+
+		all_excludes (bool): If ``True``, all exclude_filters criteria must match to exclude a song.
+
+		compiled_filter (CompiledFilter): A prebuilt filter used instead of the other filter parameters.
+
+	Yields:
+		``(song, matched)`` tuples in input order.
+		``matched`` is ``True`` for songs matching criteria and ``False`` for songs filtered out.
+	"""
+
+	compiled_filter = _get_compiled_filter(compiled_filter, include_filters, exclude_filters, all_includes, all_excludes)
+
+	for song in songs:
+		yield song, compiled_filter(song)
+
+
+def _load_local_metadata(filepath, fields=None):
+	"""Load mutagen metadata from a file in a worker process.
+
+	Only plain dicts are sent back to the parent process.
+
+	Returns:
+		A dict of mutagen field list values, limited to ``fields`` if given,
+		``None`` if the file isn't a known music file,
+		or the raised :exc:`mutagen.MutagenError`.
+	"""
+
+	try:
+		if fields is not None:
+			return read_tag_fields(filepath, fields)
+
+		metadata = mutagen.File(filepath, easy=True)
+	except mutagen.MutagenError as e:
+		return e
+
+	return dict(metadata.items()) if metadata is not None else None
+
+
+def _iter_local_metadata(filepaths, fields=None, metadata_cache=None, workers=None, executor=None):
+	"""Load metadata of local files in order, optionally in parallel.
+
+	Yields:
+		``(filepath, metadata)`` pairs.
+		``metadata`` is the raised :exc:`mutagen.MutagenError` for files that failed to load.
+	"""
+
+	if executor is None and (workers is None or workers <= 1):
+		for filepath in filepaths:
+			try:
+				yield filepath, _get_mutagen_metadata(filepath, metadata_cache=metadata_cache, fields=fields)
+			except mutagen.MutagenError as e:
+				yield filepath, e
+
+		return
+
+	if executor is None:
+		with ProcessPoolExecutor(max_workers=workers) as executor:
+			for result in _iter_local_metadata(filepaths, fields=fields, metadata_cache=metadata_cache, executor=executor):
+				yield result
+
+		return
+
+	# Cached metadata must be complete, so only project fields without a cache.
+	load_fields = None if metadata_cache is not None else fields
+	window = 8 * (workers or os.cpu_count() or 1)
+	pending = collections.deque()
+
+	def resolve(filepath, future, metadata):
+		if future is not None:
+			metadata = future.result()
+
+			if isinstance(metadata, mutagen.MutagenError):
+				logger.warning("Can't load {} as music file.".format(filepath))
+
+			if metadata_cache is not None:
+				if isinstance(metadata, mutagen.MutagenError):
+					metadata_cache.set(filepath, None, error=True)
+				else:
+					metadata_cache.set(filepath, metadata)
+
+		return filepath, metadata
+
+	for filepath in filepaths:
+		found = False
+
+		if metadata_cache is not None:
+			found, error, metadata = metadata_cache.get(filepath)
+
+		if found:
+			if error:
+				logger.warning("Can't load {} as music file.".format(filepath))
+				metadata = mutagen.MutagenError("Cached load failure for {}".format(filepath))
+
+			pending.append((filepath, None, metadata))
+		else:
+			pending.append((filepath, executor.submit(_load_local_metadata, filepath, load_fields), None))
+
+		# Yield in input order as soon as the oldest file is done.
+		while pending and (len(pending) > window or pending[0][1] is None or pending[0][1].done()):
+			yield resolve(*pending.popleft())
+
+	while pending:
+		yield resolve(*pending.popleft())
+
+
+def _iter_concurrent(function, items, max_workers=None, ordered=True):
+	"""Call a function on each item, optionally using a pool of threads.
+
+	At most ``2 * max_workers`` items are in flight at a time, so items are consumed lazily.
+
+	Parameters:
+		function (callable): A function taking an item.
+
+		items (iterable): The items to call the function on.
+
+		max_workers (int): Number of threads to call the function in.
+			Default: Call the function in the calling thread.
+
+		ordered (bool): If ``True``, yield in input order. Otherwise, yield in completion order.
+
+	Yields:
+		``(item, future)`` tuples. Calling ``future.result()`` returns the function result or raises its exception.
+	"""
+
+	if max_workers is None or max_workers <= 1:
+		for item in items:
+			future = Future()
+
+			try:
+				future.set_result(function(item))
+			except Exception as e:
+				future.set_exception(e)
+
+			yield item, future
+
+		return
+
+	window = 2 * max_workers
+	items = iter(items)
+
+	with ThreadPoolExecutor(max_workers=max_workers) as executor:
+		pending = collections.OrderedDict()
+
+		try:
+			for item in items:
+				pending[executor.submit(function, item)] = item
+
+				if len(pending) >= window:
+					break
+
+			while pending:
+				if ordered:
+					done = [next(iter(pending))]
+					wait(done)
+				else:
+					done = wait(pending, return_when=FIRST_COMPLETED)[0]
+
+				for future in done:
+					yield pending.pop(future), future
+
+					for item in itertools.islice(items, 1):
+						pending[executor.submit(function, item)] = item
+		finally:
+			for future in pending:
+				future.cancel()
+
+
+def filter_local_songs(
+	filepaths, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False, metadata_cache=None,
+	workers=None, executor=None, compiled_filter=None):
 	"""Match a local file against a set of metadata filters.
 
 	Parameters:
@@ -270,6 +810,16 @@ def filter_local_songs(filepaths, include_filters=None, exclude_filters=None, al
 
 		all_excludes (bool): If ``True``, all exclude_filters criteria must match to exclude a song.
 
+		metadata_cache (MetadataCache): A cache used to avoid reloading metadata of unchanged local files.
+
+		workers (int): Number of processes used to load metadata in parallel.
+			Default: Load metadata in the calling process.
+
+		executor (concurrent.futures.Executor): An executor used to load metadata in parallel instead of
+			creating a process pool. It is not shut down afterwards.
+
+		compiled_filter (CompiledFilter): A prebuilt filter used instead of the other filter parameters.
+
 	Returns:
 		A list of local song filepaths matching criteria and
 		a list of local song filepaths filtered out using filter criteria.
@@ -282,25 +832,88 @@ def filter_local_songs(filepaths, include_filters=None, exclude_filters=None, al
 	matched_songs = []
 	filtered_songs = []
 
-	for filepath in filepaths:
-		try:
-			song = _get_mutagen_metadata(filepath)
-		except mutagen.MutagenError:
-			filtered_songs.append(filepath)
+	for filepath, matched in iter_filter_local_songs(
+			filepaths, include_filters=include_filters, exclude_filters=exclude_filters,
+			all_includes=all_includes, all_excludes=all_excludes, metadata_cache=metadata_cache,
+			workers=workers, executor=executor, compiled_filter=compiled_filter):
+		if matched:
+			matched_songs.append(filepath)
 		else:
-			if include_filters or exclude_filters:
-				if _check_filters(
-						song, include_filters=include_filters, exclude_filters=exclude_filters,
-						all_includes=all_includes, all_excludes=all_excludes):
-					matched_songs.append(filepath)
-				else:
-					filtered_songs.append(filepath)
-			else:
-				matched_songs.append(filepath)
+			filtered_songs.append(filepath)
 
 	return matched_songs, filtered_songs
 
 
+def iter_filter_local_songs(
+	filepaths, include_filters=None, exclude_filters=None, all_includes=False, all_excludes=False, metadata_cache=None,
+	workers=None, executor=None, compiled_filter=None):
+	"""Lazily match local files against a set of metadata filters.
+
+	Streaming variant of :func:`filter_local_songs`.
+	Files are checked as they are consumed from ``filepaths``.
+	When loading metadata in parallel, only a bounded number of files are in flight at once.
+
+	Parameters:
+		filepaths (iterable): Filepaths to filter.
+
+		include_filters (list): A list of ``(field, pattern)`` tuples.
+			Fields are any valid mutagen metadata fields.
+			Patterns are Python regex patterns.
+			Local songs are filtered out if the given metadata field values don't match any of the given patterns.
+
+		exclude_filters (list): A list of ``(field, pattern)`` tuples.
+			Fields are any valid mutagen metadata fields.
+			Patterns are Python regex patterns.
+			Local songs are filtered out if the given metadata field values match any of the given patterns.
+
+		all_includes (bool): If ``True``, all include_filters criteria must match to include a song.
+
+		all_excludes (bool): If ``True``, all exclude_filters criteria must match to exclude a song.
+
+		metadata_cache (MetadataCache): A cache used to avoid reloading metadata of unchanged local files.
+
+		workers (int): Number of processes used to load metadata in parallel.
+			Default: Load metadata in the calling process.
+
+		executor (concurrent.futures.Executor): An executor used to load metadata in parallel instead of
+			creating a process pool. It is not shut down afterwards.
+
+		compiled_filter (CompiledFilter): A prebuilt filter used instead of the other filter parameters.
+
+	Yields:
+		``(filepath, matched)`` tuples in input order.
+		``matched`` is ``True`` for files matching criteria and ``False`` for files filtered out.
+		Invalid music files are also filtered out.
+	"""
+
+	compiled_filter = _get_compiled_filter(compiled_filter, include_filters, exclude_filters, all_includes, all_excludes)
+
+	for filepath, song in _iter_local_metadata(
+			filepaths, fields=compiled_filter.fields, metadata_cache=metadata_cache, workers=workers, executor=executor):
+		if isinstance(song, mutagen.MutagenError):
+			yield filepath, False
+		else:
+			yield filepath, compiled_filter(song)
+
+
+# Google Music song dict fields to mutagen field names.
+# Musicmanager uses snake case field names and Mobileclient uses camel case field names.
+_GOOGLE_METADATA_FIELDS = {
+	'title': 'title', 'artist': 'artist', 'album': 'album', 'album_artist': 'albumartist', 'albumArtist': 'albumartist',
+	'genre': 'genre', 'year': 'date', 'track_number': 'tracknumber', 'trackNumber': 'tracknumber',
+	'disc_number': 'discnumber', 'discNumber': 'discnumber'
+}
+
+
+def _google_song_to_metadata(song):
+	"""Convert a Google Music song dict to a metadata dict with mutagen field names."""
+
+	return {
+		field: str(song[google_field]) for google_field, field in _GOOGLE_METADATA_FIELDS.items()
+		if song.get(google_field) not in (None, '')
+	}
+
+
 def get_suggested_filename(metadata):
 	"""Generate a filename for a song based on metadata.
 
@@ -41,6 +41,7 @@ setup(
 	install_requires=[
 		'gmusicapi >= 10.0.0',
 		'mutagen >= 1.33',  # TPE2 mapping to albumartist instead of performer.
+		'scandir; python_version < "3.5"',
 		'wrapt'
 	],
 
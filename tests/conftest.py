@@ -0,0 +1,9 @@
+# coding=utf-8
+
+import sys
+
+collect_ignore = []
+
+# async def syntax requires Python 3.5+.
+if sys.version_info < (3, 5):
+	collect_ignore.append('test_aio.py')
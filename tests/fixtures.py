@@ -2,6 +2,15 @@
 
 """Fixtures for testing gmusicapi_wrapper."""
 
+import contextlib
+import threading
+import time
+import uuid
+
+from gmusicapi import CallFailure
+
+from gmusicapi_wrapper import MusicManagerWrapper
+
 TEST_SONGS_1 = [
 	{'artist': 'Muse', 'album': 'Black Holes and Revelations', 'year': 2006, 'track_number': 1, 'title': 'Take a Bow'},
 	{'artist': 'Muse', 'album': 'Black Holes and Revelations', 'year': 2006, 'track_number': 2, 'title': 'Starlight'}
@@ -10,3 +19,136 @@ TEST_SONGS_1 = [
 TEST_SONGS_2 = [
 	{'artist': 'Muse', 'album': 'Black Holes and Revelations', 'year': 2006, 'track_number': 1, 'title': 'Take a Bow'}
 ]
+
+ID3_FRAMES = {
+	'title': 'TIT2', 'artist': 'TPE1', 'album': 'TALB', 'albumartist': 'TPE2',
+	'tracknumber': 'TRCK', 'discnumber': 'TPOS', 'date': 'TDRC'
+}
+
+
+def _syncsafe(n):
+	return bytes([(n >> 21) & 0x7f, (n >> 14) & 0x7f, (n >> 7) & 0x7f, n & 0x7f])
+
+
+def make_mp3(audio_byte=0, **tags):
+	"""Create MP3 file contents with an ID3v2.4 tag from mutagen field names.
+
+	Files made with a different audio_byte have different audio data.
+	"""
+
+	frames = b''
+
+	for field, value in tags.items():
+		data = b'\x03' + value.encode('utf-8')
+		frames += ID3_FRAMES[field].encode('ascii') + _syncsafe(len(data)) + b'\x00\x00' + data
+
+	# 128 kbps 44.1 kHz MPEG-1 Layer III frames.
+	audio = (b'\xff\xfb\x90\x64' + bytes([audio_byte]) * 413) * 10
+
+	return b'ID3\x04\x00\x00' + _syncsafe(len(frames)) + frames + audio
+
+
+def write_test_songs(tmpdir, songs):
+	"""Write MP3 files for test song dicts and return their filepaths."""
+
+	filepaths = []
+
+	for num, song in enumerate(songs):
+		filepath = str(tmpdir.join('{:02} {}.mp3'.format(num, song['title'])))
+
+		with open(filepath, 'wb') as f:
+			f.write(make_mp3(audio_byte=num, artist=song['artist'], album=song['album'], title=song['title'], tracknumber=str(song['track_number'])))
+
+		filepaths.append(filepath)
+
+	return filepaths
+
+
+def make_flac():
+	"""Create untagged FLAC file contents with only a STREAMINFO block."""
+
+	# 4096 sample blocks, 44.1 kHz, 2 channels, 16 bits per sample, 1 second.
+	streaminfo = (4096).to_bytes(2, 'big') * 2 + b'\x00' * 6
+	streaminfo += ((44100 << 44) | (1 << 41) | (15 << 36) | 44100).to_bytes(8, 'big') + b'\x00' * 16
+
+	return b'fLaC' + b'\x80' + len(streaminfo).to_bytes(3, 'big') + streaminfo + b'\xff\xf8' + b'\x00' * 100
+
+
+class FakeMusicmanager:
+	"""A stand-in for gmusicapi's Musicmanager client that doesn't make network calls."""
+
+	def __init__(self, songs=None, latency=0, failures=(), purchased=None):
+		self.songs = {song['id']: song for song in songs or []}
+		self.purchased = list(purchased or [])
+		self.latency = latency
+		self.failures = set(failures)
+		self.uploaded = {}
+		self.upload_batches = []
+		self.calls = 0
+		self.active = 0
+		self.max_active = 0
+		self._lock = threading.Lock()
+
+	@contextlib.contextmanager
+	def _call(self):
+		with self._lock:
+			self.calls += 1
+			self.active += 1
+			self.max_active = max(self.max_active, self.active)
+
+		try:
+			time.sleep(self.latency)
+			yield
+		finally:
+			with self._lock:
+				self.active -= 1
+
+	def get_uploaded_songs(self, incremental=False):
+		songs = list(self.songs.values())
+
+		return [songs] if incremental else songs
+
+	def get_purchased_songs(self, incremental=False):
+		songs = list(self.purchased)
+
+		return [songs] if incremental else songs
+
+	def download_song(self, song_id):
+		with self._call():
+			if song_id not in self.songs:
+				raise CallFailure("Song {} not found".format(song_id), 'DownloadSong')
+
+			song = self.songs[song_id]
+			tags = {field: str(song[field]) for field in ['artist', 'album', 'title'] if field in song}
+
+			if 'audio' in song:
+				return song['title'] + '.mp3', song['audio']
+
+			return song['title'] + '.mp3', make_mp3(audio_byte=song.get('audio_byte', 0), **tags)
+
+	def upload(self, filepaths, enable_matching=False, transcode_quality='320k'):
+		if isinstance(filepaths, str):
+			filepaths = [filepaths]
+
+		uploaded = {}
+		self.upload_batches.append(list(filepaths))
+
+		for filepath in filepaths:
+			with self._call():
+				if filepath in self.failures:
+					raise CallFailure("Upload of {} failed".format(filepath), 'UploadMetadata')
+
+				song_id = str(uuid.uuid5(uuid.NAMESPACE_URL, filepath))
+				self.uploaded[song_id] = filepath
+				uploaded[filepath] = song_id
+
+		return uploaded, {}, {}
+
+
+def make_musicmanager_wrapper(api=None):
+	"""Create a MusicManagerWrapper using a FakeMusicmanager."""
+
+	wrapper = MusicManagerWrapper()
+	wrapper.api = api if api is not None else FakeMusicmanager()
+
+	return wrapper
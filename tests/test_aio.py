@@ -0,0 +1,114 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.aio."""
+
+import asyncio
+import os
+
+import pytest
+
+from gmusicapi_wrapper.aio import AsyncMusicManagerWrapper
+from gmusicapi_wrapper.cache import MetadataCache
+
+from fixtures import TEST_SONGS_1, FakeMusicmanager, make_musicmanager_wrapper, write_test_songs
+
+
+def make_songs(num):
+	"""Create Google Music song dicts with distinct audio."""
+
+	return [{'id': 'id-{}'.format(i), 'artist': 'Muse', 'title': 'Song {}'.format(i), 'audio_byte': i} for i in range(num)]
+
+
+def test_async_download(tmpdir):
+	"""Test gmusicapi_wrapper.aio.AsyncMusicManagerWrapper.download runs downloads concurrently."""
+
+	songs = make_songs(6)
+	api = FakeMusicmanager(songs, latency=0.05)
+	template = os.path.join(str(tmpdir), '%title%')
+
+	async def main():
+		async with AsyncMusicManagerWrapper(make_musicmanager_wrapper(api), max_workers=3) as mmw:
+			return await asyncio.gather(*[mmw.download(song, template=template) for song in songs])
+
+	results = asyncio.run(main())
+
+	assert [result[0]['id'] for result in results] == [song['id'] for song in songs]
+	assert all(os.path.isfile(result[0]['filepath']) for result in results)
+	assert 1 < api.max_active <= 3
+
+
+def test_async_iter_download(tmpdir):
+	"""Test gmusicapi_wrapper.aio.AsyncMusicManagerWrapper.iter_download streams results."""
+
+	songs = make_songs(4)
+	api = FakeMusicmanager(songs)
+	template = os.path.join(str(tmpdir), '%title%')
+
+	async def main():
+		async with AsyncMusicManagerWrapper(make_musicmanager_wrapper(api)) as mmw:
+			return [result async for result in mmw.iter_download(songs, template=template, max_workers=2)]
+
+	results = asyncio.run(main())
+
+	assert [result['id'] for result in results] == [song['id'] for song in songs]
+	assert all(result['result'] == 'downloaded' for result in results)
+
+
+def test_async_iter_upload(tmpdir):
+	"""Test gmusicapi_wrapper.aio.AsyncMusicManagerWrapper.iter_upload streams results."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	api = FakeMusicmanager(failures=filepaths[1:])
+
+	async def main():
+		async with AsyncMusicManagerWrapper(make_musicmanager_wrapper(api)) as mmw:
+			return [result async for result in mmw.iter_upload(filepaths)]
+
+	results = asyncio.run(main())
+
+	assert [result['result'] for result in results] == ['uploaded', 'error']
+
+
+def test_async_iter_upload_aclose(tmpdir):
+	"""Test gmusicapi_wrapper.aio.AsyncMusicManagerWrapper.iter_upload stops early on aclose."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	api = FakeMusicmanager()
+
+	async def main():
+		async with AsyncMusicManagerWrapper(make_musicmanager_wrapper(api)) as mmw:
+			stream = mmw.iter_upload(filepaths)
+			result = await stream.__anext__()
+			await stream.aclose()
+
+			return result
+
+	assert asyncio.run(main())['result'] == 'uploaded'
+	assert api.calls <= 2
+
+
+def test_async_stream_exception():
+	"""Test gmusicapi_wrapper.aio result streams raise exceptions from the wrapper."""
+
+	async def main():
+		async with AsyncMusicManagerWrapper(make_musicmanager_wrapper()) as mmw:
+			return [result async for result in mmw.iter_download([{'title': 'No id'}])]
+
+	with pytest.raises(KeyError):
+		asyncio.run(main())
+
+
+def test_async_get_local_songs_metadata_cache(tmpdir):
+	"""Test gmusicapi_wrapper.aio wrappers can use a metadata cache created in another thread."""
+
+	write_test_songs(tmpdir, TEST_SONGS_1)
+	metadata_cache = MetadataCache()
+
+	async def main():
+		async with AsyncMusicManagerWrapper(make_musicmanager_wrapper()) as mmw:
+			return await mmw.get_local_songs(str(tmpdir), metadata_cache=metadata_cache)
+
+	matched, filtered, excluded = asyncio.run(main())
+
+	assert len(matched) == 2
+	assert len(metadata_cache) == 2
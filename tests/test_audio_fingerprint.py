@@ -0,0 +1,145 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.tags.audio_fingerprint and gmusicapi_wrapper.index.FingerprintIndex."""
+
+from mutagen.apev2 import APEv2
+from mutagen.flac import FLAC
+from mutagen.id3 import ID3, TIT2
+
+from gmusicapi_wrapper.index import FingerprintIndex, SongKeyIndex
+from gmusicapi_wrapper.tags import audio_fingerprint
+from gmusicapi_wrapper.utils import compare_song_collections
+
+from fixtures import TEST_SONGS_1, make_flac, make_mp3, make_musicmanager_wrapper, write_test_songs
+
+
+def write_file(tmpdir, filename, data):
+	"""Write a file in tmpdir and return its filepath."""
+
+	filepath = str(tmpdir.join(filename))
+
+	with open(filepath, 'wb') as f:
+		f.write(data)
+
+	return filepath
+
+
+def test_audio_fingerprint_mp3_ignores_tags(tmpdir):
+	"""Test gmusicapi_wrapper.tags.audio_fingerprint ignores ID3v2, ID3v1, and APEv2 tags."""
+
+	filepath = write_file(tmpdir, 'song.mp3', make_mp3(title='Take a Bow'))
+	fingerprint = audio_fingerprint(filepath)
+
+	tags = ID3(filepath)
+	tags.add(TIT2(encoding=3, text=['A much longer title than before' * 10]))
+	tags.save(filepath, v1=2, v2_version=3)
+
+	ape = APEv2()
+	ape['Title'] = 'Starlight'
+	ape.save(filepath)
+
+	assert audio_fingerprint(filepath) == fingerprint
+	assert audio_fingerprint(write_file(tmpdir, 'other.mp3', make_mp3(audio_byte=1))) != fingerprint
+
+
+def test_audio_fingerprint_flac_ignores_tags(tmpdir):
+	"""Test gmusicapi_wrapper.tags.audio_fingerprint ignores FLAC metadata blocks."""
+
+	filepath = write_file(tmpdir, 'song.flac', make_flac())
+	fingerprint = audio_fingerprint(filepath)
+
+	tags = FLAC(filepath)
+	tags['title'] = 'Take a Bow'
+	tags.save()
+
+	assert audio_fingerprint(filepath) == fingerprint
+
+
+def test_fingerprint_index_compare(tmpdir):
+	"""Test gmusicapi_wrapper.utils.compare_song_collections matches retagged files with a FingerprintIndex."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	fingerprint_index = FingerprintIndex()
+	fingerprint_index.add(filepaths[0], song_id='song-1')
+
+	tags = ID3(filepaths[0])
+	tags.add(TIT2(encoding=3, text=['Retitled']))
+	tags.save()
+
+	google_songs = [dict(song, id='song-{}'.format(num)) for num, song in enumerate(TEST_SONGS_1, 1)]
+
+	assert compare_song_collections(filepaths, google_songs) == filepaths[:1]
+	assert compare_song_collections(filepaths, google_songs, fingerprint_index=fingerprint_index) == []
+	assert fingerprint_index.get_song_id(filepaths[0]) == 'song-1'
+
+
+def test_fingerprint_index_compare_missing_song(tmpdir):
+	"""Test gmusicapi_wrapper.utils.compare_song_collections reports fingerprinted files whose song isn't in dst."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	fingerprint_index = FingerprintIndex()
+	fingerprint_index.add(filepaths[0], song_id='song-1')
+	fingerprint_index.add(filepaths[1])
+
+	assert compare_song_collections(filepaths, [], fingerprint_index=fingerprint_index) == filepaths
+	assert compare_song_collections(
+		filepaths, SongKeyIndex([{'id': 'song-2', 'title': 'Other'}]), fingerprint_index=fingerprint_index
+	) == filepaths
+
+
+def test_fingerprint_index_remove(tmpdir):
+	"""Test gmusicapi_wrapper.index.FingerprintIndex.remove forgets the files with the fingerprint."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	fingerprint_index = FingerprintIndex()
+	fingerprint = fingerprint_index.add(filepaths[0], song_id='song-1')
+	fingerprint_index.add(filepaths[1], song_id='song-2')
+
+	fingerprint_index.remove(fingerprint)
+
+	assert len(fingerprint_index) == 1
+	assert filepaths[0] not in fingerprint_index._paths
+	assert filepaths[1] in fingerprint_index._paths
+
+
+def test_fingerprint_index_reconcile(tmpdir):
+	"""Test gmusicapi_wrapper.index.FingerprintIndex.reconcile removes songs no longer in the library."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	fingerprint_index = FingerprintIndex()
+	removed = fingerprint_index.add(filepaths[0], song_id='song-1')
+	fingerprint_index.add(filepaths[1], song_id='song-2')
+
+	assert fingerprint_index.reconcile([{'id': 'song-2'}]) == [removed]
+	assert fingerprint_index.get_song_id(filepaths[0]) is None
+	assert fingerprint_index.get_song_id(filepaths[1]) == 'song-2'
+
+
+def test_fingerprint_index_save_load(tmpdir):
+	"""Test gmusicapi_wrapper.index.FingerprintIndex round trips through a file."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	fingerprint_index = FingerprintIndex()
+	fingerprint_index.add(filepaths[1], song_id='song-2')
+	index_filepath = str(tmpdir.join('fingerprints.json'))
+	fingerprint_index.save(index_filepath)
+
+	loaded = FingerprintIndex.load(index_filepath)
+
+	assert len(loaded) == 1
+	assert filepaths[1] in loaded
+	assert filepaths[0] not in loaded
+	assert loaded.get_song_id(filepaths[1]) == 'song-2'
+
+
+def test_upload_records_fingerprints(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.upload records fingerprints of uploaded files."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	wrapper = make_musicmanager_wrapper()
+	fingerprint_index = FingerprintIndex()
+
+	results = wrapper.upload(filepaths, fingerprint_index=fingerprint_index)
+
+	assert len(fingerprint_index) == 2
+	assert [fingerprint_index.get_song_id(filepath) for filepath in filepaths] == [result['id'] for result in results]
@@ -25,3 +25,21 @@ def test_compare_song_collections_partial():
 
 	assert len(result) == 1
 	assert result == expected
+
+
+def test_compare_song_collections_fuzzy():
+	"""Test gmusicapi_wrapper.utils.compare_song_collections fuzzy mode matches songs with a typo."""
+
+	dst_songs = [dict(TEST_SONGS_1[0], title="Take a Bw"), dict(TEST_SONGS_1[1], title="Completely Different")]
+
+	assert compare_song_collections(TEST_SONGS_1, dst_songs) == TEST_SONGS_1
+	assert compare_song_collections(TEST_SONGS_1, dst_songs, fuzzy=True) == [TEST_SONGS_1[1]]
+	assert compare_song_collections(TEST_SONGS_1, dst_songs, fuzzy=True, threshold=0.99) == TEST_SONGS_1
+
+
+def test_compare_song_collections_fuzzy_blocking():
+	"""Test gmusicapi_wrapper.utils.compare_song_collections fuzzy mode only compares songs sharing two fields."""
+
+	dst_songs = [dict(TEST_SONGS_1[0], artist="Mose", album="Block Holes and Revelations")]
+
+	assert compare_song_collections(TEST_SONGS_1[:1], dst_songs, fuzzy=True, threshold=0.5) == TEST_SONGS_1[:1]
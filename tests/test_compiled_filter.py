@@ -0,0 +1,74 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.utils.CompiledFilter."""
+
+from gmusicapi_wrapper.utils import CompiledFilter, filter_google_songs
+
+from fixtures import TEST_SONGS_1
+
+
+def test_compiled_filter_combines_field_patterns():
+	"""Test gmusicapi_wrapper.utils.CompiledFilter combines patterns of a field into one regex."""
+
+	compiled_filter = CompiledFilter(include_filters=[("title", "Take"), ("title", "Star"), ("artist", "Muse")])
+
+	assert len(compiled_filter.include_rules) == 2
+	assert compiled_filter.fields == {"title", "artist"}
+	assert all(compiled_filter(song) for song in TEST_SONGS_1)
+
+
+def test_compiled_filter_all_includes():
+	"""Test gmusicapi_wrapper.utils.CompiledFilter with all_includes checks every pattern."""
+
+	compiled_filter = CompiledFilter(include_filters=[("title", "Take"), ("title", "Bow")], all_includes=True)
+
+	assert [compiled_filter(song) for song in TEST_SONGS_1] == [True, False]
+
+
+def test_compiled_filter_backreference():
+	"""Test gmusicapi_wrapper.utils.CompiledFilter doesn't combine patterns with backreferences."""
+
+	compiled_filter = CompiledFilter(exclude_filters=[("title", "^(x)"), ("title", r"(t)\1")])
+
+	assert len(compiled_filter.exclude_rules) == 2
+	assert compiled_filter({'title': 'Starlight'})
+	assert not compiled_filter({'title': 'Xylophone'})
+	assert not compiled_filter({'title': 'Mutt'})
+
+
+def test_compiled_filter_list_values():
+	"""Test gmusicapi_wrapper.utils.CompiledFilter checks all values of list fields."""
+
+	compiled_filter = CompiledFilter(include_filters=[("artist", "^other$")])
+
+	assert compiled_filter({'artist': ['Muse', 'Other']})
+	assert not compiled_filter({'title': 'Other'})
+
+
+def test_filter_google_songs_compiled_filter():
+	"""Test gmusicapi_wrapper.utils.filter_google_songs with a compiled filter."""
+
+	compiled_filter = CompiledFilter(exclude_filters=[("title", "take")])
+
+	matched, filtered = filter_google_songs(TEST_SONGS_1, compiled_filter=compiled_filter)
+
+	assert matched == [TEST_SONGS_1[1]]
+	assert filtered == [TEST_SONGS_1[0]]
+
+
+def test_compiled_filter_conditional_group_reference():
+	"""Test gmusicapi_wrapper.utils.CompiledFilter doesn't combine patterns with conditional group references."""
+
+	compiled_filter = CompiledFilter(include_filters=[("title", "(y)"), ("title", "(a)?(?(1)b|c)")])
+
+	assert len(compiled_filter.include_rules) == 2
+	assert compiled_filter({'title': 'ab'})
+
+
+def test_compiled_filter_combines_groupless_patterns():
+	"""Test gmusicapi_wrapper.utils.CompiledFilter combines the patterns of a field without groups."""
+
+	compiled_filter = CompiledFilter(include_filters=[("title", "Take"), ("title", "(Star)"), ("title", "Bow")])
+
+	assert len(compiled_filter.include_rules) == 2
+	assert all(compiled_filter(song) for song in TEST_SONGS_1)
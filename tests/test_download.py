@@ -0,0 +1,148 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.MusicManagerWrapper.download."""
+
+import os
+import tempfile
+
+import pytest
+
+from fixtures import FakeMusicmanager, make_mp3, make_musicmanager_wrapper
+
+
+def make_songs(num):
+	"""Create Google Music song dicts with distinct audio."""
+
+	return [
+		{'id': 'id-{}'.format(i), 'artist': 'Muse', 'album': 'Absolution', 'title': 'Song {}'.format(i), 'audio_byte': i}
+		for i in range(num)
+	]
+
+
+@pytest.mark.parametrize('max_workers', [None, 4])
+def test_download(tmpdir, max_workers):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.download results and files."""
+
+	songs = make_songs(6)
+	api = FakeMusicmanager(songs)
+	wrapper = make_musicmanager_wrapper(api)
+	template = os.path.join(str(tmpdir), '%artist%', '%title%')
+
+	results = wrapper.download(songs, template=template, max_workers=max_workers)
+
+	assert [result['id'] for result in results] == [song['id'] for song in songs]
+	assert all(result['result'] == 'downloaded' for result in results)
+
+	for song, result in zip(songs, results):
+		assert result['filepath'] == os.path.join(str(tmpdir), 'Muse', song['title'] + '.mp3')
+
+		with open(result['filepath'], 'rb') as f:
+			assert f.read() == make_mp3(audio_byte=song['audio_byte'], artist='Muse', album='Absolution', title=song['title'])
+
+
+def test_download_concurrent(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.download overlaps requests with max_workers."""
+
+	songs = make_songs(8)
+	api = FakeMusicmanager(songs, latency=0.05)
+	wrapper = make_musicmanager_wrapper(api)
+
+	results = wrapper.download(songs, template=os.path.join(str(tmpdir), '%title%'), max_workers=4, ordered=False)
+
+	assert sorted(result['id'] for result in results) == sorted(song['id'] for song in songs)
+	assert 1 < api.max_active <= 4
+
+
+def test_download_errors(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.download reports errors for the failed song."""
+
+	songs = make_songs(3)
+	api = FakeMusicmanager(songs[:1] + songs[2:])
+	wrapper = make_musicmanager_wrapper(api)
+
+	results = wrapper.download(songs, template=os.path.join(str(tmpdir), '%title%'), max_workers=2)
+
+	assert [result['result'] for result in results] == ['downloaded', 'error', 'downloaded']
+	assert results[1]['id'] == songs[1]['id']
+
+
+def test_download_filepath_collision(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.download keeps the last song rendering to a filepath."""
+
+	songs = [dict(song, title='Same') for song in make_songs(8)]
+	api = FakeMusicmanager(songs, latency=0.01)
+	wrapper = make_musicmanager_wrapper(api)
+
+	results = wrapper.download(songs, template=os.path.join(str(tmpdir), '%title%'), max_workers=4)
+
+	assert len({result['filepath'] for result in results}) == 1
+	assert os.listdir(str(tmpdir)) == ['Same.mp3']
+
+	with open(results[0]['filepath'], 'rb') as f:
+		assert f.read() == make_mp3(audio_byte=7, artist='Muse', album='Absolution', title='Same')
+
+
+def test_download_writes_in_target_dir(tmpdir, monkeypatch):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.download doesn't write to the system temp directory."""
+
+	system_temp = tmpdir.mkdir('tmp')
+	monkeypatch.setattr(tempfile, 'tempdir', str(system_temp))
+
+	songs = make_songs(3)
+	wrapper = make_musicmanager_wrapper(FakeMusicmanager(songs))
+	target = tmpdir.join('music')
+
+	wrapper.download(songs, template=os.path.join(str(target), '%artist%', '%album%', '%title%'))
+
+	assert system_temp.listdir() == []
+	assert sorted(os.listdir(str(target.join('Muse', 'Absolution')))) == ['Song 0.mp3', 'Song 1.mp3', 'Song 2.mp3']
+
+
+def test_download_metadata_fallback(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.download uses the song dict if audio has no readable tags."""
+
+	songs = [{'id': 'id-0', 'artist': 'Muse', 'title': 'Starlight', 'track_number': 2, 'audio': b'not audio'}]
+	wrapper = make_musicmanager_wrapper(FakeMusicmanager(songs))
+
+	results = wrapper.download(songs, template=os.path.join(str(tmpdir), '%artist%', '%track% %title%'))
+
+	assert results[0]['filepath'] == os.path.join(str(tmpdir), 'Muse', '02 Starlight.mp3')
+
+	with open(results[0]['filepath'], 'rb') as f:
+		assert f.read() == b'not audio'
+
+
+def test_download_skip_existing(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.download skips songs already on disk without downloading."""
+
+	songs = [dict(song, track_number=i + 1) for i, song in enumerate(make_songs(3))]
+	api = FakeMusicmanager(songs)
+	wrapper = make_musicmanager_wrapper(api)
+	template = os.path.join(str(tmpdir), '%artist%', '%track% %title%')
+
+	results = wrapper.download(songs[:2], template=template, skip_existing=True)
+
+	assert results[0]['filepath'] == os.path.join(str(tmpdir), 'Muse', '01 Song 0.mp3')
+
+	results = wrapper.download(songs, template=template, skip_existing=True)
+
+	assert api.calls == 3
+	assert [result['result'] for result in results] == ['skipped', 'skipped', 'downloaded']
+
+
+def test_download_skip_existing_size(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.download only skips files with the expected size."""
+
+	songs = make_songs(2)
+	api = FakeMusicmanager(songs)
+	wrapper = make_musicmanager_wrapper(api)
+	template = os.path.join(str(tmpdir), '%title%')
+
+	wrapper.download(songs, template=template)
+	size = os.path.getsize(os.path.join(str(tmpdir), 'Song 0.mp3'))
+	songs = [dict(songs[0], track_size=size), dict(songs[1], track_size=size + 1)]
+
+	results = wrapper.download(songs, template=template, skip_existing='size')
+
+	assert api.calls == 3
+	assert [result['result'] for result in results] == ['skipped', 'downloaded']
@@ -0,0 +1,86 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.utils.filter_local_songs utility function."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from gmusicapi_wrapper.cache import MetadataCache
+from gmusicapi_wrapper.utils import filter_local_songs
+
+from fixtures import TEST_SONGS_1, write_test_songs
+
+
+def test_filter_local_songs_no_filters(tmpdir):
+	"""Test gmusicapi_wrapper.utils.filter_local_songs with no filters."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+
+	matched, filtered = filter_local_songs(filepaths)
+
+	assert matched == filepaths
+	assert filtered == []
+
+
+def test_filter_local_songs_include_filters(tmpdir):
+	"""Test gmusicapi_wrapper.utils.filter_local_songs with an include filter."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+
+	matched, filtered = filter_local_songs(filepaths, include_filters=[("title", "Take")])
+
+	assert matched == filepaths[:1]
+	assert filtered == filepaths[1:]
+
+
+def test_filter_local_songs_invalid_file(tmpdir):
+	"""Test gmusicapi_wrapper.utils.filter_local_songs filters out invalid music files."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	invalid = str(tmpdir.join('invalid.flac'))
+
+	with open(invalid, 'wb') as f:
+		f.write(b'fLaC' + b'\x00' * 64)
+
+	matched, filtered = filter_local_songs(filepaths + [invalid])
+
+	assert matched == filepaths
+	assert filtered == [invalid]
+
+
+class TestParallel:
+	"""Test gmusicapi_wrapper.utils.filter_local_songs loading metadata in parallel."""
+
+	def test_filter_local_songs_workers(self, tmpdir):
+		"""Test gmusicapi_wrapper.utils.filter_local_songs with a process pool keeps input order."""
+
+		filepaths = write_test_songs(tmpdir, TEST_SONGS_1 * 10)
+		invalid = str(tmpdir.join('invalid.flac'))
+
+		with open(invalid, 'wb') as f:
+			f.write(b'fLaC' + b'\x00' * 64)
+
+		filepaths.insert(5, invalid)
+
+		matched, filtered = filter_local_songs(filepaths, exclude_filters=[("title", "Starlight")], workers=2)
+		expected_matched, expected_filtered = filter_local_songs(filepaths, exclude_filters=[("title", "Starlight")])
+
+		assert matched == expected_matched
+		assert filtered == expected_filtered
+		assert invalid in filtered
+
+	def test_filter_local_songs_executor_with_cache(self, tmpdir):
+		"""Test gmusicapi_wrapper.utils.filter_local_songs with an executor and metadata cache."""
+
+		filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+		cache = MetadataCache()
+
+		with ThreadPoolExecutor(2) as executor:
+			for __ in range(2):
+				matched, filtered = filter_local_songs(
+					filepaths, include_filters=[("title", "Take")], metadata_cache=cache, executor=executor
+				)
+
+				assert matched == filepaths[:1]
+				assert filtered == filepaths[1:]
+
+		assert cache.stats()['hits'] == 2
@@ -0,0 +1,69 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.utils.iter_filter_google_songs and iter_filter_local_songs utility functions."""
+
+import itertools
+import types
+
+from gmusicapi_wrapper.base import _BaseWrapper
+from gmusicapi_wrapper.utils import iter_filter_google_songs, iter_filter_local_songs
+
+from fixtures import TEST_SONGS_1, write_test_songs
+
+
+def test_iter_filter_google_songs_is_generator():
+	"""Test gmusicapi_wrapper.utils.iter_filter_google_songs returns a generator."""
+
+	assert isinstance(iter_filter_google_songs(TEST_SONGS_1), types.GeneratorType)
+
+
+def test_iter_filter_google_songs_pairs():
+	"""Test gmusicapi_wrapper.utils.iter_filter_google_songs yields (song, matched) pairs in input order."""
+
+	result = list(iter_filter_google_songs(TEST_SONGS_1, include_filters=[("title", "Take")]))
+	expected = [(TEST_SONGS_1[0], True), (TEST_SONGS_1[1], False)]
+
+	assert result == expected
+
+
+def test_iter_filter_google_songs_lazy():
+	"""Test gmusicapi_wrapper.utils.iter_filter_google_songs consumes its input lazily."""
+
+	songs = itertools.cycle(TEST_SONGS_1)
+	result = list(itertools.islice(iter_filter_google_songs(songs, exclude_filters=[("title", "Take")]), 4))
+
+	assert [matched for __, matched in result] == [False, True, False, True]
+
+
+def test_iter_filter_local_songs_pairs(tmpdir):
+	"""Test gmusicapi_wrapper.utils.iter_filter_local_songs yields (filepath, matched) pairs in input order."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	invalid = str(tmpdir.join('invalid.mp3'))
+	tmpdir.join('invalid.mp3').write('invalid')
+
+	result = list(iter_filter_local_songs(filepaths + [invalid], include_filters=[("title", "Take")]))
+	expected = [(filepaths[0], True), (filepaths[1], False), (invalid, False)]
+
+	assert result == expected
+
+
+def test_iter_filter_local_songs_lazy(tmpdir):
+	"""Test gmusicapi_wrapper.utils.iter_filter_local_songs consumes its input lazily."""
+
+	filepaths = itertools.cycle(write_test_songs(tmpdir, TEST_SONGS_1))
+	result = list(itertools.islice(iter_filter_local_songs(filepaths), 3))
+
+	assert [matched for __, matched in result] == [True, True, True]
+
+
+def test_iter_local_songs_filters(tmpdir):
+	"""Test gmusicapi_wrapper.base._BaseWrapper.iter_local_songs applies exclude patterns and filters."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+
+	result = list(_BaseWrapper.iter_local_songs(str(tmpdir), exclude_filters=[("artist", "Muse")]))
+	assert result == []
+
+	result = list(_BaseWrapper.iter_local_songs(str(tmpdir), exclude_patterns=[filepaths[0]]))
+	assert result == filepaths[1:]
@@ -0,0 +1,73 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.utils.iter_supported_filepaths utility function."""
+
+import os
+import types
+
+from gmusicapi_wrapper.utils import get_supported_filepaths, iter_supported_filepaths, walk_depth
+
+
+def make_tree(root):
+	"""Create a small music directory tree for testing."""
+
+	for path in ['a.mp3', 'b.txt', 'C.FLAC', 'x/c.ogg', 'x/y/d.m4a', 'x/y/z/e.mp3', 'w/f.mp3']:
+		filepath = os.path.join(str(root), *path.split('/'))
+		os.makedirs(os.path.dirname(filepath), exist_ok=True)
+		open(filepath, 'w').close()
+
+
+def walk_depth_filepaths(path, supported_extensions, max_depth=float('inf')):
+	"""Reference implementation using walk_depth."""
+
+	return [
+		os.path.join(root, f)
+		for root, __, files in walk_depth(path, max_depth)
+		for f in files if f.lower().endswith(supported_extensions)
+	]
+
+
+def test_iter_supported_filepaths_is_generator(tmpdir):
+	"""Test gmusicapi_wrapper.utils.iter_supported_filepaths returns a generator."""
+
+	make_tree(tmpdir)
+
+	result = iter_supported_filepaths(str(tmpdir), ('.mp3',))
+
+	assert isinstance(result, types.GeneratorType)
+
+
+def test_iter_supported_filepaths_matches_walk_depth(tmpdir):
+	"""Test gmusicapi_wrapper.utils.iter_supported_filepaths yields the same filepaths as walk_depth."""
+
+	make_tree(tmpdir)
+	extensions = ('.mp3', '.flac', '.ogg', '.m4a')
+
+	for max_depth in [0, 1, 2, float('inf')]:
+		result = sorted(iter_supported_filepaths(str(tmpdir), extensions, max_depth=max_depth))
+		expected = sorted(walk_depth_filepaths(str(tmpdir), extensions, max_depth=max_depth))
+
+		assert result == expected
+
+
+def test_iter_supported_filepaths_max_depth(tmpdir):
+	"""Test gmusicapi_wrapper.utils.iter_supported_filepaths with a max_depth of 0."""
+
+	make_tree(tmpdir)
+
+	result = sorted(os.path.basename(path) for path in iter_supported_filepaths(str(tmpdir), ('.mp3', '.flac'), max_depth=0))
+	expected = ['C.FLAC', 'a.mp3']
+
+	assert result == expected
+
+
+def test_get_supported_filepaths_files(tmpdir):
+	"""Test gmusicapi_wrapper.utils.get_supported_filepaths with file paths."""
+
+	make_tree(tmpdir)
+	filepaths = [os.path.join(str(tmpdir), 'a.mp3'), os.path.join(str(tmpdir), 'b.txt')]
+
+	result = get_supported_filepaths(filepaths, ('.mp3',))
+	expected = filepaths[:1]
+
+	assert result == expected
@@ -0,0 +1,108 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.library.LibraryCache."""
+
+import time
+
+from gmusicapi_wrapper import MobileClientWrapper
+from gmusicapi_wrapper.library import LibraryCache
+
+from fixtures import TEST_SONGS_1, FakeMusicmanager, make_musicmanager_wrapper, write_test_songs
+
+SONGS = [
+	{'id': 'id-1', 'artist': 'Muse', 'title': 'Take a Bow'},
+	{'id': 'id-2', 'artist': 'Muse', 'title': 'Starlight'}
+]
+
+
+class FakeMobileclient:
+	"""A stand-in for gmusicapi's Mobileclient client that counts library requests."""
+
+	def __init__(self, songs):
+		self.songs = songs
+		self.calls = 0
+
+	def get_all_songs(self, incremental=False):
+		self.calls += 1
+
+		return [self.songs] if incremental else list(self.songs)
+
+
+def test_library_cache_accounts(tmpdir):
+	"""Test gmusicapi_wrapper.library.LibraryCache keeps song lists per account and invalidates them."""
+
+	cache = LibraryCache(str(tmpdir))
+	cache.set('account-1', 'uploaded', SONGS)
+	cache.set('account-2', 'uploaded', SONGS[:1])
+
+	assert cache.get('account-1', 'uploaded') == SONGS
+	assert cache.get('account-2', 'uploaded') == SONGS[:1]
+	assert cache.get('account-1', 'purchased') is None
+
+	assert cache.invalidate('account-1') == 1
+	assert cache.get('account-1', 'uploaded') is None
+	assert cache.get('account-2', 'uploaded') == SONGS[:1]
+
+
+def test_library_cache_ttl(tmpdir, monkeypatch):
+	"""Test gmusicapi_wrapper.library.LibraryCache song lists expire after the TTL."""
+
+	cache = LibraryCache(str(tmpdir), ttl=60)
+	cache.set('account', 'all', SONGS)
+
+	now = time.time()
+	monkeypatch.setattr(time, 'time', lambda: now + 61)
+
+	assert cache.get('account', 'all') is None
+	assert LibraryCache(str(tmpdir), ttl=None).get('account', 'all') == SONGS
+
+
+def test_mobileclient_library_cache(tmpdir):
+	"""Test gmusicapi_wrapper.MobileClientWrapper.get_google_songs reuses the cached song list."""
+
+	api = FakeMobileclient(SONGS)
+	wrapper = MobileClientWrapper(library_cache=LibraryCache(str(tmpdir)))
+	wrapper.api = api
+	wrapper.account = 'mobileclient:user@example.com'
+
+	assert wrapper.get_google_songs() == (SONGS, [])
+	assert wrapper.get_google_songs() == (SONGS, [])
+	assert [song['id'] for song in wrapper.get_google_songs(as_table=True)[0]] == ['id-1', 'id-2']
+	assert api.calls == 1
+
+
+def test_musicmanager_library_cache_upload_invalidates(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.upload invalidates the library cache."""
+
+	api = FakeMusicmanager(SONGS)
+	wrapper = make_musicmanager_wrapper(api)
+	wrapper.library_cache = LibraryCache(str(tmpdir.mkdir('cache')))
+	wrapper.account = 'musicmanager:oauth.cred'
+
+	assert wrapper.get_google_songs()[0] == SONGS
+
+	api.songs['id-3'] = {'id': 'id-3', 'artist': 'Muse', 'title': 'Knights of Cydonia'}
+
+	assert wrapper.get_google_songs()[0] == SONGS
+
+	wrapper.upload(write_test_songs(tmpdir, TEST_SONGS_1))
+
+	assert len(wrapper.get_google_songs()[0]) == 3
+
+
+def test_library_cache_logout(tmpdir):
+	"""Test gmusicapi_wrapper.MobileClientWrapper.logout stops using the previous account's cached library."""
+
+	api = FakeMobileclient(SONGS)
+	api.logout = lambda: True
+	wrapper = MobileClientWrapper(library_cache=LibraryCache(str(tmpdir)))
+	wrapper.api = api
+	wrapper.account = 'mobileclient:user@example.com'
+
+	wrapper.get_google_songs()
+	wrapper.logout()
+	api.songs = SONGS[:1]
+
+	assert wrapper.account is None
+	assert wrapper.get_google_songs() == (SONGS[:1], [])
+	assert api.calls == 2
@@ -0,0 +1,63 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.library.LibrarySnapshot."""
+
+from gmusicapi_wrapper.library import LibrarySnapshot
+
+from fixtures import FakeMusicmanager, make_musicmanager_wrapper
+
+UPLOADED_SONGS = [
+	{'id': 'id-1', 'artist': 'Muse', 'title': 'Take a Bow'},
+	{'id': 'id-2', 'artist': 'Muse', 'title': 'Starlight'}
+]
+
+PURCHASED_SONGS = [
+	{'id': 'id-3', 'artist': 'Muse', 'title': 'Supermassive Black Hole'},
+	{'id': 'id-2', 'artist': 'Muse', 'title': 'Starlight', 'track_size': 1000}
+]
+
+
+def test_library_snapshot():
+	"""Test gmusicapi_wrapper.library.LibrarySnapshot keeps order, indexes by id, and tracks membership."""
+
+	library = LibrarySnapshot(uploaded=UPLOADED_SONGS, purchased=PURCHASED_SONGS)
+
+	assert len(library) == 3
+	assert [song['id'] for song in library] == ['id-1', 'id-2', 'id-3']
+	assert 'id-3' in library and 'id-4' not in library
+	assert library['id-2'] is UPLOADED_SONGS[1]
+	assert library.get('id-4') is None
+	assert library.uploaded_ids == {'id-1', 'id-2'}
+	assert library.purchased_ids == {'id-2', 'id-3'}
+	assert library.uploaded_ids & library.purchased_ids == {'id-2'}
+
+
+def test_get_google_songs_merges_purchased():
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.get_google_songs merges purchased songs by id."""
+
+	wrapper = make_musicmanager_wrapper(FakeMusicmanager(UPLOADED_SONGS, purchased=PURCHASED_SONGS))
+
+	matched, filtered = wrapper.get_google_songs()
+
+	assert matched == UPLOADED_SONGS + PURCHASED_SONGS[:1]
+	assert filtered == []
+
+	matched, filtered = wrapper.get_google_songs(uploaded=False)
+
+	assert matched == PURCHASED_SONGS
+
+
+def test_get_google_songs_as_table_merges_purchased():
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.get_google_songs merges purchased songs by id into a table."""
+
+	wrapper = make_musicmanager_wrapper(FakeMusicmanager(UPLOADED_SONGS, purchased=PURCHASED_SONGS))
+
+	matched, filtered = wrapper.get_google_songs(as_table=True)
+
+	assert list(matched) == wrapper.get_google_songs()[0]
+	assert len(filtered) == 0
+
+	matched, filtered = wrapper.get_google_songs(include_filters=[('title', 'Star')], uploaded=False, as_table=True)
+
+	assert list(matched) == PURCHASED_SONGS[1:]
+	assert list(filtered) == PURCHASED_SONGS[:1]
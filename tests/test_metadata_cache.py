@@ -0,0 +1,87 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.cache.MetadataCache."""
+
+import os
+
+import mutagen
+
+from gmusicapi_wrapper import utils
+from gmusicapi_wrapper.cache import MetadataCache
+
+
+def test_metadata_cache_hit(tmpdir):
+	"""Test gmusicapi_wrapper.cache.MetadataCache returns cached metadata for unchanged files."""
+
+	filepath = str(tmpdir.join('song.mp3'))
+	open(filepath, 'w').close()
+
+	cache = MetadataCache()
+	cache.set(filepath, {'artist': ['Muse']})
+
+	assert cache.get(filepath) == (True, False, {'artist': ['Muse']})
+	assert cache.stats()['hits'] == 1
+
+
+def test_metadata_cache_changed_file(tmpdir):
+	"""Test gmusicapi_wrapper.cache.MetadataCache misses for changed files."""
+
+	filepath = str(tmpdir.join('song.mp3'))
+	open(filepath, 'w').close()
+
+	cache = MetadataCache()
+	cache.set(filepath, {'artist': ['Muse']})
+
+	with open(filepath, 'w') as f:
+		f.write('changed')
+
+	assert cache.get(filepath) == (False, False, None)
+	assert cache.stats()['misses'] == 1
+
+
+def test_metadata_cache_prune(tmpdir):
+	"""Test gmusicapi_wrapper.cache.MetadataCache.prune removes entries for deleted files."""
+
+	filepaths = [str(tmpdir.join(name)) for name in ['a.mp3', 'b.mp3']]
+
+	cache = MetadataCache()
+
+	for filepath in filepaths:
+		open(filepath, 'w').close()
+		cache.set(filepath, {})
+
+	os.remove(filepaths[0])
+
+	assert cache.prune() == 1
+	assert len(cache) == 1
+
+
+def test_metadata_cache_persistent(tmpdir):
+	"""Test gmusicapi_wrapper.cache.MetadataCache entries persist across instances."""
+
+	filepath = str(tmpdir.join('song.mp3'))
+	db = str(tmpdir.join('cache.db'))
+	open(filepath, 'w').close()
+
+	with MetadataCache(db) as cache:
+		cache.set(filepath, {'title': ['Starlight']})
+
+	with MetadataCache(db) as cache:
+		assert cache.get(filepath) == (True, False, {'title': ['Starlight']})
+
+
+def test_get_mutagen_metadata_skips_file_open(tmpdir, monkeypatch):
+	"""Test gmusicapi_wrapper.utils._get_mutagen_metadata doesn't load cached files with mutagen."""
+
+	filepath = str(tmpdir.join('song.mp3'))
+	open(filepath, 'w').close()
+
+	cache = MetadataCache()
+	cache.set(filepath, {'title': ['Starlight']})
+
+	def fail(*args, **kwargs):
+		raise AssertionError("mutagen.File called on cached file.")
+
+	monkeypatch.setattr(mutagen, 'File', fail)
+
+	assert utils._get_mutagen_metadata(filepath, metadata_cache=cache) == {'title': ['Starlight']}
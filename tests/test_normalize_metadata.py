@@ -0,0 +1,64 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.utils._normalize_metadata utility function."""
+
+import random
+import re
+
+from gmusicapi_wrapper.utils import _normalize_metadata
+
+from fixtures import TEST_SONGS_1, TEST_SONGS_2
+
+
+def legacy_normalize_metadata(metadata):
+	"""Reference implementation of the original regex chain."""
+
+	metadata = str(metadata)
+	metadata = metadata.lower()
+
+	metadata = re.sub(r'\/\s*\d+', '', metadata)
+	metadata = re.sub(r'^0+([0-9]+)', r'\1', metadata)
+	metadata = re.sub(r'^\d+\.+', '', metadata)
+	metadata = re.sub(r'[^\w\s]', '', metadata)
+	metadata = re.sub(r'\s+', ' ', metadata)
+	metadata = re.sub(r'^\s+', '', metadata)
+	metadata = re.sub(r'\s+$', '', metadata)
+	metadata = re.sub(r'^the\s+', '', metadata, re.I)
+
+	return metadata
+
+
+CORPUS = [
+	'', ' ', 'The Muse', 'THE  Muse ', 'the', 'Theater', ' the\tband', '01', '01/12', '1 / 12', '007', '000', '00.5',
+	'0012.3 Song', '3. Song', '3...', '0٣', '00٣.', 'Ağır Roman', 'Ça va?', 'AC/DC', 'Guns N\' Roses', '\x1cthe\x1fx',
+	'a b', 'a　b', 'ΣΊΣΥΦΟΣ', 'İstanbul', 'Mötley Crüe', 'Björk — Jóga', 'the the the', 5, 12.0
+]
+
+
+def random_corpus(count=2000, seed=0):
+	"""Generate random strings from characters that affect normalization."""
+
+	rng = random.Random(seed)
+	alphabet = ['0', '1', '9', '.', '/', ' ', '\t', '\n', ' ', 'the', 'The ', 'a', 'Z', 'é', 'İ', '٣', '!', '&', '_', '-']
+
+	return [''.join(rng.choice(alphabet) for __ in range(rng.randint(0, 12))) for __ in range(count)]
+
+
+def test_normalize_metadata_matches_legacy():
+	"""Test gmusicapi_wrapper.utils._normalize_metadata matches the original implementation on a corpus."""
+
+	corpus = CORPUS + random_corpus()
+
+	for song in TEST_SONGS_1 + TEST_SONGS_2:
+		corpus.extend(song.values())
+
+	for metadata in corpus:
+		assert _normalize_metadata(metadata) == legacy_normalize_metadata(metadata), repr(metadata)
+
+
+def test_normalize_metadata_examples():
+	"""Test gmusicapi_wrapper.utils._normalize_metadata normalizes track numbers and leading "the"."""
+
+	assert _normalize_metadata('The  Muse!') == 'muse'
+	assert _normalize_metadata('01/12') == '1'
+	assert _normalize_metadata('2. ') == ''
@@ -0,0 +1,44 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.utils.plan_sync utility function."""
+
+from gmusicapi_wrapper.utils import compare_song_collections, plan_sync
+
+from fixtures import TEST_SONGS_1, TEST_SONGS_2, write_test_songs
+
+
+def test_plan_sync_matches_compare_song_collections():
+	"""Test gmusicapi_wrapper.utils.plan_sync agrees with compare_song_collections in both directions."""
+
+	dst_songs = TEST_SONGS_2 + [{'artist': 'Muse', 'album': 'Absolution', 'track_number': 1, 'title': 'Intro'}]
+	plan = plan_sync(TEST_SONGS_1, dst_songs)
+
+	assert plan.src_only == compare_song_collections(TEST_SONGS_1, dst_songs)
+	assert plan.dst_only == compare_song_collections(dst_songs, TEST_SONGS_1)
+	assert plan.matched == [(TEST_SONGS_1[0], TEST_SONGS_2[0])]
+	assert plan.src_duplicates == []
+	assert plan.dst_duplicates == []
+
+
+def test_plan_sync_duplicates():
+	"""Test gmusicapi_wrapper.utils.plan_sync reports duplicates within each collection."""
+
+	src_songs = TEST_SONGS_1 + [dict(TEST_SONGS_1[1])]
+	dst_songs = TEST_SONGS_1 + TEST_SONGS_1[:1]
+	plan = plan_sync(src_songs, dst_songs)
+
+	assert plan.src_only == []
+	assert plan.dst_only == []
+	assert plan.matched == [(song, TEST_SONGS_1[i]) for i, song in zip([0, 1, 1], src_songs)]
+	assert plan.src_duplicates == src_songs[2:]
+	assert plan.dst_duplicates == dst_songs[2:]
+
+
+def test_plan_sync_local_songs(tmpdir):
+	"""Test gmusicapi_wrapper.utils.plan_sync with local filepaths against Google Music song dicts."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	plan = plan_sync(filepaths, TEST_SONGS_2)
+
+	assert plan.src_only == filepaths[1:]
+	assert plan.matched == [(filepaths[0], TEST_SONGS_2[0])]
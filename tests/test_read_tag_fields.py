@@ -0,0 +1,146 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.tags.read_tag_fields function."""
+
+import mutagen
+import pytest
+from mutagen.flac import FLAC
+from mutagen.id3 import ID3, TIT2, TPE1, TRCK
+
+from gmusicapi_wrapper.tags import read_tag_fields
+from gmusicapi_wrapper.utils import compare_song_collections
+
+from fixtures import TEST_SONGS_1, TEST_SONGS_2, make_flac, make_mp3, write_test_songs
+
+FIELDS = ['artist', 'album', 'title', 'tracknumber']
+
+
+def mutagen_fields(filepath, fields):
+	"""Read fields with a full mutagen parse."""
+
+	metadata = mutagen.File(filepath, easy=True)
+
+	return {field: list(metadata[field]) for field in fields if field in metadata}
+
+
+def test_read_tag_fields_id3v24(tmpdir):
+	"""Test gmusicapi_wrapper.tags.read_tag_fields with an ID3v2.4 tag."""
+
+	filepath = str(tmpdir.join('song.mp3'))
+
+	with open(filepath, 'wb') as f:
+		f.write(make_mp3(artist='Muse', title='Take a Bow', tracknumber='1/11'))
+
+	result = read_tag_fields(filepath, FIELDS)
+	expected = {'artist': ['Muse'], 'title': ['Take a Bow'], 'tracknumber': ['1/11']}
+
+	assert result == expected
+	assert result == mutagen_fields(filepath, FIELDS)
+
+
+def test_read_tag_fields_id3v23_utf16(tmpdir):
+	"""Test gmusicapi_wrapper.tags.read_tag_fields with an ID3v2.3 tag using UTF-16 text."""
+
+	filepath = str(tmpdir.join('song.mp3'))
+
+	with open(filepath, 'wb') as f:
+		f.write(make_mp3())
+
+	tags = ID3()
+	tags.add(TIT2(encoding=1, text=['Héllo']))
+	tags.add(TPE1(encoding=2, text=['Ärtist']))
+	tags.add(TRCK(encoding=0, text=['3/9']))
+	tags.save(filepath, v2_version=3)
+
+	assert read_tag_fields(filepath, FIELDS) == mutagen_fields(filepath, FIELDS)
+
+
+def test_read_tag_fields_flac(tmpdir):
+	"""Test gmusicapi_wrapper.tags.read_tag_fields with a FLAC Vorbis comment."""
+
+	filepath = str(tmpdir.join('song.flac'))
+
+	with open(filepath, 'wb') as f:
+		f.write(make_flac())
+
+	song = FLAC(filepath)
+	song['TITLE'] = ['Starlight']
+	song['Artist'] = ['Muse', 'Other']
+	song.save()
+
+	result = read_tag_fields(filepath, FIELDS)
+	expected = {'artist': ['Muse', 'Other'], 'title': ['Starlight']}
+
+	assert result == expected
+	assert result == mutagen_fields(filepath, FIELDS)
+
+
+def test_read_tag_fields_fallback(tmpdir):
+	"""Test gmusicapi_wrapper.tags.read_tag_fields falls back to mutagen for unsupported fields."""
+
+	filepath = str(tmpdir.join('song.mp3'))
+
+	with open(filepath, 'wb') as f:
+		f.write(make_mp3(title='Starlight'))
+
+	assert read_tag_fields(filepath, ['title', 'genre']) == {'title': ['Starlight']}
+
+
+def test_read_tag_fields_invalid(tmpdir):
+	"""Test gmusicapi_wrapper.tags.read_tag_fields raises MutagenError for invalid files."""
+
+	filepath = str(tmpdir.join('song.flac'))
+
+	with open(filepath, 'wb') as f:
+		f.write(b'fLaC' + b'\x00' * 64)
+
+	with pytest.raises(mutagen.MutagenError):
+		read_tag_fields(filepath, FIELDS)
+
+
+def test_compare_song_collections_local(tmpdir):
+	"""Test gmusicapi_wrapper.utils.compare_song_collections with local files against song dicts."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+
+	assert compare_song_collections(filepaths, TEST_SONGS_2) == filepaths[1:]
+
+
+def test_read_tag_fields_id3_duplicate_frames(tmpdir):
+	"""Test gmusicapi_wrapper.tags.read_tag_fields merges repeated ID3 text frames like mutagen."""
+
+	filepath = str(tmpdir.join('song.mp3'))
+	one = make_mp3(artist='One')
+	two = make_mp3(artist='Two')
+
+	# Each TPE1 frame is 14 bytes; splice both into a single 28 byte tag.
+	with open(filepath, 'wb') as f:
+		f.write(b'ID3\x04\x00\x00\x00\x00\x00\x1c' + one[10:24] + two[10:])
+
+	result = read_tag_fields(filepath, FIELDS)
+
+	assert result == {'artist': ['One', 'Two']}
+	assert result == mutagen_fields(filepath, FIELDS)
+
+
+def test_read_tag_fields_id3_without_mpeg_audio(tmpdir):
+	"""Test gmusicapi_wrapper.tags.read_tag_fields only reads ID3 tags followed by audio mutagen can sync to."""
+
+	filepath = str(tmpdir.join('song.mp3'))
+	audio = make_mp3()[10:]
+	tag = make_mp3(artist='Muse')[:-len(audio)]
+
+	with open(filepath, 'wb') as f:
+		f.write(tag + b'\xff\x00' * 2048)
+
+	with pytest.raises(mutagen.MutagenError):
+		mutagen_fields(filepath, FIELDS)
+
+	with pytest.raises(mutagen.MutagenError):
+		read_tag_fields(filepath, FIELDS)
+
+	# Junk before the audio is left to mutagen, which syncs past it.
+	with open(filepath, 'wb') as f:
+		f.write(tag + b'\xff\x00junk' + audio)
+
+	assert read_tag_fields(filepath, FIELDS) == mutagen_fields(filepath, FIELDS) == {'artist': ['Muse']}
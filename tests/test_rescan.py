@@ -0,0 +1,95 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.snapshot.rescan function."""
+
+import os
+
+from gmusicapi_wrapper.snapshot import ScanSnapshot, rescan
+
+
+def write_file(root, path, contents=''):
+	"""Write a file in a test directory tree."""
+
+	filepath = os.path.join(str(root), *path.split('/'))
+	os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+	with open(filepath, 'w') as f:
+		f.write(contents)
+
+	return filepath
+
+
+def age_tree(root):
+	"""Set old modification times so directories aren't considered racily modified."""
+
+	for dirpath, dirnames, filenames in os.walk(str(root)):
+		for name in dirnames + filenames:
+			os.utime(os.path.join(dirpath, name), ns=(10 ** 18, 10 ** 18))
+
+	os.utime(str(root), ns=(10 ** 18, 10 ** 18))
+
+
+def test_scan_snapshot(tmpdir):
+	"""Test gmusicapi_wrapper.snapshot.ScanSnapshot.scan finds supported files."""
+
+	expected = sorted([write_file(tmpdir, 'a/1.mp3'), write_file(tmpdir, 'a/b/2.flac')])
+	write_file(tmpdir, 'a/cover.jpg')
+
+	snapshot = ScanSnapshot.scan(str(tmpdir))
+
+	assert sorted(snapshot.get_filepaths()) == expected
+
+
+def test_rescan_changes(tmpdir):
+	"""Test gmusicapi_wrapper.snapshot.rescan reports added, removed, and modified files."""
+
+	keep = write_file(tmpdir, 'a/1.mp3')
+	remove = write_file(tmpdir, 'a/2.mp3')
+	modify = write_file(tmpdir, 'b/3.mp3')
+	age_tree(tmpdir)
+
+	snapshot = ScanSnapshot.scan(str(tmpdir))
+
+	os.remove(remove)
+	add = write_file(tmpdir, 'c/d/4.mp3')
+
+	with open(modify, 'w') as f:
+		f.write('changed')
+
+	added, removed, modified = rescan(snapshot)
+
+	assert added == [add]
+	assert removed == [remove]
+	assert modified == [modify]
+	assert sorted(snapshot.get_filepaths()) == sorted([keep, modify, add])
+
+
+def test_rescan_unchanged_dirs_not_listed(tmpdir, monkeypatch):
+	"""Test gmusicapi_wrapper.snapshot.rescan doesn't list directories with unchanged mtimes."""
+
+	write_file(tmpdir, 'a/1.mp3')
+	age_tree(tmpdir)
+
+	snapshot = ScanSnapshot.scan(str(tmpdir))
+
+	def fail(path):
+		raise AssertionError("Listed unchanged directory {}".format(path))
+
+	monkeypatch.setattr('gmusicapi_wrapper.snapshot.scandir', fail)
+
+	assert rescan(snapshot) == ([], [], [])
+
+
+def test_snapshot_save_load(tmpdir):
+	"""Test gmusicapi_wrapper.snapshot.ScanSnapshot round trips through a file."""
+
+	write_file(tmpdir, 'music/a/1.mp3')
+	age_tree(tmpdir)
+
+	snapshot = ScanSnapshot.scan(str(tmpdir.join('music')))
+	snapshot.save(str(tmpdir.join('snapshot.json')))
+
+	loaded = ScanSnapshot.load(str(tmpdir.join('snapshot.json')))
+
+	assert loaded.dirs == snapshot.dirs
+	assert rescan(loaded) == ([], [], [])
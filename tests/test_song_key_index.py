@@ -0,0 +1,81 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.index.SongKeyIndex."""
+
+import os
+
+import pytest
+
+from gmusicapi_wrapper.index import SongKeyIndex
+from gmusicapi_wrapper.utils import compare_song_collections
+
+from fixtures import TEST_SONGS_1, TEST_SONGS_2, write_test_songs
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_song_key_index_compare(compact):
+	"""Test gmusicapi_wrapper.utils.compare_song_collections with a SongKeyIndex destination."""
+
+	index = SongKeyIndex(TEST_SONGS_2, compact=compact)
+
+	assert compare_song_collections(TEST_SONGS_1, index) == compare_song_collections(TEST_SONGS_1, TEST_SONGS_2)
+	assert TEST_SONGS_2[0] in index
+
+
+def test_song_key_index_add_remove():
+	"""Test gmusicapi_wrapper.index.SongKeyIndex counts duplicate songs."""
+
+	index = SongKeyIndex(TEST_SONGS_1 + TEST_SONGS_1[:1])
+
+	index.remove(TEST_SONGS_1[0])
+	assert TEST_SONGS_1[0] in index
+
+	index.remove(TEST_SONGS_1[0])
+	assert TEST_SONGS_1[0] not in index
+	assert len(index) == 1
+
+	with pytest.raises(KeyError):
+		index.remove(TEST_SONGS_1[0])
+
+
+def test_song_key_index_filepaths(tmpdir):
+	"""Test gmusicapi_wrapper.index.SongKeyIndex removes deleted local files by filepath."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	index = SongKeyIndex(filepaths)
+
+	assert compare_song_collections(TEST_SONGS_1, index) == []
+
+	os.remove(filepaths[0])
+	index.remove(filepaths[0])
+
+	assert compare_song_collections(TEST_SONGS_1, index) == TEST_SONGS_1[:1]
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_song_key_index_save_load(tmpdir, compact):
+	"""Test gmusicapi_wrapper.index.SongKeyIndex round trips through a file."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	index = SongKeyIndex(filepaths[:1] + [dict(TEST_SONGS_1[1], id='song-2')], compact=compact)
+	index_filepath = str(tmpdir.join('index.json'))
+	index.save(index_filepath)
+
+	loaded = SongKeyIndex.load(index_filepath)
+
+	assert loaded.compact is compact
+	assert len(loaded) == 2
+	assert compare_song_collections(TEST_SONGS_1, loaded) == []
+	assert loaded.contains_id('song-2')
+
+	loaded.remove(filepaths[0])
+	assert TEST_SONGS_1[0] not in loaded
+
+
+def test_song_key_index_compact_fuzzy():
+	"""Test gmusicapi_wrapper.utils.compare_song_collections fuzzy mode rejects a compact SongKeyIndex."""
+
+	index = SongKeyIndex(TEST_SONGS_1, compact=True)
+
+	with pytest.raises(ValueError):
+		compare_song_collections(TEST_SONGS_1, index, fuzzy=True)
@@ -0,0 +1,84 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.songtable.SongTable."""
+
+import pytest
+
+from gmusicapi_wrapper import songtable
+from gmusicapi_wrapper.songtable import SongTable, SongTableView, _IntColumn, _ObjectColumn
+from gmusicapi_wrapper.utils import filter_google_songs
+
+from fixtures import TEST_SONGS_1
+
+SONGS = TEST_SONGS_1 + [
+	{'artist': 'Modest Mouse', 'album': 'Good News', 'durationMillis': '215000', 'title': 'Float On', 'deleted': False},
+	{'artist': ['Muse', 'Other'], 'title': 'Uprising', 'year': None, 'track_number': 0}
+]
+
+
+def test_song_table_round_trip():
+	"""Test gmusicapi_wrapper.songtable.SongTable materializes the original song dicts."""
+
+	table = SongTable.from_songs(SONGS)
+
+	assert len(table) == len(SONGS)
+	assert list(table) == SONGS
+	assert table[-1] == SONGS[-1]
+
+
+def test_song_table_int_columns():
+	"""Test gmusicapi_wrapper.songtable.SongTable stores integer fields in typed columns."""
+
+	table = SongTable.from_songs(SONGS[:3])
+
+	assert isinstance(table._columns['year'], _IntColumn)
+	assert isinstance(table._columns['durationMillis'], _IntColumn)
+	assert table.column('durationMillis') == [None, None, '215000']
+
+
+def test_song_table_chunks(monkeypatch):
+	"""Test gmusicapi_wrapper.songtable.SongTable columns change type when a later chunk doesn't fit them."""
+
+	monkeypatch.setattr(songtable, 'SONGS_PER_CHUNK', 2)
+	table = SongTable.from_songs(iter(SONGS))
+
+	assert list(table) == SONGS
+	assert isinstance(table._columns['year'], _ObjectColumn)
+	assert isinstance(table._columns['durationMillis'], _IntColumn)
+
+
+def test_song_table_filter_matches_filter_google_songs():
+	"""Test gmusicapi_wrapper.songtable.SongTable.filter matches gmusicapi_wrapper.utils.filter_google_songs."""
+
+	table = SongTable.from_songs(SONGS)
+
+	for kwargs in [
+		{},
+		{'include_filters': [('artist', 'muse')]},
+		{'include_filters': [('artist', 'muse'), ('year', '2006')], 'all_includes': True},
+		{'exclude_filters': [('title', 'take'), ('durationMillis', '^215')]},
+		{'exclude_filters': [('artist', 'muse'), ('track_number', '0')], 'all_excludes': True},
+		{'include_filters': [('deleted', 'False')]}
+	]:
+		matched, filtered = table.filter(**kwargs)
+		expected_matched, expected_filtered = filter_google_songs(SONGS, **kwargs)
+
+		assert list(matched) == expected_matched
+		assert list(filtered) == expected_filtered
+
+
+def test_song_table_filter_views():
+	"""Test gmusicapi_wrapper.songtable.SongTable.filter returns views over the table."""
+
+	table = SongTable.from_songs(SONGS)
+	matched, filtered = table.filter(include_filters=[('artist', 'muse')])
+
+	assert isinstance(matched, SongTableView) and matched.table is table
+	assert len(matched) == 3 and len(filtered) == 1
+	assert matched[0] == SONGS[0]
+	assert matched[-1] == SONGS[-1]
+	assert matched.column('year') == [2006, 2006, None]
+	assert list(filtered) == [SONGS[2]]
+
+	with pytest.raises(IndexError):
+		matched[3]
@@ -0,0 +1,120 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.transcode.TranscodeCache."""
+
+import os
+import time
+
+import mutagen
+import pytest
+
+from gmusicapi_wrapper import transcode
+from gmusicapi_wrapper.transcode import TranscodeCache
+
+from fixtures import FakeMusicmanager, make_flac, make_mp3, make_musicmanager_wrapper
+
+
+@pytest.fixture
+def transcodes(monkeypatch):
+	"""Replace ffmpeg transcoding with untagged MP3 audio and record the transcoded filepaths."""
+
+	transcoded = []
+
+	def transcode_to_mp3(filepath, quality='320k'):
+		if 'broken' in filepath:
+			raise IOError("transcoding failed")
+
+		transcoded.append(filepath)
+
+		# Transcoder output has no ID3 tag.
+		return make_mp3(audio_byte=len(transcoded))[10:]
+
+	monkeypatch.setattr(transcode, 'transcode_to_mp3', transcode_to_mp3)
+
+	return transcoded
+
+
+def write_flac(tmpdir, name, title):
+	"""Write a tagged FLAC file."""
+
+	filepath = str(tmpdir.join(name))
+
+	with open(filepath, 'wb') as f:
+		f.write(make_flac())
+
+	flac = mutagen.File(filepath)
+	flac['title'] = title
+	flac['artist'] = 'Muse'
+	flac.save()
+
+	return filepath
+
+
+def test_transcode_cache_reuse(tmpdir, transcodes):
+	"""Test gmusicapi_wrapper.transcode.TranscodeCache transcodes a file once per quality and copies its tags."""
+
+	filepath = write_flac(tmpdir, 'song.flac', 'Starlight')
+	cache = TranscodeCache(str(tmpdir.join('cache')))
+
+	assert cache.get(filepath) is None
+
+	cache_filepath = cache.transcode(filepath)
+
+	assert cache.transcode(filepath) == cache_filepath
+	assert cache.get(filepath) == cache_filepath
+	assert transcodes == [filepath]
+	assert mutagen.File(cache_filepath, easy=True)['title'] == ['Starlight']
+
+	cache.transcode(filepath, quality=2)
+
+	assert len(cache) == 2
+
+
+def test_transcode_cache_evicts_least_recently_used(tmpdir, transcodes):
+	"""Test gmusicapi_wrapper.transcode.TranscodeCache evicts least recently used files past max_size."""
+
+	filepaths = [write_flac(tmpdir, '{}.flac'.format(num), 'Song {}'.format(num)) for num in range(3)]
+	cache = TranscodeCache(str(tmpdir.join('cache')))
+
+	first = cache.transcode(filepaths[0])
+	second = cache.transcode(filepaths[1])
+	cache.max_size = os.path.getsize(first) + os.path.getsize(second)
+
+	# Make the first file more recently used than the second.
+	time.sleep(0.01)
+	cache.get(filepaths[0])
+	third = cache.transcode(filepaths[2])
+
+	assert os.path.exists(first)
+	assert not os.path.exists(second)
+	assert os.path.exists(third)
+	assert cache.size() <= cache.max_size
+
+
+def test_upload_transcode_cache(tmpdir, transcodes):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.upload uploads cached transcodes and reuses them on retries."""
+
+	flac_filepath = write_flac(tmpdir, 'song.flac', 'Starlight')
+	broken_filepath = write_flac(tmpdir, 'broken.flac', 'Broken')
+	mp3_filepath = str(tmpdir.join('song.mp3'))
+
+	with open(mp3_filepath, 'wb') as f:
+		f.write(make_mp3(title='Take a Bow'))
+
+	cache = TranscodeCache(str(tmpdir.join('cache')))
+	api = FakeMusicmanager(failures=[cache.transcode(flac_filepath)])
+	wrapper = make_musicmanager_wrapper(api)
+	filepaths = [flac_filepath, broken_filepath, mp3_filepath]
+
+	results = wrapper.upload(filepaths, transcode_cache=cache, transcode_workers=2)
+
+	assert [result['filepath'] for result in results] == filepaths
+	assert [result['result'] for result in results] == ['error', 'not_uploaded', 'uploaded']
+	assert 'transcoding error' in results[1]['message']
+
+	api.failures.clear()
+	retried = wrapper.upload(flac_filepath, transcode_cache=cache)
+
+	assert retried[0]['result'] == 'uploaded'
+	assert api.uploaded[retried[0]['id']] == cache.get(flac_filepath)
+	assert transcodes == [flac_filepath]
@@ -0,0 +1,90 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.journal.TransferJournal."""
+
+import os
+
+from gmusicapi_wrapper.journal import TransferJournal
+
+from fixtures import TEST_SONGS_1, FakeMusicmanager, make_musicmanager_wrapper, write_test_songs
+
+
+def test_transfer_journal_reload(tmpdir):
+	"""Test gmusicapi_wrapper.journal.TransferJournal records survive reopening."""
+
+	filepath = str(tmpdir.join('journal.jsonl'))
+
+	with TransferJournal(filepath) as journal:
+		journal.record('upload', 'a.mp3', {'result': 'uploaded', 'filepath': 'a.mp3', 'id': 'id-a'})
+		journal.record('upload', 'b.mp3', {'result': 'error', 'filepath': 'b.mp3', 'message': ValueError('failed')})
+
+	journal = TransferJournal(filepath, sync_every=0)
+
+	assert len(journal) == 2
+	assert journal.is_finished('upload', 'a.mp3')
+	assert not journal.is_finished('upload', 'b.mp3')
+	assert not journal.is_finished('download', 'a.mp3')
+	assert journal.get('upload', 'b.mp3')['message'] == 'failed'
+
+
+def test_transfer_journal_truncated_record(tmpdir):
+	"""Test gmusicapi_wrapper.journal.TransferJournal discards a partially written last record."""
+
+	filepath = str(tmpdir.join('journal.jsonl'))
+
+	with TransferJournal(filepath) as journal:
+		journal.record('download', 'id-1', {'result': 'downloaded', 'id': 'id-1', 'filepath': 'a.mp3'})
+
+	with open(filepath, 'a') as f:
+		f.write('{"kind": "download", "key": "id-2", "res')
+
+	with TransferJournal(filepath) as journal:
+		assert len(journal) == 1
+		journal.record('download', 'id-3', {'result': 'downloaded', 'id': 'id-3', 'filepath': 'c.mp3'})
+
+	assert len(TransferJournal(filepath)) == 2
+
+
+def test_upload_journal(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.upload skips finished filepaths and retries errors."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	journal_filepath = str(tmpdir.join('journal.jsonl'))
+	api = FakeMusicmanager(failures=filepaths[1:])
+	wrapper = make_musicmanager_wrapper(api)
+
+	with TransferJournal(journal_filepath) as journal:
+		results = wrapper.upload(filepaths, journal=journal)
+
+	assert [result['result'] for result in results] == ['uploaded', 'error']
+
+	api.failures.clear()
+
+	with TransferJournal(journal_filepath) as journal:
+		resumed = wrapper.upload(filepaths, journal=journal)
+
+	assert api.calls == 3
+	assert resumed[0] == results[0]
+	assert resumed[1]['result'] == 'uploaded'
+
+
+def test_download_journal(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.download skips finished songs whose files exist."""
+
+	songs = [{'id': 'id-{}'.format(i), 'artist': 'Muse', 'title': 'Song {}'.format(i)} for i in range(3)]
+	api = FakeMusicmanager(songs)
+	wrapper = make_musicmanager_wrapper(api)
+	template = os.path.join(str(tmpdir), '%title%')
+	journal_filepath = str(tmpdir.join('journal.jsonl'))
+
+	with TransferJournal(journal_filepath) as journal:
+		results = wrapper.download(songs, template=template, journal=journal)
+
+	os.remove(results[1]['filepath'])
+
+	with TransferJournal(journal_filepath) as journal:
+		resumed = wrapper.download(songs, template=template, journal=journal)
+
+	assert api.calls == 4
+	assert [result['id'] for result in resumed] == ['id-0', 'id-2', 'id-1']
+	assert all(os.path.isfile(result['filepath']) for result in resumed)
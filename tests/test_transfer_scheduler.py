@@ -0,0 +1,114 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.scheduler.TransferScheduler."""
+
+import os
+import threading
+
+import pytest
+from gmusicapi import CallFailure
+
+from gmusicapi_wrapper.scheduler import TransferScheduler
+
+from fixtures import FakeMusicmanager, make_musicmanager_wrapper
+
+
+class FlakyFunction:
+	"""A function failing a number of times before succeeding."""
+
+	def __init__(self, failures, exception=None):
+		self.failures = failures
+		self.exception = exception or CallFailure("Throttled", 'Test')
+		self.calls = 0
+		self._lock = threading.Lock()
+
+	def __call__(self, value):
+		with self._lock:
+			self.calls += 1
+			fail = self.calls <= self.failures
+
+		if fail:
+			raise self.exception
+
+		return value
+
+
+def test_transfer_scheduler_retries():
+	"""Test gmusicapi_wrapper.scheduler.TransferScheduler retries with growing backoff."""
+
+	delays = []
+	scheduler = TransferScheduler(base_delay=1, max_delay=3, sleep=delays.append)
+	function = FlakyFunction(3)
+
+	assert scheduler.call(function, 'done') == 'done'
+	assert function.calls == 4
+	assert len(delays) == 3
+	assert all(0 <= delay <= limit for delay, limit in zip(delays, [1, 2, 3]))
+
+	stats = scheduler.stats()
+	assert stats['retries'] == 3
+	assert stats['successes'] == 1
+	assert stats['failures'] == 0
+
+
+def test_transfer_scheduler_retry_policies():
+	"""Test gmusicapi_wrapper.scheduler.TransferScheduler uses the policy of the closest exception class."""
+
+	scheduler = TransferScheduler(retry_policies={OSError: 1, FileNotFoundError: 0}, sleep=lambda delay: None)
+
+	function = FlakyFunction(5, exception=FileNotFoundError())
+
+	with pytest.raises(FileNotFoundError):
+		scheduler.call(function, None)
+
+	assert function.calls == 1
+
+	function = FlakyFunction(5, exception=ConnectionError())
+
+	with pytest.raises(ConnectionError):
+		scheduler.call(function, None)
+
+	assert function.calls == 2
+	assert scheduler.stats()['failures'] == 2
+
+	function = FlakyFunction(5, exception=ValueError())
+
+	with pytest.raises(ValueError):
+		scheduler.call(function, None)
+
+	assert function.calls == 1
+
+
+def test_transfer_scheduler_aimd():
+	"""Test gmusicapi_wrapper.scheduler.TransferScheduler raises its limit on success and halves it on failure."""
+
+	scheduler = TransferScheduler(max_workers=8, initial_workers=2, sleep=lambda delay: None)
+
+	for __ in range(40):
+		scheduler.call(lambda: None)
+
+	assert scheduler.stats()['limit'] == 8
+
+	scheduler.call(FlakyFunction(1), None)
+
+	assert scheduler.stats()['limit'] == 4
+	assert scheduler.stats()['decreases'] == 1
+
+
+def test_download_scheduler(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.download retries throttled songs with a scheduler."""
+
+	songs = [{'id': 'id-{}'.format(i), 'artist': 'Muse', 'title': 'Song {}'.format(i)} for i in range(6)]
+	api = FakeMusicmanager(songs, latency=0.01)
+	flaky = FlakyFunction(3)
+	download_song = api.download_song
+	api.download_song = lambda song_id: download_song(flaky(song_id))
+
+	wrapper = make_musicmanager_wrapper(api)
+	scheduler = TransferScheduler(max_workers=4, initial_workers=4, sleep=lambda delay: None)
+
+	results = wrapper.download(songs, template=os.path.join(str(tmpdir), '%title%'), scheduler=scheduler)
+
+	assert all(result['result'] == 'downloaded' for result in results)
+	assert scheduler.stats()['retries'] == 3
+	assert api.max_active <= 4
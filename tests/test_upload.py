@@ -0,0 +1,90 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.MusicManagerWrapper.upload."""
+
+import os
+
+import pytest
+
+from fixtures import FakeMusicmanager, make_musicmanager_wrapper, write_test_songs
+
+
+def make_songs(num):
+	"""Create test song dicts for writing local files."""
+
+	return [
+		{'artist': 'Muse', 'album': 'Absolution', 'title': 'Song {}'.format(i), 'track_number': i + 1}
+		for i in range(num)
+	]
+
+
+@pytest.mark.parametrize('max_workers', [None, 4])
+def test_upload(tmpdir, max_workers):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.upload results are in filepath order."""
+
+	filepaths = write_test_songs(tmpdir, make_songs(6))
+	api = FakeMusicmanager(failures=filepaths[2:3])
+	wrapper = make_musicmanager_wrapper(api)
+
+	results = wrapper.upload(filepaths, max_workers=max_workers)
+
+	assert [result['filepath'] for result in results] == filepaths
+	assert [result['result'] for result in results] == ['uploaded', 'uploaded', 'error', 'uploaded', 'uploaded', 'uploaded']
+	assert sorted(api.uploaded.values()) == sorted(filepaths[:2] + filepaths[3:])
+
+
+def test_upload_concurrent(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.upload overlaps uploads with max_workers."""
+
+	filepaths = write_test_songs(tmpdir, make_songs(8))
+	api = FakeMusicmanager(latency=0.05)
+	wrapper = make_musicmanager_wrapper(api)
+
+	results = wrapper.upload(filepaths, max_workers=4, ordered=False)
+
+	assert sorted(result['filepath'] for result in results) == sorted(filepaths)
+	assert 1 < api.max_active <= 4
+
+
+def test_upload_concurrent_delete_on_success(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.upload only deletes successfully uploaded files."""
+
+	filepaths = write_test_songs(tmpdir, make_songs(4))
+	api = FakeMusicmanager(latency=0.01, failures=filepaths[:1])
+	wrapper = make_musicmanager_wrapper(api)
+
+	results = wrapper.upload(filepaths, delete_on_success=True, max_workers=4)
+
+	assert results[0]['result'] == 'error'
+	assert os.path.isfile(filepaths[0])
+	assert not any(os.path.exists(filepath) for filepath in filepaths[1:])
+
+
+@pytest.mark.parametrize('max_workers', [None, 2])
+def test_upload_batch_size(tmpdir, max_workers):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.upload passes batches of filepaths to each call."""
+
+	filepaths = write_test_songs(tmpdir, make_songs(5))
+	api = FakeMusicmanager()
+	wrapper = make_musicmanager_wrapper(api)
+
+	results = wrapper.upload(filepaths, batch_size=2, max_workers=max_workers)
+
+	assert sorted(api.upload_batches) == [filepaths[:2], filepaths[2:4], filepaths[4:]]
+	assert [result['filepath'] for result in results] == filepaths
+	assert all(result['result'] == 'uploaded' for result in results)
+	assert [result['id'] for result in results] == [
+		song_id for filepath in filepaths for song_id, uploaded in api.uploaded.items() if uploaded == filepath
+	]
+
+
+def test_upload_batch_failure(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.upload only marks files of a failed batch as errors."""
+
+	filepaths = write_test_songs(tmpdir, make_songs(6))
+	api = FakeMusicmanager(failures=filepaths[3:4])
+	wrapper = make_musicmanager_wrapper(api)
+
+	results = wrapper.upload(filepaths, batch_size=3)
+
+	assert [result['result'] for result in results] == ['uploaded'] * 3 + ['error'] * 3
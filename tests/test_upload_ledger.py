@@ -0,0 +1,68 @@
+# coding=utf-8
+
+"""Module for testing gmusicapi_wrapper.ledger.UploadLedger."""
+
+import os
+
+from gmusicapi_wrapper.ledger import UploadLedger
+
+from fixtures import TEST_SONGS_1, FakeMusicmanager, make_musicmanager_wrapper, write_test_songs
+
+
+def test_upload_ledger_reload(tmpdir):
+	"""Test gmusicapi_wrapper.ledger.UploadLedger entries survive reopening and expire when files change."""
+
+	filepath = str(tmpdir.join('song.mp3'))
+	ledger_filepath = str(tmpdir.join('ledger.db'))
+
+	with open(filepath, 'wb') as f:
+		f.write(b'audio')
+
+	with UploadLedger(ledger_filepath) as ledger:
+		ledger.record(filepath, 'id-1')
+
+	ledger = UploadLedger(ledger_filepath)
+
+	assert len(ledger) == 1
+	assert ledger.get(filepath) == 'id-1'
+
+	with open(filepath, 'wb') as f:
+		f.write(b'changed audio')
+
+	assert ledger.get(filepath) is None
+
+
+def test_upload_ledger_skips_known_files(tmpdir):
+	"""Test gmusicapi_wrapper.MusicManagerWrapper.upload skips files in the ledger without an upload call or deleting them."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	api = FakeMusicmanager()
+	wrapper = make_musicmanager_wrapper(api)
+	ledger = UploadLedger()
+
+	results = wrapper.upload(filepaths, ledger=ledger)
+	resumed = wrapper.upload(filepaths, ledger=ledger, delete_on_success=True)
+
+	assert api.calls == 2
+	assert [result['result'] for result in resumed] == ['skipped', 'skipped']
+	assert [result['id'] for result in resumed] == [result['id'] for result in results]
+	assert all(os.path.exists(filepath) for filepath in filepaths)
+
+
+def test_upload_ledger_reconcile(tmpdir):
+	"""Test gmusicapi_wrapper.ledger.UploadLedger.reconcile forgets files deleted from Google Music."""
+
+	filepaths = write_test_songs(tmpdir, TEST_SONGS_1)
+	api = FakeMusicmanager()
+	wrapper = make_musicmanager_wrapper(api)
+	ledger = UploadLedger()
+
+	results = wrapper.upload(filepaths, ledger=ledger)
+
+	assert ledger.reconcile([{'id': results[0]['id']}]) == filepaths[1:]
+	assert len(ledger) == 1
+
+	resumed = wrapper.upload(filepaths, ledger=ledger)
+
+	assert [result['result'] for result in resumed] == ['skipped', 'uploaded']
+	assert api.calls == 3